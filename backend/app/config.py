@@ -1,6 +1,6 @@
 # app/config.py
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     """Application settings loaded from .env file"""
@@ -12,11 +12,69 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None  # Defaults to DATABASE_URL with asyncpg/aiosqlite
+    DB_ECHO: bool = False  # Log every SQL statement (independent of DEBUG)
+    DB_POOL_SIZE: int = 5  # Per engine, per worker process
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Replace connections older than this
+    DB_POOL_PRE_PING: str = "idle"  # "always", "idle" or "never"
+    DB_POOL_PRE_PING_IDLE_SECONDS: int = 60  # Ping only connections idle this long
     
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_SIZE: int = 4096  # Verified token payloads kept in memory
+    TOKEN_CACHE_TTL_SECONDS: int = 300  # Never longer than the token's exp
+    PRINCIPAL_CACHE_SIZE: int = 4096  # Authenticated user snapshots
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30  # Safety net on top of write invalidation
+    TOKEN_VERSION_CACHE_SIZE: int = 65536  # Users with a recent role/status change or deletion
+    USER_COUNT_CACHE_SIZE: int = 256  # Filtered user-list totals kept in memory
+    USER_COUNT_CACHE_TTL_SECONDS: int = 30  # Also cleared on every user write in this process
+    USER_COUNT_ESTIMATE_MIN_ROWS: Optional[int] = None  # PostgreSQL: use planner estimate for unfiltered totals above this
+    USER_STATS_RECONCILE_SECONDS: int = 3600  # Recompute user_stats counters this often (0 disables)
+    RESPONSE_CACHE_TTL_SECONDS: float = 5.0  # Hot GET responses served fresh this long (0 disables)
+    RESPONSE_CACHE_STALE_SECONDS: float = 30.0  # Then served stale while one refresh runs
+    RESPONSE_CACHE_SIZE: int = 512  # Cached responses kept in memory
+    FAST_JSON_RESPONSES: bool = False  # Encode responses with orjson (falls back to compact json)
+    TOKEN_ROLE_CLAIMS: bool = False  # Sign role/active/version claims for stateless reads
+    
+    # Password hashing pool
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # Defaults to CPU count
+    PASSWORD_HASH_MEMORY_BUDGET_MB: int = 512  # Argon2 memory cost x concurrency
+    
+    # Bulk user import
+    USER_IMPORT_BATCH_SIZE: int = 1000  # Rows validated, hashed and inserted together
+    USER_IMPORT_HASH_WORKERS: Optional[int] = None  # Hashing processes; defaults to CPU count
+    USER_IMPORT_MAX_ERRORS: int = 1000  # Row errors kept per job report
+    USER_IMPORT_JOB_HISTORY: int = 100  # Finished jobs kept for progress queries
+    USER_IMPORT_MAX_BYTES: int = 100 * 1024 * 1024  # Larger import uploads are rejected with 413
+    USER_EXPORT_BATCH_SIZE: int = 1000  # Rows fetched per server-side cursor round trip
+    
+    # Argon2 cost (run calibrate_argon2.py to pick values for this host)
+    ARGON2_TIME_COST: Optional[int] = None
+    ARGON2_MEMORY_COST: Optional[int] = None  # KiB
+    ARGON2_PARALLELISM: Optional[int] = None
+    PASSWORD_REHASH_ON_LOGIN: bool = True  # Upgrade outdated hashes after login
+    
+    # Login throttling (checked before any password hashing)
+    LOGIN_IP_RATE_PER_MINUTE: int = 20
+    LOGIN_IP_BURST: int = 10
+    LOGIN_EMAIL_RATE_PER_MINUTE: int = 5
+    LOGIN_EMAIL_BURST: int = 5
+    LOGIN_LIMITER_MAX_KEYS: int = 100000  # Bounded memory per limiter
+    LOGIN_LIMITER_IDLE_SECONDS: int = 600
+    LOGIN_MAX_CONCURRENT_VERIFICATIONS: int = 8  # Global cap across all clients
+    
+    # Access log (one JSON line per request, written by a background thread)
+    ACCESS_LOG_ENABLED: bool = True
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0  # Fraction of successful requests logged
+    ACCESS_LOG_SLOW_MS: float = 500.0  # Always log requests slower than this
+    TRACE_SAMPLE_RATE: float = 0.0  # Fraction of requests traced (spans written to the access log)
+    TRACE_HEADER: str = ""  # Request header that forces tracing, e.g. "X-Trace"; empty (default) disables
+    TRACE_HEADER_SECRET: str = ""  # If set, TRACE_HEADER must carry this value instead of "1"/"true"
     
     # CORS
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:5174"
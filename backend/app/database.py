@@ -1,14 +1,43 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.config import settings
+from app.pool_metrics import PoolMetrics, instrumented_pool_class, install_pool_events
+
+# Pool metrics exposed at /api/metrics/db-pool
+sync_pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+
+
+def pool_options(url: str, pool_base, metrics: PoolMetrics) -> dict:
+    """
+    Engine keyword arguments for the configured connection pool
+    
+    In-memory SQLite keeps its single-connection pool; everything else gets
+    an instrumented queue pool sized from settings.
+    """
+    if make_url(url).database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": instrumented_pool_class(pool_base, metrics),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+    }
+
 
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    echo=settings.DEBUG   # Log SQL queries in debug mode
+    echo=settings.DB_ECHO,  # Log SQL queries
+    **pool_options(settings.DATABASE_URL, QueuePool, sync_pool_metrics)
 )
+install_pool_events(engine, sync_pool_metrics, settings.DB_POOL_PRE_PING, settings.DB_POOL_PRE_PING_IDLE_SECONDS)
 
 # Create session factory
 SessionLocal = sessionmaker(
@@ -17,6 +46,47 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async drivers for the sync URLs we accept in DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url() -> str:
+    """
+    Async database URL (ASYNC_DATABASE_URL, or DATABASE_URL with an async driver)
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {url.get_backend_name()}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Create async database engine
+async_engine = create_async_engine(
+    get_async_database_url(),
+    echo=settings.DB_ECHO,
+    **pool_options(get_async_database_url(), AsyncAdaptedQueuePool, async_pool_metrics)
+)
+install_pool_events(
+    async_engine.sync_engine,
+    async_pool_metrics,
+    settings.DB_POOL_PRE_PING,
+    settings.DB_POOL_PRE_PING_IDLE_SECONDS
+)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False  # Attributes stay loaded after commit; no lazy IO
+)
+
 # Base class for all models
 Base = declarative_base()
 
@@ -30,4 +100,14 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Dependency to get async database session
+async def get_async_db():
+    """
+    Async database session dependency
+    Queries are awaited, so they never block the event loop
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
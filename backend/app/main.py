@@ -3,11 +3,21 @@ from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.exc import SQLAlchemyError
 from app.config import settings
-from app.database import engine, Base
+from app.database import engine
+from app.migrations import pending_migrations
+from app.middleware.access_log import AccessLogMiddleware, start_access_log, stop_access_log
+from app.utils.tracing import TracingMiddleware
+from app.utils import json_response
+from app.utils.json_response import FastJSONResponse
+from app.services.user_search import configure_user_search
+from app.services.user_stats import reconcile_user_stats
+from app.services.user_import import import_hash_pool
+from app.utils.security import password_pool
+import asyncio
 import logging
-import time
 import sys
 
 # ✅ Import routers
@@ -16,10 +26,11 @@ sys.stdout.write("📦 IMPORTING ROUTERS IN main.py\n")
 sys.stdout.write("="*70 + "\n")
 sys.stdout.flush()
 
-from app.routers import auth, users
+from app.routers import auth, users, metrics
 
 sys.stdout.write("✅ Auth router imported\n")
 sys.stdout.write("✅ Users router imported\n")
+sys.stdout.write("✅ Metrics router imported\n")
 sys.stdout.write("="*70 + "\n\n")
 sys.stdout.flush()
 
@@ -29,13 +40,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create database tables
-try:
-    Base.metadata.create_all(bind=engine)
-    logger.info("✅ Database tables created successfully")
-except Exception as e:
-    logger.error(f"❌ Error creating database tables: {e}")
-
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
@@ -43,7 +47,8 @@ app = FastAPI(
     debug=settings.DEBUG,
     description="NIC Bank API with User Management",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse
 )
 
 # ✅ CORS FIRST - BEFORE ANY OTHER MIDDLEWARE!
@@ -56,47 +61,14 @@ app.add_middleware(
     expose_headers=["*"]  # ✅ Add this!
 )
 
-# ✅ REQUEST LOGGER MIDDLEWARE - AFTER CORS!
-@app.middleware("http")
-async def log_all_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    sys.stdout.write(f"\n{'='*80}\n")
-    sys.stdout.write(f"📨 INCOMING REQUEST\n")
-    sys.stdout.write(f"{'='*80}\n")
-    sys.stdout.write(f"🔹 Method: {request.method}\n")
-    sys.stdout.write(f"🔹 URL: {request.url}\n")
-    sys.stdout.write(f"🔹 Path: {request.url.path}\n")
-    sys.stdout.write(f"🔹 Query: {request.url.query}\n")
-    
-    # Get auth header
-    auth_header = request.headers.get("authorization", "None")
-    sys.stdout.write(f"🔹 Auth: {auth_header[:50] if auth_header != 'None' else 'None'}...\n")
-    sys.stdout.write(f"{'='*80}\n")
-    sys.stdout.flush()
-    
-    try:
-        # Process request
-        response = await call_next(request)
-        
-        duration = time.time() - start_time
-        sys.stdout.write(f"\n{'='*80}\n")
-        sys.stdout.write(f"📤 RESPONSE\n")
-        sys.stdout.write(f"{'='*80}\n")
-        sys.stdout.write(f"🔹 Status: {response.status_code}\n")
-        sys.stdout.write(f"🔹 Duration: {duration:.3f}s\n")
-        sys.stdout.write(f"{'='*80}\n\n")
-        sys.stdout.flush()
-        
-        return response
-    except Exception as e:
-        sys.stdout.write(f"\n{'='*80}\n")
-        sys.stdout.write(f"❌ MIDDLEWARE ERROR\n")
-        sys.stdout.write(f"{'='*80}\n")
-        sys.stdout.write(f"❌ Error: {str(e)}\n")
-        sys.stdout.write(f"{'='*80}\n\n")
-        sys.stdout.flush()
-        raise
+# ✅ ACCESS LOG MIDDLEWARE - AFTER CORS! (one sampled JSON line per request)
+if settings.ACCESS_LOG_ENABLED:
+    app.add_middleware(AccessLogMiddleware)
+
+# Request tracing (spans are only recorded for sampled or TRACE_HEADER requests)
+TRACING_ENABLED = bool(settings.TRACE_HEADER) or settings.TRACE_SAMPLE_RATE > 0
+if TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
 
 # Exception handlers
 @app.exception_handler(RequestValidationError)
@@ -145,6 +117,9 @@ sys.stdout.flush()
 
 app.include_router(auth.router, prefix="/api")
 sys.stdout.write("✅ Auth router registered at /api/auth\n")
+
+app.include_router(metrics.router, prefix="/api")
+sys.stdout.write("✅ Metrics router registered at /api/metrics\n")
 sys.stdout.write("="*70 + "\n\n")
 sys.stdout.flush()
 
@@ -168,9 +143,34 @@ async def health_check():
         "status": "healthy"
     }
 
+async def reconcile_stats_periodically():
+    """Correct drift in the user_stats counters in the background"""
+    while True:
+        await asyncio.sleep(settings.USER_STATS_RECONCILE_SECONDS)
+        try:
+            await run_in_threadpool(reconcile_user_stats, engine)
+        except Exception as e:
+            logger.error(f"❌ User stats reconciliation failed: {e}")
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
+    if settings.ACCESS_LOG_ENABLED or TRACING_ENABLED:
+        start_access_log()
+    
+    # Schema changes are applied by `python migrate.py`, never by workers
+    try:
+        pending = pending_migrations(engine)
+        if pending:
+            logger.warning(f"⚠️ {len(pending)} pending database migration(s) - run: python migrate.py")
+    except Exception as e:
+        logger.error(f"❌ Could not check database migrations: {e}")
+    logger.info(f"🔍 User search backend: {configure_user_search(engine) or 'ILIKE scan'}")
+    if settings.FAST_JSON_RESPONSES and json_response.orjson is None:
+        logger.warning("⚠️ FAST_JSON_RESPONSES is on but orjson is not installed - using the standard json encoder")
+    
+    if settings.USER_STATS_RECONCILE_SECONDS > 0:
+        app.state.stats_reconciler = asyncio.create_task(reconcile_stats_periodically())
     logger.info(f"🚀 Starting {settings.APP_NAME} v{settings.API_VERSION}")
     logger.info(f"📝 API Documentation: http://localhost:8000/docs")
     logger.info(f"🔍 ReDoc Documentation: http://localhost:8000/redoc")
@@ -194,4 +194,10 @@ async def startup_event():
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
-    logger.info(f"🛑 Shutting down {settings.APP_NAME}")
\ No newline at end of file
+    logger.info(f"🛑 Shutting down {settings.APP_NAME}")
+    reconciler = getattr(app.state, "stats_reconciler", None)
+    if reconciler is not None:
+        reconciler.cancel()
+    password_pool.shutdown(wait=False)
+    import_hash_pool.shutdown(wait=False)
+    stop_access_log()
\ No newline at end of file
@@ -0,0 +1,152 @@
+# app/middleware/access_log.py
+import json
+import logging
+import queue
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueListener
+from typing import Optional
+
+from app.config import settings
+
+access_logger = logging.getLogger("app.access")
+
+_listener: Optional[QueueListener] = None
+_queue: Optional[queue.SimpleQueue] = None
+
+
+class _AccessLogListener(QueueListener):
+    """
+    QueueListener that turns queued (timestamp, logger, entry) items into log records
+
+    The request path only does a queue put; building the LogRecord and
+    serializing it to JSON both happen on the listener thread.
+    """
+
+    def prepare(self, item) -> logging.LogRecord:
+        created, name, entry = item
+        record = access_logger.makeRecord(
+            name, logging.INFO, "", 0, "access", None, None,
+            extra={"access": entry}
+        )
+        record.created = created
+        return record
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Render a record's `access` dict (or its message) as one JSON line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = getattr(record, "access", None)
+        if entry is None:
+            entry = {"message": record.getMessage()}
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "logger": record.name,
+            **entry
+        }
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+def start_access_log(stream=None) -> None:
+    """
+    Start the background thread that drains access log records
+
+    Args:
+        stream: Output stream (defaults to stdout)
+    """
+    global _listener, _queue
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonLineFormatter())
+
+    _queue = queue.SimpleQueue()
+    _listener = _AccessLogListener(_queue, output, respect_handler_level=False)
+    _listener.start()
+
+
+def stop_access_log() -> None:
+    """Flush pending records and stop the background thread"""
+    global _listener, _queue
+    if _listener is not None:
+        _queue = None
+        _listener.stop()
+        _listener = None
+
+
+def log_access(entry: dict, logger: str = "app.access") -> None:
+    """
+    Queue one access log entry (dropped if the log is not running)
+
+    Args:
+        entry: JSON-serializable fields for the log line
+        logger: Logger name written to the line's "logger" field
+    """
+    log_queue = _queue
+    if log_queue is not None:
+        log_queue.put((time.time(), logger, entry))
+
+
+class AccessLogMiddleware:
+    """
+    ASGI middleware that emits one structured JSON line per request
+
+    Successful requests are sampled at ACCESS_LOG_SAMPLE_RATE; errors
+    (status >= 400), unhandled exceptions and requests slower than
+    ACCESS_LOG_SLOW_MS are always logged. Headers are never logged.
+    """
+
+    def __init__(
+        self,
+        app,
+        sample_rate: Optional[float] = None,
+        slow_ms: Optional[float] = None
+    ):
+        self.app = app
+        self.sample_rate = settings.ACCESS_LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.slow_ms = settings.ACCESS_LOG_SLOW_MS if slow_ms is None else slow_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        error = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if (
+                error is not None
+                or status_code >= 400
+                or duration_ms >= self.slow_ms
+                or (self.sample_rate >= 1.0 or random.random() < self.sample_rate)
+            ):
+                entry = {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round(duration_ms, 3),
+                    "client": scope["client"][0] if scope.get("client") else None,
+                }
+                if duration_ms >= self.slow_ms:
+                    entry["slow"] = True
+                if error is not None:
+                    entry["error"] = error
+                log_access(entry)
@@ -0,0 +1,199 @@
+# app/migrations/__init__.py
+"""
+Versioned schema migrations
+
+Each module in app/migrations/versions is named mNNNN_<description>.py and
+defines:
+    DESCRIPTION: One-line summary
+    upgrade(conn): Apply the change using the given connection
+    TRANSACTIONAL (optional, default True): Set to False for statements that
+        cannot run inside a transaction on PostgreSQL, such as
+        CREATE INDEX CONCURRENTLY. Other databases still run it in a
+        transaction.
+
+Applied versions are recorded in the schema_version table. Run
+`python migrate.py` to apply pending migrations; the app itself never
+runs DDL.
+"""
+
+import importlib
+import pkgutil
+import re
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Callable, List, Optional, Set
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.migrations import versions
+
+_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+# Arbitrary key for pg_advisory_lock so concurrent runs apply migrations once
+_ADVISORY_LOCK_KEY = 0x6E6963_75736572
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One migration module"""
+
+    version: int
+    description: str
+    module: ModuleType
+
+    @property
+    def transactional(self) -> bool:
+        return getattr(self.module, "TRANSACTIONAL", True)
+
+
+def load_migrations() -> List[Migration]:
+    """
+    Import every migration module, ordered by version
+
+    Returns:
+        List[Migration]: All known migrations
+
+    Raises:
+        RuntimeError: If two modules share a version number
+    """
+    migrations = {}
+    for info in pkgutil.iter_modules(versions.__path__):
+        match = re.match(r"m(\d+)_", info.name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise RuntimeError(f"Duplicate migration version {version}: {info.name}")
+        module = importlib.import_module(f"{versions.__name__}.{info.name}")
+        migrations[version] = Migration(version, module.DESCRIPTION, module)
+    return [migrations[v] for v in sorted(migrations)]
+
+
+def applied_versions(conn: Connection) -> Set[int]:
+    """Versions recorded in schema_version (empty if the table does not exist)"""
+    if not inspect(conn).has_table("schema_version"):
+        return set()
+    return set(conn.scalars(select(schema_version.c.version)))
+
+
+def pending_migrations(engine: Engine) -> List[Migration]:
+    """
+    Migrations not yet applied to the database (read-only check)
+
+    Args:
+        engine: Sync engine
+
+    Returns:
+        List[Migration]: Pending migrations in order
+    """
+    with engine.connect() as conn:
+        done = applied_versions(conn)
+    return [m for m in load_migrations() if m.version not in done]
+
+
+def migrate(
+    engine: Engine,
+    target: Optional[int] = None,
+    on_apply: Optional[Callable[[Migration], None]] = None
+) -> List[Migration]:
+    """
+    Apply pending migrations in order
+
+    Args:
+        engine: Sync engine
+        target: Stop after this version (default: apply all)
+        on_apply: Called before each migration runs (e.g. for progress output)
+
+    Returns:
+        List[Migration]: Migrations that were applied
+    """
+    postgres = engine.dialect.name == "postgresql"
+    applied = []
+
+    with engine.connect() as lock_conn:
+        if postgres:
+            lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+            lock_conn.commit()
+        try:
+            with engine.begin() as conn:
+                _metadata.create_all(conn, checkfirst=True)
+                done = applied_versions(conn)
+
+            for migration in load_migrations():
+                if migration.version in done or (target is not None and migration.version > target):
+                    continue
+                if on_apply:
+                    on_apply(migration)
+
+                if migration.transactional or not postgres:
+                    with engine.begin() as conn:
+                        migration.module.upgrade(conn)
+                        _record(conn, migration)
+                else:
+                    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                        migration.module.upgrade(conn)
+                        _record(conn, migration)
+                applied.append(migration)
+        finally:
+            if postgres:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+                lock_conn.commit()
+
+    return applied
+
+
+def _record(conn: Connection, migration: Migration) -> None:
+    conn.execute(schema_version.insert().values(
+        version=migration.version,
+        description=migration.description
+    ))
+
+
+# ========================================
+# HELPERS FOR MIGRATION MODULES
+# ========================================
+
+def create_index(
+    conn: Connection,
+    name: str,
+    table: str,
+    expression: str,
+    using: Optional[str] = None,
+    unique: bool = False
+) -> None:
+    """
+    Create an index if it does not exist, concurrently on PostgreSQL
+
+    On PostgreSQL the connection must be in autocommit mode (use
+    TRANSACTIONAL = False). An invalid index left behind by an interrupted
+    concurrent build is dropped and rebuilt.
+
+    Args:
+        conn: Connection to run on
+        name: Index name
+        table: Table name
+        expression: Column list / expressions, e.g. "is_active, created_at"
+        using: Index method (e.g. "gin"), PostgreSQL only
+        unique: Create a UNIQUE index
+    """
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    if conn.dialect.name == "postgresql":
+        invalid = conn.scalar(text(
+            "SELECT NOT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+        ), {"name": name})
+        if invalid:
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        method = f" USING {using}" if using else ""
+        conn.execute(text(f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} ON {table}{method} ({expression})"))
+    else:
+        conn.execute(text(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({expression})"))
@@ -0,0 +1,36 @@
+# app/migrations/versions/m0001_initial_schema.py
+"""Users table as it existed before migrations, plus token_version"""
+
+from sqlalchemy import (
+    Boolean, Column, DateTime, Enum, Integer, MetaData, String, Table, func, inspect, text
+)
+
+DESCRIPTION = "Create users table"
+
+
+def upgrade(conn):
+    # Frozen copy of the schema; later changes belong in new migrations
+    metadata = MetaData()
+    Table(
+        "users",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("name", String(100), nullable=False),
+        Column("email", String(255), unique=True, index=True, nullable=False),
+        Column("hashed_password", String(255), nullable=False),
+        Column("role", Enum("USER", "ADMIN", "MANAGER", "STAFF", name="userrole"), nullable=False),
+        Column("department", String(100), nullable=False),
+        Column("is_active", Boolean, nullable=False),
+        Column("token_version", Integer, server_default="0", nullable=False),
+        Column("last_login", DateTime(timezone=True), nullable=True),
+        Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+        Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    )
+
+    # Databases created by the old create_all-at-import already have the table
+    if inspect(conn).has_table("users"):
+        columns = {c["name"] for c in inspect(conn).get_columns("users")}
+        if "token_version" not in columns:
+            conn.execute(text("ALTER TABLE users ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0"))
+    else:
+        metadata.create_all(conn)
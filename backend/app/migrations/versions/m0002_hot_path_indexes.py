@@ -0,0 +1,19 @@
+# app/migrations/versions/m0002_hot_path_indexes.py
+"""Composite indexes for the users list filters/sort and case-insensitive login"""
+
+from app.migrations import create_index
+
+DESCRIPTION = "Add users list and login indexes"
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction
+TRANSACTIONAL = False
+
+
+def upgrade(conn):
+    # Unfiltered list: ORDER BY created_at DESC, id DESC (offset and keyset paging)
+    create_index(conn, "ix_users_created_at_id", "users", "created_at, id")
+    # Status and role filters with the same sort
+    create_index(conn, "ix_users_is_active_created_at", "users", "is_active, created_at")
+    create_index(conn, "ix_users_role_created_at", "users", "role, created_at")
+    # Login lookup by lower(email)
+    create_index(conn, "ix_users_email_lower", "users", "lower(email)")
@@ -0,0 +1,49 @@
+# app/migrations/versions/m0003_user_search.py
+"""Trigram search index on user name and email (see app/services/user_search.py)"""
+
+from sqlalchemy import inspect, text
+
+from app.migrations import create_index
+
+DESCRIPTION = "Add user name/email search index"
+
+TRANSACTIONAL = False
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+        name, email, content='users', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_ai AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts(rowid, name, email) VALUES (new.id, new.name, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_ad AFTER DELETE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, name, email) VALUES ('delete', old.id, old.name, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_au AFTER UPDATE OF name, email ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, name, email) VALUES ('delete', old.id, old.name, old.email);
+        INSERT INTO users_fts(rowid, name, email) VALUES (new.id, new.name, new.email);
+    END
+    """,
+]
+
+
+def upgrade(conn):
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        create_index(conn, "ix_users_name_trgm", "users", "name gin_trgm_ops", using="gin")
+        create_index(conn, "ix_users_email_trgm", "users", "email gin_trgm_ops", using="gin")
+    elif dialect == "sqlite":
+        created = not inspect(conn).has_table("users_fts")
+        for statement in SQLITE_DDL:
+            conn.execute(text(statement))
+        if created:
+            # Backfill rows that existed before the triggers
+            conn.execute(text("INSERT INTO users_fts(users_fts) VALUES ('rebuild')"))
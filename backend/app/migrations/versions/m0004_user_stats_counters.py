@@ -0,0 +1,60 @@
+# app/migrations/versions/m0004_user_stats_counters.py
+"""Counters table behind /api/users/stats, backfilled from users"""
+
+from sqlalchemy import (
+    BigInteger, Boolean, Column, DateTime, MetaData, String, Table, cast, func, literal, select,
+    union_all
+)
+
+DESCRIPTION = "Add user_stats counters table"
+
+
+def _signup_month(created_at, dialect: str):
+    """"YYYY-MM" of a timestamp column, in UTC"""
+    if dialect == "postgresql":
+        # to_char on a timestamptz uses the session TimeZone
+        return func.to_char(func.timezone("UTC", created_at), "YYYY-MM")
+    return func.strftime("%Y-%m", created_at)
+
+
+def upgrade(conn):
+    # Frozen copies of the schema; later changes belong in new migrations
+    metadata = MetaData()
+    user_stats = Table(
+        "user_stats",
+        metadata,
+        Column("dimension", String(32), primary_key=True),
+        Column("key", String(100), primary_key=True),
+        Column("count", BigInteger, nullable=False),
+    )
+    users = Table(
+        "users",
+        MetaData(),
+        Column("role", String(20)),
+        Column("department", String(100)),
+        Column("is_active", Boolean),
+        Column("created_at", DateTime(timezone=True)),
+    )
+    metadata.create_all(conn)
+
+    def counts(dimension: str, key=None, where=None):
+        """One counter row per distinct key (a single row when key is None)"""
+        key_column = literal("", String) if key is None else key
+        query = select(
+            literal(dimension, String).label("dimension"), key_column.label("key"), func.count()
+        ).select_from(users)
+        if where is not None:
+            query = query.where(where)
+        return query if key is None else query.group_by(key)
+
+    # Role is an enum on PostgreSQL; the counters store its text value
+    conn.execute(user_stats.insert().from_select(
+        ["dimension", "key", "count"],
+        union_all(
+            counts("total"),
+            counts("active", where=users.c.is_active),
+            counts("role", cast(users.c.role, String(20))),
+            counts("department", users.c.department),
+            counts("signup_month", _signup_month(users.c.created_at, conn.dialect.name)),
+        )
+    ))
@@ -0,0 +1,87 @@
+# app/migrations/versions/m0005_user_activity_rollup.py
+"""
+Daily signup/login/deactivation rollup behind /api/users/stats/timeseries
+
+Backfill: signups come from created_at. Only the most recent login per user
+is stored, so historical logins are approximated by last_login and past
+deactivations cannot be recovered; both accumulate exactly from here on.
+"""
+
+from sqlalchemy import (
+    Column, Date, DateTime, Integer, MetaData, String, Table, cast, func, literal, select
+)
+
+DESCRIPTION = "Add user_activity_daily rollup table"
+
+
+def _day(column, dialect: str):
+    """Calendar day (UTC) of a timestamp column, as stored in the rollup"""
+    if dialect == "postgresql":
+        # A plain cast of a timestamptz uses the session TimeZone
+        return cast(func.timezone("UTC", column), Date)
+    return func.date(column)
+
+
+def upgrade(conn):
+    # Frozen copies of the schema; later changes belong in new migrations
+    metadata = MetaData()
+    activity = Table(
+        "user_activity_daily",
+        metadata,
+        Column("day", Date, primary_key=True),
+        Column("role", String(20), primary_key=True),
+        Column("department", String(100), primary_key=True),
+        Column("signups", Integer, nullable=False),
+        Column("logins", Integer, nullable=False),
+        Column("deactivations", Integer, nullable=False),
+    )
+    users = Table(
+        "users",
+        MetaData(),
+        Column("role", String(20)),
+        Column("department", String(100)),
+        Column("last_login", DateTime(timezone=True)),
+        Column("created_at", DateTime(timezone=True)),
+    )
+    metadata.create_all(conn)
+
+    dialect = conn.dialect.name
+    # Role is an enum on PostgreSQL; store its text value
+    role = cast(users.c.role, String) if dialect == "postgresql" else users.c.role
+
+    signups = (
+        select(
+            _day(users.c.created_at, dialect).label("day"),
+            role.label("role"),
+            users.c.department,
+            func.count().label("signups"),
+            literal(0).label("logins"),
+        )
+        .group_by(_day(users.c.created_at, dialect), role, users.c.department)
+    )
+    logins = (
+        select(
+            _day(users.c.last_login, dialect).label("day"),
+            role.label("role"),
+            users.c.department,
+            literal(0).label("signups"),
+            func.count().label("logins"),
+        )
+        .where(users.c.last_login.isnot(None))
+        .group_by(_day(users.c.last_login, dialect), role, users.c.department)
+    )
+    events = signups.union_all(logins).subquery()
+
+    conn.execute(
+        activity.insert().from_select(
+            ["day", "role", "department", "signups", "logins", "deactivations"],
+            select(
+                events.c.day,
+                events.c.role,
+                events.c.department,
+                func.sum(events.c.signups),
+                func.sum(events.c.logins),
+                literal(0),
+            ).group_by(events.c.day, events.c.role, events.c.department)
+        )
+    )
@@ -0,0 +1,50 @@
+# app/migrations/versions/m0006_unique_email_lower.py
+"""
+Make ix_users_email_lower (m0002) UNIQUE
+
+Emails differing only in case could both register while the index was
+plain. Existing duplicates have to be resolved by hand first; the migration
+lists them instead of failing half-way.
+"""
+
+from sqlalchemy import text
+
+from app.migrations import create_index
+
+DESCRIPTION = "Make the lower(email) index unique"
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction
+TRANSACTIONAL = False
+
+INDEX = "ix_users_email_lower"
+
+
+def _is_unique(conn) -> bool:
+    if conn.dialect.name == "postgresql":
+        return bool(conn.scalar(text(
+            "SELECT i.indisunique FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+        ), {"name": INDEX}))
+    return bool(conn.scalar(text(
+        'SELECT "unique" FROM pragma_index_list(\'users\') WHERE name = :name'
+    ), {"name": INDEX}))
+
+
+def upgrade(conn):
+    if _is_unique(conn):
+        return
+
+    duplicates = list(conn.scalars(text(
+        "SELECT lower(email) FROM users GROUP BY lower(email) HAVING count(*) > 1 LIMIT 20"
+    )))
+    if duplicates:
+        raise RuntimeError(
+            "Emails registered more than once with different case; merge or rename "
+            f"these accounts and re-run: {', '.join(duplicates)}"
+        )
+
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX}"))
+    else:
+        conn.execute(text(f"DROP INDEX IF EXISTS {INDEX}"))
+    create_index(conn, INDEX, "users", "lower(email)", unique=True)
@@ -1,3 +1,4 @@
 from app.models.user import User, UserRole
+from app.models.user_stats import UserStat, UserActivityDaily
 
-__all__ = ["User", "UserRole"]
\ No newline at end of file
+__all__ = ["User", "UserRole", "UserStat", "UserActivityDaily"]
@@ -1,5 +1,6 @@
 # app/models/user.py
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, Enum as SQLEnum
+from sqlalchemy.orm import column_property
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
@@ -16,6 +17,13 @@ class UserRole(str, enum.Enum):
 class User(Base):
     """User database model"""
     __tablename__ = "users"
+    # Indexes mirror the migrations in app/migrations/versions
+    __table_args__ = (
+        # Users list order (newest first, id tie-break) and its filters
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_is_active_created_at", "is_active", "created_at"),
+        Index("ix_users_role_created_at", "role", "created_at"),
+    )
     
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
@@ -25,10 +33,24 @@ class User(Base):
     email = Column(String(255), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     
-    # Role and status
-    role = Column(SQLEnum(UserRole, name='userrole'), default=UserRole.USER, nullable=False)
-    department = Column(String(100), default="Operations", nullable=False)
-    is_active = Column(Boolean, default=True, nullable=False)
+    # Role and status. active_history loads the old value before an
+    # assignment to an expired instance, so the user_stats and activity
+    # flush hooks always see what changed.
+    role = column_property(
+        Column(SQLEnum(UserRole, name='userrole'), default=UserRole.USER, nullable=False),
+        active_history=True
+    )
+    department = column_property(
+        Column(String(100), default="Operations", nullable=False),
+        active_history=True
+    )
+    is_active = column_property(
+        Column(Boolean, default=True, nullable=False),
+        active_history=True
+    )
+    
+    # Bumped on role/status changes to revoke tokens carrying old claims
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     
     # Timestamps
     last_login = Column(DateTime(timezone=True), nullable=True)
@@ -45,4 +67,8 @@ class User(Base):
     )
     
     def __repr__(self):
-        return f"<User(id={self.id}, email={self.email}, role={self.role})>"
\ No newline at end of file
+        return f"<User(id={self.id}, email={self.email}, role={self.role})>"
+
+
+# Case-insensitive login lookup; also keeps A@x.com and a@x.com from both registering
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
@@ -0,0 +1,40 @@
+# app/models/user_stats.py
+from sqlalchemy import BigInteger, Column, Date, Integer, String
+from app.database import Base
+
+
+class UserStat(Base):
+    """
+    Incrementally maintained user counter
+
+    One row per (dimension, key), e.g. ("role", "ADMIN") or
+    ("signup_month", "2026-10"). "total" and "active" use an empty key.
+    """
+    __tablename__ = "user_stats"
+    
+    dimension = Column(String(32), primary_key=True)
+    key = Column(String(100), primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<UserStat({self.dimension}:{self.key}={self.count})>"
+
+
+class UserActivityDaily(Base):
+    """
+    Daily rollup of user lifecycle events
+
+    One row per (day, role, department); rows only ever accumulate, so a
+    chart over any range reads at most one row per day and segment.
+    """
+    __tablename__ = "user_activity_daily"
+    
+    day = Column(Date, primary_key=True)
+    role = Column(String(20), primary_key=True)
+    department = Column(String(100), primary_key=True)
+    signups = Column(Integer, nullable=False, default=0)
+    logins = Column(Integer, nullable=False, default=0)
+    deactivations = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<UserActivityDaily({self.day} {self.role}/{self.department})>"
@@ -0,0 +1,149 @@
+# app/pool_metrics.py
+import time
+from typing import Optional, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    """Checkout wait, usage and timeout counters for one connection pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Optional[Pool] = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.pings = 0
+        self.ping_failures = 0
+        self.connects = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.peak_in_use = 0
+        self.peak_overflow = 0
+
+    def record_wait(self, seconds: float) -> None:
+        """Record how long a checkout waited for a connection"""
+        self.checkouts += 1
+        self.total_wait += seconds
+        if seconds > self.max_wait:
+            self.max_wait = seconds
+
+    def record_usage(self, pool: Pool) -> None:
+        """Track peak in-use and overflow connections"""
+        self.pool = pool
+        if hasattr(pool, "checkedout"):
+            self.peak_in_use = max(self.peak_in_use, pool.checkedout())
+            self.peak_overflow = max(self.peak_overflow, max(pool.overflow(), 0))
+
+    def stats(self) -> dict:
+        """
+        Current pool state plus cumulative counters
+
+        Returns:
+            dict: Sizing, live usage, wait times and timeouts
+        """
+        pool = self.pool
+        live = {}
+        if pool is not None and hasattr(pool, "checkedout"):
+            live = {
+                "size": pool.size(),
+                "checkedIn": pool.checkedin(),
+                "inUse": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "maxOverflow": pool._max_overflow,
+                "timeoutSeconds": pool.timeout()
+            }
+        return {
+            "pool": type(pool).__name__ if pool is not None else None,
+            **live,
+            "peakInUse": self.peak_in_use,
+            "peakOverflow": self.peak_overflow,
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avgWaitMs": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "maxWaitMs": round(self.max_wait * 1000, 3),
+            "pings": self.pings,
+            "pingFailures": self.ping_failures
+        }
+
+
+def instrumented_pool_class(base: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """
+    Subclass a queue pool so checkout wait time and timeouts are measured
+
+    The metrics object is a class attribute, so it survives pool.recreate()
+    on engine.dispose().
+
+    Args:
+        base: QueuePool or AsyncAdaptedQueuePool
+        metrics: Metrics to record into
+
+    Returns:
+        Pool subclass to pass as poolclass=
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return base._do_get(self)
+        except exc.TimeoutError:
+            metrics.timeouts += 1
+            raise
+        finally:
+            metrics.record_wait(time.perf_counter() - started)
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get, "metrics": metrics})
+
+
+def install_pool_events(
+    engine: Engine,
+    metrics: PoolMetrics,
+    pre_ping: str = "always",
+    idle_seconds: float = 60.0
+) -> None:
+    """
+    Attach usage tracking and the pre-ping policy to an engine's pool
+
+    Args:
+        engine: Sync engine (use async_engine.sync_engine for async engines)
+        metrics: Metrics to record into
+        pre_ping: "always" (engine pool_pre_ping), "idle" (only ping connections
+            idle longer than idle_seconds) or "never"
+        idle_seconds: Idle threshold for the "idle" policy
+    """
+    metrics.pool = engine.pool
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.record_usage(engine.pool)
+
+        if pre_ping != "idle":
+            return
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+
+        # Pessimistic ping; DisconnectionError makes the pool retry with a fresh connection
+        metrics.pings += 1
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception:
+            metrics.ping_failures += 1
+            raise exc.DisconnectionError()
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
@@ -1,5 +1,5 @@
 # from app.routers import auth
 
-from app.routers import auth, users
+from app.routers import auth, users, metrics
 
-__all__ = ["auth", "users"]
\ No newline at end of file
+__all__ = ["auth", "users", "metrics"]
\ No newline at end of file
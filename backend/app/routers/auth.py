@@ -3,7 +3,8 @@ print("=" * 60)
 print("🔍 LOADING app/routers/auth.py...")
 print("=" * 60)
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import datetime
 
@@ -11,10 +12,15 @@ print("✅ FastAPI imports loaded")
 
 from app.database import get_db
 from app.models.user import User, UserRole
-from app.schemas.user import UserRegister, UserLogin, UserResponse
+from app.schemas.user import UserRegister, UserLogin, UserResponse, build_user_response
 from app.schemas.token import Token, LoginResponse, RegisterResponse
 from app.utils.dependencies import get_current_user
-from app.utils.security import create_access_token, verify_password, hash_password
+from app.utils.principal import invalidate_principal
+from app.utils.rate_limit import check_login_rate, login_verifications
+from app.config import settings
+from app.services.auth_service import AuthService
+from app.utils.security import create_access_token, averify_password, ahash_password, password_needs_rehash
+from app.utils.json_response import model_response
 
 print("✅ All app imports loaded")
 
@@ -43,8 +49,8 @@ async def register(
 
     print(f"\n📝 Register request for email: {user_data.email}")
     
-    # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    # Check if user already exists (emails are unique regardless of case)
+    existing_user = db.query(User).filter(func.lower(User.email) == user_data.email.lower()).first()
     if existing_user:
         print(f"   ❌ Email already registered: {user_data.email}")
         raise HTTPException(
@@ -53,7 +59,7 @@ async def register(
         )
     
     # Create new user
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await ahash_password(user_data.password)
     new_user = User(
         name=user_data.name,
         email=user_data.email,
@@ -68,22 +74,14 @@ async def register(
     
     print(f"   ✅ User created successfully: {new_user.email} (ID: {new_user.id})")
     
-    # Convert to response model
-    user_response = UserResponse(
-        id=new_user.id,
-        name=new_user.name,
-        email=new_user.email,
-        role=new_user.role.value,
-        is_active=new_user.is_active,
-        created_at=new_user.created_at,
-        updated_at=new_user.updated_at,
-        last_login=new_user.last_login
-    )
-    
-    return RegisterResponse(
-        success=True,
-        message="User registered successfully",
-        data=user_response
+    # Built without validation: every value comes from typed, write-validated columns
+    return model_response(
+        RegisterResponse.model_construct(
+            success=True,
+            message="User registered successfully",
+            data=build_user_response(new_user)
+        ),
+        status_code=status.HTTP_201_CREATED
     )
 
 
@@ -95,13 +93,19 @@ async def register(
 )
 async def login(
     credentials: UserLogin,
+    request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
 
     print(f"\n🔐 Login attempt for email: {credentials.email}")
     
+    # Throttle before paying for a database lookup or an Argon2 verify
+    check_login_rate(request.client.host if request.client else "unknown", credentials.email)
+    
     # Find user by email
-    user = db.query(User).filter(User.email == credentials.email).first()
+    # lower(email) matches the ix_users_email_lower index
+    user = db.query(User).filter(func.lower(User.email) == credentials.email.lower()).first()
     
     if not user:
         print(f"   ❌ User not found: {credentials.email}")
@@ -114,7 +118,10 @@ async def login(
     print(f"   ✅ User found: {user.email} (ID: {user.id})")
     
     # Verify password
-    if not verify_password(credentials.password, user.hashed_password):  # ✅ FIXED
+    async with login_verifications.slot():
+        password_ok = await averify_password(credentials.password, user.hashed_password)
+    
+    if not password_ok:  # ✅ FIXED
         print(f"   ❌ Invalid password for user: {credentials.email}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -124,6 +131,15 @@ async def login(
     
     print(f"   ✅ Password verified for user: {user.email}")
     
+    # Upgrade legacy or outdated hashes once the response has been sent
+    if settings.PASSWORD_REHASH_ON_LOGIN and password_needs_rehash(user.hashed_password):
+        background_tasks.add_task(
+            AuthService.rehash_password,
+            user.id,
+            user.hashed_password,
+            credentials.password
+        )
+    
     # Check if account is active
     if not user.is_active:
         print(f"   ❌ Account inactive: {user.email}")
@@ -140,34 +156,20 @@ async def login(
     
     # Create access token
     access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email}
+        data={"sub": str(user.id), "email": user.email},
+        user=user
     )
     
     print(f"   ✅ Access token created for user: {user.email}")
-    print(f"   Token: {access_token[:50]}...")
     
-    # Convert to response model
-    user_response = UserResponse(
-        id=user.id,
-        name=user.name,
-        email=user.email,
-        role=user.role.value,
-        is_active=user.is_active,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-        last_login=user.last_login
-    )
-    
-    token = Token(
-        access_token=access_token,
-        token_type="bearer"
-    )
-    
-    return LoginResponse(
-        success=True,
-        message="Login successful",
-        data=user_response,
-        token=token
+    # Built without validation: every value comes from typed, write-validated columns
+    return model_response(
+        LoginResponse.model_construct(
+            success=True,
+            message="Login successful",
+            data=build_user_response(user),
+            token=Token.model_construct(access_token=access_token, token_type="bearer")
+        )
     )
 
 
@@ -183,16 +185,7 @@ async def get_current_user_info(
    
     print(f"\n👤 Get current user info: {current_user.email}")
     
-    return UserResponse(
-        id=current_user.id,
-        name=current_user.name,
-        email=current_user.email,
-        role=current_user.role.value,
-        is_active=current_user.is_active,
-        created_at=current_user.created_at,
-        updated_at=current_user.updated_at,
-        last_login=current_user.last_login
-    )
+    return model_response(build_user_response(current_user))
 
 
 @router.put(
@@ -213,19 +206,11 @@ async def update_profile(
     current_user.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(current_user)
+    invalidate_principal(current_user.id)
     
     print(f"   ✅ Profile updated: {current_user.name}")
     
-    return UserResponse(
-        id=current_user.id,
-        name=current_user.name,
-        email=current_user.email,
-        role=current_user.role.value,
-        is_active=current_user.is_active,
-        created_at=current_user.created_at,
-        updated_at=current_user.updated_at,
-        last_login=current_user.last_login
-    )
+    return model_response(build_user_response(current_user))
 
 
 @router.post(
@@ -243,7 +228,7 @@ async def change_password(
     print(f"\n🔑 Change password for user: {current_user.email}")
     
     # Verify old password
-    if not verify_password(old_password, current_user.hashed_password):  # ✅ FIXED
+    if not await averify_password(old_password, current_user.hashed_password):  # ✅ FIXED
         print(f"   ❌ Invalid old password")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -251,9 +236,10 @@ async def change_password(
         )
     
     # Update password
-    current_user.hashed_password = hash_password(new_password)  # ✅ FIXED
+    current_user.hashed_password = await ahash_password(new_password)  # ✅ FIXED
     current_user.updated_at = datetime.utcnow()
     db.commit()
+    invalidate_principal(current_user.id)
     
     print(f"   ✅ Password changed successfully")
     
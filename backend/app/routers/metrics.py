@@ -0,0 +1,105 @@
+# app/routers/metrics.py
+from fastapi import APIRouter, Depends
+
+from app.database import sync_pool_metrics, async_pool_metrics
+from app.services.user_service import activity_response_cache, user_count_cache, users_response_cache
+from app.utils.dependencies import require_admin
+from app.utils.principal import Principal, principal_cache
+from app.utils.rate_limit import login_throttle_stats
+from app.utils.security import password_pool, token_cache_stats
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"]
+)
+
+
+@router.get("/password-hashing")
+async def get_password_hashing_metrics(
+    current_user: Principal = Depends(require_admin)
+):
+    """Password hashing pool queue depth and timings (Admin only)"""
+    return {
+        "success": True,
+        "data": password_pool.stats()
+    }
+
+
+@router.get("/token-cache")
+async def get_token_cache_metrics(
+    current_user: Principal = Depends(require_admin)
+):
+    """Verified-JWT cache hit/miss counters (Admin only)"""
+    return {
+        "success": True,
+        "data": token_cache_stats()
+    }
+
+
+@router.get("/principal-cache")
+async def get_principal_cache_metrics(
+    current_user: Principal = Depends(require_admin)
+):
+    """Authenticated-principal cache hit/miss counters (Admin only)"""
+    return {
+        "success": True,
+        "data": principal_cache.stats()
+    }
+
+
+@router.get("/user-count-cache")
+async def get_user_count_cache_metrics(
+    current_user: Principal = Depends(require_admin)
+):
+    """Filtered user-list total cache hit/miss counters (Admin only)"""
+    return {
+        "success": True,
+        "data": user_count_cache.stats()
+    }
+
+
+@router.get("/response-cache")
+async def get_response_cache_metrics(
+    current_user: Principal = Depends(require_admin)
+):
+    """Users list/stats response cache hit, coalescing and staleness counters (Admin only)"""
+    return {
+        "success": True,
+        "data": users_response_cache.stats()
+    }
+
+
+@router.get("/activity-cache")
+async def get_activity_cache_metrics(
+    current_user: Principal = Depends(require_admin)
+):
+    """Activity time series response cache counters (Admin only)"""
+    return {
+        "success": True,
+        "data": activity_response_cache.stats()
+    }
+
+
+@router.get("/login-throttle")
+async def get_login_throttle_metrics(
+    current_user: Principal = Depends(require_admin)
+):
+    """Login rate limiter and verification cap counters (Admin only)"""
+    return {
+        "success": True,
+        "data": login_throttle_stats()
+    }
+
+
+@router.get("/db-pool")
+async def get_db_pool_metrics(
+    current_user: Principal = Depends(require_admin)
+):
+    """Connection pool usage, checkout wait times and timeouts (Admin only)"""
+    return {
+        "success": True,
+        "data": {
+            "sync": sync_pool_metrics.stats(),
+            "async": async_pool_metrics.stats()
+        }
+    }
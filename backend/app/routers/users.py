@@ -1,23 +1,39 @@
 # app/routers/users.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import Optional
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Tuple
+from datetime import date, datetime, timedelta
 import math
+import tempfile
 import logging
 import sys
 
-from app.database import get_db
-from app.models.user import User, UserRole
+from app.config import settings
+from app.database import get_async_db, AsyncSessionLocal
+from app.models.user import UserRole
 from app.schemas.user import (
     UserCreate,
     UserUpdate,
+    UserBulkSelection,
+    UserBulkUpdate,
     UserManagementResponse,
     UserStatsResponse
 )
-from app.utils.dependencies import get_current_user
-from app.utils.security import get_password_hash
+from app.utils.dependencies import get_current_principal, get_claims_principal
+from app.utils.principal import (
+    Principal, invalidate_principal, bump_token_version, note_token_version, revoke_tokens
+)
+from app.services.user_service import UserService, activity_response_cache, users_response_cache
+from app.services.user_activity import MAX_BUCKETS, bucket_count
+from app.services.user_read_model import UserRow, parse_user_fields
+from app.services.user_import import create_import_job, get_import_job, start_import
+from app.services.user_export import EXPORT_FORMATS, export_users
+from app.utils.security import ahash_password
+from app.utils.tracing import span
+from app.utils.json_response import json_response
+from app.utils.pagination import encode_cursor, decode_cursor
 
 # ✅ VERIFY FILE IS LOADED
 print("\n" + "="*70)
@@ -37,14 +53,16 @@ router = APIRouter(
 # HELPER FUNCTIONS
 # ============================================================================
 
-def require_admin(current_user: User):
-    if current_user.role != UserRole.ADMIN:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+def require_admin(current_user: Principal):
+    with span("auth.role_check", required="admin"):
+        if current_user.role != UserRole.ADMIN:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
     return current_user
 
-def require_admin_or_manager(current_user: User):
-    if current_user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin or Manager access required")
+def require_admin_or_manager(current_user: Principal):
+    with span("auth.role_check", required="admin_or_manager"):
+        if current_user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin or Manager access required")
     return current_user
 
 def convert_role_to_enum(role_str: str) -> UserRole:
@@ -59,18 +77,13 @@ def convert_role_to_enum(role_str: str) -> UserRole:
         raise ValueError(f"Invalid role: {role_str}")
     return role_mapping[role_lower]
 
-def format_user_response(user: User) -> dict:
-    return {
-        "id": user.id,
-        "name": user.name,
-        "email": user.email,
-        "role": user.role.value.lower(),
-        "department": user.department or "N/A",
-        "status": "Active" if user.is_active else "Inactive",
-        "lastLogin": user.last_login.strftime("%Y-%m-%d %I:%M %p") if user.last_login else "Never",
-        "created_at": user.created_at.isoformat() if user.created_at else None,
-        "updated_at": user.updated_at.isoformat() if user.updated_at else None
-    }
+def parse_fields_param(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    try:
+        return parse_user_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return (default: all), e.g. id,name,email"
 
 # ============================================================================
 # ENDPOINTS
@@ -78,31 +91,121 @@ def format_user_response(user: User) -> dict:
 
 @router.get("/stats", response_model=UserStatsResponse)
 async def get_user_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_claims_principal)
 ):
     """Get user statistics"""
     require_admin_or_manager(current_user)
     
+    async def load():
+        async with AsyncSessionLocal() as db:
+            return await UserService.aget_user_stats(db)
+    
     try:
-        total_users = db.query(User).count()
-        active_users = db.query(User).filter(User.is_active == True).count()
-        pending_approvals = db.query(User).filter(User.is_active == False).count()
-        
-        first_day_of_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        new_users_this_month = db.query(User).filter(User.created_at >= first_day_of_month).count()
-        
-        return {
-            "totalUsers": total_users,
-            "activeUsers": active_users,
-            "pendingApprovals": pending_approvals,
-            "newUsersThisMonth": new_users_this_month
-        }
+        with span("users.stats"):
+            return json_response(await users_response_cache.get_or_compute(
+                ("users.stats", current_user.role.value), load
+            ))
     except Exception as e:
         logger.error(f"Error getting stats: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving statistics")
 
 
+@router.get("/stats/timeseries")
+async def get_user_activity_timeseries(
+    start: Optional[date] = Query(None, description="First day (default: 29 days before end)"),
+    end: Optional[date] = Query(None, description="Last day (default: today, UTC)"),
+    bucket: str = Query("day", pattern="^(day|week|month)$", description="day, week or month"),
+    role: Optional[str] = Query(None, description="Filter by role"),
+    department: Optional[str] = Query(None, description="Filter by department"),
+    current_user: Principal = Depends(get_claims_principal)
+):
+    """Get signups, logins and deactivations bucketed by day, week or month"""
+    require_admin_or_manager(current_user)
+    
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if bucket_count(start, end, bucket) > MAX_BUCKETS[bucket]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too long: at most {MAX_BUCKETS[bucket]} {bucket} buckets per request"
+        )
+    
+    role_enum = None
+    if role and role.lower() != "all":
+        try:
+            role_enum = convert_role_to_enum(role)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid role: {role}")
+    
+    async def load():
+        async with AsyncSessionLocal() as db:
+            return await UserService.aget_activity_timeseries(
+                db, start, end, bucket, role_enum, department
+            )
+    
+    try:
+        with span("users.activity_timeseries", bucket=bucket):
+            return json_response(await activity_response_cache.get_or_compute(
+                ("users.timeseries", start, end, bucket, role_enum, department, current_user.role.value),
+                load
+            ))
+    except Exception as e:
+        logger.error(f"Error getting activity timeseries: {e}")
+        raise HTTPException(status_code=500, detail="Error retrieving activity timeseries")
+
+
+async def _load_users_page(
+    page: int,
+    limit: int,
+    search: Optional[str],
+    role: Optional[str],
+    status: Optional[str],
+    fields: Optional[Tuple[str, ...]] = None
+) -> dict:
+    """Build one page-mode users list response on its own session"""
+    skip = (page - 1) * limit
+    
+    async with AsyncSessionLocal() as db:
+        # PAGE AND TOTAL IN ONE ROUND TRIP (total cached per filter combination)
+        with span("users.fetch_page", skip=skip, limit=limit) as s:
+            users, total, total_is_estimate = await UserService.alist_users_page(
+                db, skip, limit, search, role, status, fields
+            )
+            s.set("rows", len(users))
+            s.set("total_is_estimate", total_is_estimate)
+    
+    # CALCULATE PAGINATION
+    total_pages = math.ceil(total / limit) if total > 0 else 1
+    has_more = len(users) == limit if total_is_estimate else page < total_pages
+    
+    # Validate page number (estimates can be off, so only exact totals are enforced)
+    if page > total_pages and total > 0 and not total_is_estimate:
+        raise HTTPException(status_code=400, detail=f"Page {page} exceeds total pages {total_pages}")
+    
+    # Format users
+    with span("users.format"):
+        users_data = [u.to_dict(fields) for u in users]
+    
+    # RETURN PAGINATED OBJECT (NOT ARRAY!)
+    return {
+        "users": users_data,
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "totalPages": total_pages,
+        "totalIsEstimate": total_is_estimate,
+        "hasMore": has_more,
+        # Lets a client switch to keyset paging from here on (not from a
+        # relevance-ranked page: the keyset follows created_at/id order)
+        "nextCursor": (
+            encode_cursor(users[-1].created_at, users[-1].id)
+            if users and has_more and not UserService.orders_by_relevance(search) else None
+        )
+    }
+
+
 @router.get("/")
 async def get_all_users(
     page: int = Query(1, ge=1, description="Page number"),
@@ -110,108 +213,80 @@ async def get_all_users(
     search: Optional[str] = Query(None, description="Search by name or email"),
     role: Optional[str] = Query(None, description="Filter by role"),
     status: Optional[str] = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from a previous nextCursor (empty for the first page); replaces page"
+    ),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: Principal = Depends(get_claims_principal)
 ):
-    """Get paginated users list with WORKING PAGINATION"""
+    """
+    Get paginated users list
     
-    # ✅ FORCED IMMEDIATE OUTPUT - MUST SHOW!
-    sys.stdout.write("\n" + "="*70 + "\n")
-    sys.stdout.write("🔥 GET /api/users/ ENDPOINT HIT!\n")
-    sys.stdout.write("="*70 + "\n")
-    sys.stdout.write(f"📄 Request by: {current_user.email} ({current_user.role.value})\n")
-    sys.stdout.write(f"📄 Page: {page}, Limit: {limit}\n")
-    sys.stdout.write(f"🔍 Search: {search}, Role: {role}, Status: {status}\n")
-    sys.stdout.flush()  # Force immediate output
+    Two modes:
+    - page/limit: numbered pages with total and totalPages (OFFSET based)
+    - cursor/limit: keyset pages via nextCursor, constant cost at any depth
+      and no total count
     
+    With fields, only those columns are selected and serialized.
+    """
     require_admin_or_manager(current_user)
+    fields = parse_fields_param(fields)
     
     try:
-        # Build query
-        query = db.query(User)
-        
-        # Apply search filter
-        if search:
-            pattern = f"%{search}%"
-            query = query.filter(or_(User.name.ilike(pattern), User.email.ilike(pattern)))
-            sys.stdout.write(f"🔍 Search filter applied: {search}\n")
-            sys.stdout.flush()
-        
-        # Apply role filter
+        # Validate role filter
         if role and role.lower() != "all":
             try:
-                role_enum = convert_role_to_enum(role)
-                query = query.filter(User.role == role_enum)
-                sys.stdout.write(f"🏷️  Role filter applied: {role}\n")
-                sys.stdout.flush()
+                convert_role_to_enum(role)
             except ValueError:
                 raise HTTPException(status_code=400, detail=f"Invalid role: {role}")
         
-        # Apply status filter
-        if status and status.lower() != "all":
-            is_active = status.lower() == "active"
-            query = query.filter(User.is_active == is_active)
-            sys.stdout.write(f"📊 Status filter applied: {status}\n")
-            sys.stdout.flush()
-        
-        # GET TOTAL COUNT BEFORE PAGINATION
-        total = query.count()
-        sys.stdout.write(f"\n📊 TOTAL users matching filters: {total}\n")
-        sys.stdout.flush()
-        
-        # CALCULATE PAGINATION
-        total_pages = math.ceil(total / limit) if total > 0 else 1
-        skip = (page - 1) * limit
-        
-        sys.stdout.write(f"📄 Pagination:\n")
-        sys.stdout.write(f"  - Total pages: {total_pages}\n")
-        sys.stdout.write(f"  - Skip (offset): {skip}\n")
-        sys.stdout.write(f"  - Limit: {limit}\n")
-        sys.stdout.flush()
-        
-        # Validate page number
-        if page > total_pages and total > 0:
-            sys.stdout.write(f"❌ Invalid page: {page} exceeds {total_pages}\n")
-            sys.stdout.flush()
-            raise HTTPException(status_code=400, detail=f"Page {page} exceeds total pages {total_pages}")
-        
-        # APPLY PAGINATION - THIS IS THE KEY!
-        users = query.order_by(User.created_at.desc()).offset(skip).limit(limit).all()
-        
-        sys.stdout.write(f"\n✅ Query executed:\n")
-        sys.stdout.write(f"  - Retrieved: {len(users)} users from database\n")
-        sys.stdout.write(f"  - Expected: {min(limit, max(0, total - skip))} users\n")
-        sys.stdout.flush()
-        
-        # Format users
-        users_data = [format_user_response(u) for u in users]
-        
-        # BUILD PAGINATED RESPONSE OBJECT
-        response = {
-            "users": users_data,
-            "total": total,
-            "page": page,
-            "limit": limit,
-            "totalPages": total_pages,
-            "hasMore": page < total_pages
-        }
-        
-        sys.stdout.write(f"\n📤 RESPONSE:\n")
-        sys.stdout.write(f"  - users: {len(users_data)} items\n")
-        sys.stdout.write(f"  - total: {total}\n")
-        sys.stdout.write(f"  - page: {page}/{total_pages}\n")
-        sys.stdout.write(f"  - hasMore: {response['hasMore']}\n")
-        sys.stdout.write("="*70 + "\n\n")
-        sys.stdout.flush()
+        if cursor is not None:
+            try:
+                after = decode_cursor(cursor) if cursor else None
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            
+            # Keyset pages stay newest first even when searching, so the
+            # cursor always points into the order it was taken from
+            with span("users.fetch_keyset", limit=limit) as s:
+                # Sessions are opened per mode: page mode loads on its own
+                # session inside the response cache
+                async with AsyncSessionLocal() as db:
+                    users, has_more = await UserService.aget_users_after(
+                        db, limit, after, search, role, status, fields
+                    )
+                s.set("rows", len(users))
+            
+            with span("users.format"):
+                users_data = [u.to_dict(fields) for u in users]
+            
+            return json_response({
+                "users": users_data,
+                "limit": limit,
+                "nextCursor": encode_cursor(users[-1].created_at, users[-1].id) if has_more else None,
+                "hasMore": has_more
+            })
         
-        # RETURN PAGINATED OBJECT (NOT ARRAY!)
-        return response
+        # Page mode responses are shared between identical requests (see users_response_cache)
+        cache_key = (
+            "users.list",
+            page,
+            limit,
+            search.lower() if search else None,
+            role.lower() if role and role.lower() != "all" else None,
+            status.lower() if status and status.lower() != "all" else None,
+            fields,
+            current_user.role.value
+        )
+        return json_response(await users_response_cache.get_or_compute(
+            cache_key,
+            lambda: _load_users_page(page, limit, search, role, status, fields)
+        ))
         
     except HTTPException:
         raise
     except Exception as e:
-        sys.stdout.write(f"❌ ERROR: {e}\n\n")
-        sys.stdout.flush()
         logger.error(f"Error getting users: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error retrieving users: {str(e)}")
 
@@ -219,68 +294,248 @@ async def get_all_users(
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Create new user (Admin only)"""
     require_admin(current_user)
     
     try:
-        if db.query(User).filter(User.email == user_data.email).first():
-            raise HTTPException(status_code=400, detail="Email already registered")
-        
-        new_user = User(
-            name=user_data.name,
-            email=user_data.email,
-            hashed_password=get_password_hash(user_data.password),
-            role=convert_role_to_enum(user_data.role),
-            department=user_data.department,
-            is_active=user_data.status.lower() == "active"
-        )
-        
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        try:
+            new_user = await UserService.acreate_user(db, user_data)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         return {
             "success": True,
             "message": "User created successfully",
-            "data": format_user_response(new_user)
+            "data": UserRow.from_user(new_user).to_dict()
         }
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error creating user: {e}")
         raise HTTPException(status_code=500, detail="Error creating user")
 
 
+@router.get("/export")
+async def export_all_users(
+    format: str = Query("csv", pattern="^(csv|ndjson|xlsx)$", description="csv, ndjson or xlsx"),
+    search: Optional[str] = Query(None, description="Search by name or email"),
+    role: Optional[str] = Query(None, description="Filter by role"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: Principal = Depends(get_claims_principal)
+):
+    """
+    Download every user matching the list filters
+    
+    Rows are streamed from a server-side cursor as they are read, so the
+    download starts immediately and memory stays flat at any size.
+    """
+    require_admin_or_manager(current_user)
+    fields = parse_fields_param(fields)
+    
+    # Validate before streaming: errors after the first byte cannot change the status code
+    if role and role.lower() != "all":
+        try:
+            convert_role_to_enum(role)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid role: {role}")
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"users-{datetime.utcnow():%Y%m%d-%H%M%S}.{extension}"
+    logger.info(f"📤 User export ({format}) by user {current_user.id}")
+    
+    return StreamingResponse(
+        export_users(format, search, role, status, fields),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.post("/import", status_code=status.HTTP_202_ACCEPTED)
+async def import_users(
+    request: Request,
+    format: Optional[str] = Query(
+        None,
+        pattern="^(csv|ndjson)$",
+        description="csv or ndjson (default: from Content-Type)"
+    ),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Bulk import users from a CSV or NDJSON request body (Admin only)
+    
+    Fields match POST /api/users/: name, email, password and optionally
+    role, department and status. The body is spooled to disk and imported
+    in the background; poll GET /api/users/import/{jobId} for progress and
+    the per-row error report.
+    """
+    require_admin(current_user)
+    
+    content_type = request.headers.get("content-type", "")
+    fmt = format or ("ndjson" if "json" in content_type else "csv")
+    
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Import larger than {settings.USER_IMPORT_MAX_BYTES} bytes"
+    )
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > settings.USER_IMPORT_MAX_BYTES:
+        raise too_large
+    
+    # Disk writes go to a thread so a slow disk never stalls the event loop
+    upload = await run_in_threadpool(tempfile.TemporaryFile)
+    try:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.USER_IMPORT_MAX_BYTES:
+                raise too_large
+            await run_in_threadpool(upload.write, chunk)
+    except BaseException:
+        upload.close()
+        raise
+    
+    job = create_import_job(source=f"api:{current_user.id}")
+    start_import(job, upload, fmt)
+    logger.info(f"📥 User import {job.id} started ({fmt}, {upload.tell()} bytes)")
+    
+    return {
+        "success": True,
+        "message": "Import started",
+        "data": job.to_dict()
+    }
+
+
+@router.get("/import/{job_id}")
+async def get_import_status(
+    job_id: str,
+    current_user: Principal = Depends(get_claims_principal)
+):
+    """Progress and per-row errors of a bulk import (Admin only)"""
+    require_admin(current_user)
+    
+    job = get_import_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    
+    return {
+        "success": True,
+        "data": job.to_dict()
+    }
+
+
+# Declared before the /{user_id} routes so "bulk" is not taken for an id
+@router.patch("/bulk")
+async def bulk_update_users(
+    payload: UserBulkUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Set role, department and/or status on many users (Admin only)
+    
+    Select users with "where" (ids and/or role, department, status) and
+    give the new values in "changes". Runs as one UPDATE.
+    """
+    require_admin(current_user)
+    
+    try:
+        try:
+            with span("users.bulk_update"):
+                result = await UserService.abulk_update_users(db, payload.where, payload.changes)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        for user_id, token_version in result["changed"]:
+            note_token_version(user_id, token_version)
+            invalidate_principal(user_id)
+        
+        return {
+            "success": True,
+            "message": f"{result['updated']} user(s) updated",
+            "data": {"matched": result["matched"], "updated": result["updated"]}
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error bulk updating users: {e}")
+        raise HTTPException(status_code=500, detail="Error updating users")
+
+
+@router.delete("/bulk")
+async def bulk_delete_users(
+    selection: UserBulkSelection,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Delete many users selected by ids and/or role, department, status (Admin only)
+    
+    Runs as one DELETE. Your own account is never deleted: naming it in
+    ids is rejected, and filters that match it skip it.
+    """
+    require_admin(current_user)
+    
+    try:
+        try:
+            with span("users.bulk_delete"):
+                deleted = await UserService.abulk_delete_users(db, selection, current_user.id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        for user_id in deleted:
+            invalidate_principal(user_id)
+            revoke_tokens(user_id)
+        
+        return {
+            "success": True,
+            "message": f"{len(deleted)} user(s) deleted",
+            "data": {"deleted": len(deleted)}
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error bulk deleting users: {e}")
+        raise HTTPException(status_code=500, detail="Error deleting users")
+
+
 @router.get("/{user_id}", response_model=UserManagementResponse)
 async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_claims_principal)
 ):
     """Get single user by ID"""
     require_admin_or_manager(current_user)
+    fields = parse_fields_param(fields)
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await UserService.aget_user_row(db, user_id, fields)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    return format_user_response(user)
+    if fields is not None:
+        # A partial user would fail UserManagementResponse validation
+        return JSONResponse(user.to_dict(fields))
+    return user.to_dict()
 
 
 @router.put("/{user_id}")
 async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Update user"""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await UserService.aget_user_by_id(db, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -298,38 +553,40 @@ async def update_user(
         
         if user_data.email:
             if user_data.email != user.email:
-                existing = db.query(User).filter(
-                    User.email == user_data.email, 
-                    User.id != user_id
-                ).first()
+                existing = await UserService.aget_user_by_email(db, user_data.email, exclude_id=user_id)
                 if existing:
                     raise HTTPException(status_code=400, detail="Email already exists")
             user.email = user_data.email
         
         if user_data.password:
-            user.hashed_password = get_password_hash(user_data.password)
+            user.hashed_password = await ahash_password(user_data.password)
         
         if is_admin:
+            old_role, old_is_active = user.role, user.is_active
             if user_data.role:
                 user.role = convert_role_to_enum(user_data.role)
             if user_data.department:
                 user.department = user_data.department
             if user_data.status:
                 user.is_active = user_data.status.lower() == "active"
+            # Role/status changes cut off tokens carrying the old claims
+            if user.role != old_role or user.is_active != old_is_active:
+                bump_token_version(user)
         
-        user.updated_at = datetime.now()
-        db.commit()
-        db.refresh(user)
+        user.updated_at = datetime.utcnow()
+        await db.commit()
+        await db.refresh(user)
+        invalidate_principal(user_id)
         
         return {
             "success": True,
             "message": "User updated successfully",
-            "data": format_user_response(user)
+            "data": UserRow.from_user(user).to_dict()
         }
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error updating user: {e}")
         raise HTTPException(status_code=500, detail="Error updating user")
 
@@ -337,22 +594,21 @@ async def update_user(
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Delete user (Admin only)"""
     require_admin(current_user)
     
     try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        if user.id == current_user.id:
+        if user_id == current_user.id:
             raise HTTPException(status_code=400, detail="Cannot delete your own account")
         
-        db.delete(user)
-        db.commit()
+        if not await UserService.adelete_user(db, user_id, current_user.id):
+            raise HTTPException(status_code=404, detail="User not found")
+        
+        invalidate_principal(user_id)
+        revoke_tokens(user_id)
         
         return {
             "success": True,
@@ -362,6 +618,6 @@ async def delete_user(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error deleting user: {e}")
         raise HTTPException(status_code=500, detail="Error deleting user")
\ No newline at end of file
@@ -1,6 +1,6 @@
 # app/schemas/user.py
 from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 
@@ -85,6 +85,28 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+# UserResponse fields copied straight from a User row (role is converted)
+_USER_RESPONSE_FIELDS = tuple(name for name in UserResponse.model_fields if name != "role")
+
+
+def build_user_response(user) -> UserResponse:
+    """
+    Build UserResponse from a User row without running validators
+    
+    Every value comes from a typed column that was validated on write, so
+    validating again (EmailStr alone costs ~0.1 ms) only adds latency.
+    
+    Args:
+        user: User ORM instance
+        
+    Returns:
+        UserResponse: Model with role as its enum value
+    """
+    values = {name: getattr(user, name) for name in _USER_RESPONSE_FIELDS}
+    values["role"] = user.role.value
+    return UserResponse.model_construct(**values)
+
+
 class UserInDB(UserResponse):
     """Schema for user with hashed password"""
     hashed_password: str
@@ -154,6 +176,78 @@ class UserUpdate(BaseModel):
         return v
 
 
+class UserBulkSelection(BaseModel):
+    """Users targeted by a bulk operation: explicit ids and/or filters (combined with AND)"""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    role: Optional[str] = None
+    department: Optional[str] = None
+    status: Optional[str] = None
+    
+    @validator('role')
+    def validate_role(cls, v):
+        if v is not None:
+            allowed_roles = ['user', 'admin', 'manager', 'staff']
+            v_lower = v.lower()
+            if v_lower not in allowed_roles:
+                raise ValueError(f'Role must be one of: {", ".join(allowed_roles)}')
+            return v_lower
+        return v
+    
+    @validator('status')
+    def validate_status(cls, v):
+        if v is not None:
+            allowed_statuses = ['active', 'inactive']
+            v_lower = v.lower()
+            if v_lower not in allowed_statuses:
+                raise ValueError(f'Status must be one of: {", ".join(allowed_statuses)}')
+            return v_lower
+        return v
+    
+    def is_empty(self) -> bool:
+        return not self.ids and self.role is None and self.department is None and self.status is None
+
+
+class UserBulkChanges(BaseModel):
+    """Fields a bulk update may set"""
+    role: Optional[str] = None
+    department: Optional[str] = Field(None, min_length=1, max_length=100)
+    status: Optional[str] = None
+    
+    @validator('role')
+    def validate_role(cls, v):
+        if v is not None:
+            allowed_roles = ['user', 'admin', 'manager', 'staff']
+            v_lower = v.lower()
+            if v_lower not in allowed_roles:
+                raise ValueError(f'Role must be one of: {", ".join(allowed_roles)}')
+            return v_lower
+        return v
+    
+    @validator('status')
+    def validate_status(cls, v):
+        if v is not None:
+            allowed_statuses = ['active', 'inactive']
+            v_lower = v.lower()
+            if v_lower not in allowed_statuses:
+                raise ValueError(f'Status must be one of: {", ".join(allowed_statuses)}')
+            return v_lower
+        return v
+
+
+class UserBulkUpdate(BaseModel):
+    """Schema for PATCH /api/users/bulk"""
+    where: UserBulkSelection
+    changes: UserBulkChanges
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "where": {"department": "Treasury", "status": "active"},
+                "changes": {"status": "inactive"}
+            }
+        }
+
+
 class UserManagementResponse(BaseModel):
     """Response schema for user management"""
     id: int
@@ -176,6 +270,8 @@ class UserStatsResponse(BaseModel):
     activeUsers: int
     pendingApprovals: int
     newUsersThisMonth: int
+    byRole: Dict[str, int] = {}
+    byDepartment: Dict[str, int] = {}
 
 
 # ========================================
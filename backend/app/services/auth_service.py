@@ -1,9 +1,15 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime
+import logging
+from app.database import SessionLocal
 from app.models.user import User
 from app.schemas.user import UserRegister, UserLogin
-from app.utils.security import hash_password, verify_password, create_access_token
+from app.utils.security import hash_password, verify_password, create_access_token, ahash_password
+
+logger = logging.getLogger(__name__)
 
 class AuthService:
     """Authentication service with business logic"""
@@ -25,7 +31,7 @@ class AuthService:
         """
         # Check if user with this email already exists
         existing_user = db.query(User).filter(
-            User.email == user_data.email
+            func.lower(User.email) == user_data.email.lower()
         ).first()
         
         if existing_user:
@@ -65,7 +71,7 @@ class AuthService:
         """
         # Get user by email
         user = db.query(User).filter(
-            User.email == login_data.email
+            func.lower(User.email) == login_data.email.lower()
         ).first()
         
         # Check if user exists
@@ -152,7 +158,7 @@ class AuthService:
         Raises:
             HTTPException: If user not found
         """
-        user = db.query(User).filter(User.email == email).first()
+        user = db.query(User).filter(func.lower(User.email) == email.lower()).first()
         
         if not user:
             raise HTTPException(
@@ -160,4 +166,38 @@ class AuthService:
                 detail="User not found"
             )
         
-        return user
\ No newline at end of file
+        return user
+    
+    @staticmethod
+    async def rehash_password(user_id: int, old_hash: str, plain_password: str) -> None:
+        """
+        Replace an outdated password hash after a successful login
+        
+        Meant to run as a background task once the login response is sent.
+        The row is only updated if its hash is still the one that was
+        verified, so a concurrent password change is never overwritten.
+        
+        Args:
+            user_id: ID of the user who just logged in
+            old_hash: Hash that was verified
+            plain_password: Password that matched old_hash
+        """
+        new_hash = await ahash_password(plain_password)
+        
+        def _store() -> int:
+            db = SessionLocal()
+            try:
+                updated = db.query(User).filter(
+                    User.id == user_id,
+                    User.hashed_password == old_hash
+                ).update({User.hashed_password: new_hash}, synchronize_session=False)
+                db.commit()
+                return updated
+            finally:
+                db.close()
+        
+        try:
+            if await run_in_threadpool(_store):
+                logger.info(f"Rehashed password for user ID={user_id}")
+        except Exception as e:
+            logger.error(f"Error rehashing password for user ID={user_id}: {e}")
@@ -0,0 +1,210 @@
+# app/services/user_activity.py
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.models.user import User, UserRole
+from app.models.user_stats import UserActivityDaily
+
+activity_table = UserActivityDaily.__table__
+
+EVENTS = ("signups", "logins", "deactivations")
+BUCKETS = ("day", "week", "month")
+
+# Most buckets one time series may span (about a year of days, five years
+# of weeks, ten years of months); every bucket is built and serialized
+MAX_BUCKETS = {"day": 366, "week": 260, "month": 120}
+
+# (day, role, department, event) -> count
+ActivityDeltas = Counter
+
+
+def utc_today() -> date:
+    """Rollup day for events happening now (timestamps are stored in UTC)"""
+    return datetime.utcnow().date()
+
+
+def record_activity(conn: Connection, deltas: ActivityDeltas) -> None:
+    """
+    Add event counts to the daily rollup inside the caller's transaction
+
+    Session flushes record signups, logins and deactivations automatically;
+    Core paths that bypass the ORM (bulk import/update) call this directly.
+
+    Args:
+        conn: Connection in the transaction that produced the events
+        deltas: (day, role, department, event) -> count
+    """
+    rows: Dict[Tuple[date, str, str], dict] = {}
+    for (day, role, department, name), count in deltas.items():
+        if not count:
+            continue
+        row = rows.setdefault((day, role, department), {
+            "day": day, "role": role, "department": department,
+            "signups": 0, "logins": 0, "deactivations": 0
+        })
+        row[name] += count
+    if not rows:
+        return
+
+    changes = [rows[key] for key in sorted(rows)]
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = (postgresql if dialect == "postgresql" else sqlite).insert(activity_table)
+        conn.execute(
+            insert.on_conflict_do_update(
+                index_elements=[activity_table.c.day, activity_table.c.role, activity_table.c.department],
+                set_={name: activity_table.c[name] + insert.excluded[name] for name in EVENTS}
+            ),
+            changes
+        )
+        return
+
+    for change in changes:
+        result = conn.execute(
+            update(activity_table)
+            .where(
+                activity_table.c.day == change["day"],
+                activity_table.c.role == change["role"],
+                activity_table.c.department == change["department"]
+            )
+            .values({name: activity_table.c[name] + change[name] for name in EVENTS})
+        )
+        if result.rowcount == 0:
+            conn.execute(activity_table.insert().values(**change))
+
+
+@event.listens_for(Session, "after_flush")
+def _record_user_activity(session: Session, flush_context) -> None:
+    """Turn inserted users, last_login updates and deactivations into rollup counts"""
+    today = utc_today()
+    deltas = ActivityDeltas()
+
+    for obj in session.new:
+        if isinstance(obj, User):
+            deltas[(today, obj.role.value, obj.department, "signups")] += 1
+
+    for obj in session.dirty:
+        if not isinstance(obj, User):
+            continue
+        state = inspect(obj)
+        if state.attrs.last_login.history.added and obj.last_login is not None:
+            deltas[(obj.last_login.date(), obj.role.value, obj.department, "logins")] += 1
+        active = state.attrs.is_active.history
+        if active.deleted and active.deleted[0] and not obj.is_active:
+            deltas[(today, obj.role.value, obj.department, "deactivations")] += 1
+
+    if deltas:
+        record_activity(session.connection(), deltas)
+
+
+# ========================================
+# TIME SERIES
+# ========================================
+
+def bucket_start(day: date, bucket: str) -> date:
+    """First day of the day/week (ISO, Monday)/month bucket containing day"""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day + timedelta(days=7)
+    if bucket == "month":
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def bucket_count(start: date, end: date, bucket: str = "day") -> int:
+    """Number of day/week/month buckets summarize_activity builds for [start, end]"""
+    first, last = bucket_start(start, bucket), bucket_start(end, bucket)
+    if bucket == "week":
+        return (last - first).days // 7 + 1
+    if bucket == "month":
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+    return (last - first).days + 1
+
+
+def activity_timeseries_query(
+    start: date,
+    end: date,
+    role: Optional[UserRole] = None,
+    department: Optional[str] = None
+) -> Select:
+    """
+    Per-day event totals from the rollup for [start, end]
+
+    Reads at most one aggregated row per day in the range, whatever the
+    size of the users table.
+
+    Args:
+        start: First day (inclusive)
+        end: Last day (inclusive)
+        role: Only count users with this role
+        department: Only count users in this department
+
+    Returns:
+        Select: Rows of (day, signups, logins, deactivations)
+    """
+    query = (
+        select(
+            activity_table.c.day,
+            *(func.sum(activity_table.c[name]).label(name) for name in EVENTS)
+        )
+        .where(activity_table.c.day >= start, activity_table.c.day <= end)
+        .group_by(activity_table.c.day)
+    )
+    if role is not None:
+        query = query.where(activity_table.c.role == role.value)
+    if department:
+        query = query.where(activity_table.c.department == department)
+    return query
+
+
+def summarize_activity(rows, start: date, end: date, bucket: str = "day") -> dict:
+    """
+    Group per-day totals into day/week/month buckets
+
+    Args:
+        rows: Result of activity_timeseries_query
+        start: First day of the range
+        end: Last day of the range
+        bucket: "day", "week" or "month"
+
+    Returns:
+        dict: bucket, range, series (one entry per bucket, empty ones as
+        zeros) and totals
+    """
+    buckets: Dict[date, Counter] = {}
+    period = bucket_start(start, bucket)
+    while period <= end:
+        buckets[period] = Counter()
+        period = _next_bucket(period, bucket)
+
+    for row in rows:
+        day = row.day if isinstance(row.day, date) else date.fromisoformat(str(row.day))
+        counts = buckets[bucket_start(day, bucket)]
+        for name in EVENTS:
+            counts[name] += getattr(row, name) or 0
+
+    series: List[dict] = [
+        {"period": period.isoformat(), **{name: counts[name] for name in EVENTS}}
+        for period, counts in buckets.items()
+    ]
+    return {
+        "bucket": bucket,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "series": series,
+        "totals": {name: sum(point[name] for point in series) for name in EVENTS}
+    }
@@ -0,0 +1,379 @@
+# app/services/user_import.py
+import asyncio
+import csv
+import io
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.config import settings
+from app.database import async_engine
+from app.models.user import User
+from app.schemas.user import UserCreate
+from app.services.user_activity import ActivityDeltas, record_activity, utc_today
+from app.services.user_service import ROLE_MAPPING
+from app.services.user_stats import Deltas, apply_user_stats_deltas, month_key, user_deltas
+from app.utils.password_pool import PasswordHashPool
+from app.utils.security import hash_password, pwd_context
+from app.utils.user_events import notify_users_changed
+
+logger = logging.getLogger(__name__)
+
+users_table = User.__table__
+
+FORMATS = ("csv", "ndjson")
+
+# Columns written per imported user; the rest come from server defaults
+IMPORT_COLUMNS = ("name", "email", "hashed_password", "role", "department", "is_active")
+
+# Separate from the login pool so a large import never queues logins behind it.
+# Processes rather than threads: a batch keeps every core busy hashing.
+import_hash_pool = PasswordHashPool(
+    max_workers=settings.USER_IMPORT_HASH_WORKERS,
+    memory_budget_mb=settings.PASSWORD_HASH_MEMORY_BUDGET_MB,
+    memory_cost_kib=pwd_context.handler("argon2").memory_cost,
+    executor="process"
+)
+
+# (line number, parsed row or None, parse error or None)
+SourceRow = Tuple[int, Optional[dict], Optional[str]]
+
+
+class ImportJob:
+    """Progress and per-row error report of one bulk import"""
+
+    def __init__(self, source: str = "upload"):
+        self.id = uuid.uuid4().hex
+        self.source = source
+        self.status = "pending"
+        self.message: Optional[str] = None
+        self.rows = 0
+        self.created = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        self.created_at = datetime.utcnow()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def record_error(self, line: int, email: Optional[str], message: str) -> None:
+        """Count a rejected row, keeping the first USER_IMPORT_MAX_ERRORS details"""
+        self.failed += 1
+        if len(self.errors) < settings.USER_IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "email": email, "error": message})
+
+    def to_dict(self) -> dict:
+        elapsed = ((self.finished or time.monotonic()) - self.started) if self.started else 0.0
+        return {
+            "jobId": self.id,
+            "source": self.source,
+            "status": self.status,
+            "message": self.message,
+            "rows": self.rows,
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errorsTruncated": self.failed > len(self.errors),
+            "createdAt": self.created_at.isoformat(),
+            "elapsedSeconds": round(elapsed, 3),
+            "rowsPerSecond": round(self.rows / elapsed, 1) if elapsed else 0.0
+        }
+
+
+# Recent jobs by id, oldest evicted first
+_jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+
+
+def create_import_job(source: str = "upload") -> ImportJob:
+    """Register a new job so its progress can be queried by id"""
+    job = ImportJob(source)
+    _jobs[job.id] = job
+    while len(_jobs) > settings.USER_IMPORT_JOB_HISTORY:
+        _jobs.popitem(last=False)
+    return job
+
+
+def get_import_job(job_id: str) -> Optional[ImportJob]:
+    return _jobs.get(job_id)
+
+
+# ========================================
+# PARSING
+# ========================================
+
+def iter_source_rows(lines: Iterable[str], fmt: str) -> Iterator[SourceRow]:
+    """
+    Parse CSV (with a header row) or NDJSON lazily, one row at a time
+
+    Args:
+        lines: Text lines, e.g. an open file
+        fmt: "csv" or "ndjson"
+
+    Yields:
+        SourceRow: Line number and field dict, or a parse error
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        if reader.fieldnames:
+            reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+        for row in reader:
+            yield reader.line_num, {k: v.strip() for k, v in row.items() if k and v}, None
+        return
+
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_no, None, "Expected a JSON object"
+            continue
+        yield line_no, row, None
+
+
+def _batches(rows: Iterator[SourceRow], size: int) -> Iterator[List[SourceRow]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+# ========================================
+# WRITING
+# ========================================
+
+async def _existing_emails(emails: List[str]) -> set:
+    """Lowercased emails already registered - one indexed query per batch"""
+    async with async_engine.connect() as conn:
+        result = await conn.scalars(
+            select(func.lower(User.email)).where(func.lower(User.email).in_(emails))
+        )
+        return set(result)
+
+
+async def _insert_rows(conn, rows: List[dict]) -> List[dict]:
+    """
+    Insert rows, skipping emails registered concurrently
+
+    PostgreSQL uses COPY; if a concurrent signup makes it hit the unique
+    index, the batch falls back to INSERT ... ON CONFLICT DO NOTHING.
+
+    Returns:
+        List[dict]: The rows actually inserted
+    """
+    if conn.dialect.name == "postgresql":
+        from asyncpg.exceptions import UniqueViolationError
+
+        try:
+            async with conn.begin_nested():
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    users_table.name,
+                    records=[
+                        tuple(row[c].value if c == "role" else row[c] for c in IMPORT_COLUMNS)
+                        for row in rows
+                    ],
+                    columns=list(IMPORT_COLUMNS)
+                )
+            return rows
+        except UniqueViolationError:
+            pass
+
+    # No conflict target: skip rows hitting either the email or the lower(email) unique index
+    insert = (postgresql if conn.dialect.name == "postgresql" else sqlite).insert(users_table)
+    result = await conn.execute(
+        insert.on_conflict_do_nothing().returning(users_table.c.email),
+        rows
+    )
+    # RETURNING yields the email exactly as this statement wrote it (nothing
+    # normalizes the column), and only for inserted rows. A row skipped as a
+    # case variant of an existing email is therefore never matched, and the
+    # batch holds each lowercased email once (see _validate_batch), so an
+    # exact-string match identifies the inserted rows.
+    inserted = set(result.scalars())
+    return [row for row in rows if row["email"] in inserted]
+
+
+def _validate_batch(
+    job: ImportJob,
+    batches: Iterator[List[SourceRow]],
+    seen: set
+) -> Optional[List[Tuple[int, UserCreate]]]:
+    """
+    Read, parse and validate the next batch
+
+    Blocking and CPU-bound (file IO, CSV/JSON decoding, UserCreate), so
+    run_import calls it in a worker thread.
+
+    Returns:
+        list: (line, user) for the valid, not yet seen rows, or None when
+        the source is exhausted
+    """
+    batch = next(batches, None)
+    if batch is None:
+        return None
+
+    valid: List[Tuple[int, UserCreate]] = []
+    for line, data, error in batch:
+        job.rows += 1
+        if error:
+            job.record_error(line, None, error)
+            continue
+        try:
+            user = UserCreate(**data)
+        except ValidationError as e:
+            job.record_error(line, data.get("email"), _validation_message(e))
+            continue
+        key = user.email.lower()
+        if key in seen:
+            job.record_error(line, user.email, "Duplicate email in import")
+            continue
+        seen.add(key)
+        valid.append((line, user))
+    return valid
+
+
+async def _import_batch(job: ImportJob, valid: List[Tuple[int, UserCreate]]) -> None:
+    """De-duplicate against the database, hash and insert one validated batch"""
+    if not valid:
+        return
+
+    existing = await _existing_emails([user.email.lower() for _, user in valid])
+    new = []
+    for line, user in valid:
+        if user.email.lower() in existing:
+            job.record_error(line, user.email, "Email already registered")
+        else:
+            new.append((line, user))
+    if not new:
+        return
+
+    hashes = await asyncio.gather(*(
+        import_hash_pool.run(hash_password, user.password) for _, user in new
+    ))
+    rows = [
+        {
+            "name": user.name,
+            "email": user.email,
+            "hashed_password": hashed,
+            "role": ROLE_MAPPING.get(user.role.lower(), ROLE_MAPPING["user"]),
+            "department": user.department,
+            "is_active": user.status.lower() == "active"
+        }
+        for (_, user), hashed in zip(new, hashes)
+    ]
+
+    # Rows, counters and the activity rollup commit together
+    async with async_engine.begin() as conn:
+        inserted = await _insert_rows(conn, rows)
+        stats, activity = Deltas(), ActivityDeltas()
+        month, today = month_key(), utc_today()
+        for row in inserted:
+            stats.update(user_deltas(row["role"], row["department"], row["is_active"], month))
+            activity[(today, row["role"].value, row["department"], "signups")] += 1
+        await conn.run_sync(apply_user_stats_deltas, stats)
+        await conn.run_sync(record_activity, activity)
+
+    if len(inserted) < len(rows):
+        inserted_emails = {row["email"] for row in inserted}
+        for line, user in new:
+            if user.email not in inserted_emails:
+                job.record_error(line, user.email, "Email already registered")
+    job.created += len(inserted)
+    notify_users_changed()
+
+
+async def run_import(
+    job: ImportJob,
+    lines: Iterable[str],
+    fmt: str,
+    batch_size: Optional[int] = None
+) -> ImportJob:
+    """
+    Import users from CSV or NDJSON lines
+
+    Each batch is committed on its own, so progress survives a failure
+    part-way through and is visible via the job while the import runs.
+    Columns/keys match UserCreate: name, email, password and optionally
+    role, department and status.
+
+    Args:
+        job: Job from create_import_job
+        lines: Text lines of the source
+        fmt: "csv" or "ndjson"
+        batch_size: Rows per batch (default USER_IMPORT_BATCH_SIZE)
+
+    Returns:
+        ImportJob: The finished job
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Invalid import format: {fmt}")
+
+    job.status = "running"
+    job.started = time.monotonic()
+    seen: set = set()
+    batches = _batches(iter_source_rows(lines, fmt), batch_size or settings.USER_IMPORT_BATCH_SIZE)
+    try:
+        # Only hashing and inserts run on the event loop; everything that
+        # blocks or burns CPU per row happens in a thread, batch by batch
+        while True:
+            valid = await asyncio.to_thread(_validate_batch, job, batches, seen)
+            if valid is None:
+                break
+            await _import_batch(job, valid)
+        job.status = "completed"
+    except Exception as e:
+        logger.exception(f"❌ User import {job.id} failed")
+        job.status = "failed"
+        job.message = str(e)
+    finally:
+        job.finished = time.monotonic()
+    return job
+
+
+# Background imports started from the API (kept referenced until done)
+_tasks: Set[asyncio.Task] = set()
+
+
+def start_import(job: ImportJob, source: BinaryIO, fmt: str) -> asyncio.Task:
+    """
+    Run an import in the background from a spooled upload
+
+    Args:
+        job: Job from create_import_job
+        source: Seekable binary file holding the upload; closed when done
+        fmt: "csv" or "ndjson"
+
+    Returns:
+        asyncio.Task: The running import
+    """
+    async def run() -> None:
+        source.seek(0)
+        with io.TextIOWrapper(source, encoding="utf-8-sig", newline="") as lines:
+            await run_import(job, lines, fmt)
+
+    task = asyncio.create_task(run())
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
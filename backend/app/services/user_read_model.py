@@ -0,0 +1,202 @@
+# app/services/user_read_model.py
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from app.models.user import User, UserRole
+from app.utils.formatting import ROLE_NAMES, format_last_login
+
+# Everything list/detail/export responses show - never hashed_password.
+# Order matches UserRow.__init__, so a result row unpacks straight into it.
+USER_ROW_COLUMNS = (
+    User.id,
+    User.name,
+    User.email,
+    User.role,
+    User.department,
+    User.is_active,
+    User.last_login,
+    User.created_at,
+    User.updated_at,
+)
+
+# Users API field (?fields= name) -> the column it is read from
+USER_FIELDS = {
+    "id": User.id,
+    "name": User.name,
+    "email": User.email,
+    "role": User.role,
+    "department": User.department,
+    "status": User.is_active,
+    "lastLogin": User.last_login,
+    "created_at": User.created_at,
+    "updated_at": User.updated_at,
+}
+
+
+def parse_user_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a ?fields= value such as "id,name,email"
+
+    Args:
+        fields: Comma-separated field names, or None/empty for all fields
+
+    Returns:
+        tuple: Requested names in USER_FIELDS order, or None for all fields
+
+    Raises:
+        ValueError: If a name is not in USER_FIELDS
+    """
+    requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    if not requested:
+        return None
+    unknown = requested - USER_FIELDS.keys()
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(sorted(unknown))}. "
+            f"Available: {', '.join(USER_FIELDS)}"
+        )
+    return tuple(name for name in USER_FIELDS if name in requested)
+
+
+def user_row_columns(fields: Optional[Sequence[str]] = None, extra: Sequence = ()) -> tuple:
+    """
+    Columns to select for a set of fields
+
+    Args:
+        fields: Users API field names, or None for all of them
+        extra: Columns the caller needs itself (e.g. created_at and id to
+            build a cursor), added if the fields do not already cover them
+
+    Returns:
+        tuple: USER_ROW_COLUMNS itself for all fields, else only the
+        needed columns
+    """
+    if fields is None:
+        return USER_ROW_COLUMNS
+    columns = [USER_FIELDS[name] for name in fields]
+    keys = {column.key for column in columns}
+    columns.extend(column for column in extra if column.key not in keys)
+    return tuple(columns)
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+# Per-field formatting for sparse responses; to_dict/to_record inline the
+# full set because that path runs for every row of every default request.
+_API_VALUES = {
+    "id": lambda row: row.id,
+    "name": lambda row: row.name,
+    "email": lambda row: row.email,
+    "role": lambda row: ROLE_NAMES[row.role],
+    "department": lambda row: row.department or "N/A",
+    "status": lambda row: "Active" if row.is_active else "Inactive",
+    "lastLogin": lambda row: format_last_login(row.last_login),
+    "created_at": lambda row: _iso(row.created_at),
+    "updated_at": lambda row: _iso(row.updated_at),
+}
+
+_EXPORT_VALUES = {
+    **_API_VALUES,
+    "department": lambda row: row.department,
+    "lastLogin": lambda row: _iso(row.last_login),
+}
+
+
+class UserRow:
+    """
+    Read-only user as shown by the users API
+
+    Built from a select() of USER_ROW_COLUMNS rather than a User entity, so
+    listing rows skips the identity map and attribute instrumentation, and
+    password hashes are never fetched. Slots keep each row to a few pointers.
+
+    Rows for sparse field sets (?fields=) only carry the columns those
+    fields need; the others stay None.
+    """
+
+    __slots__ = tuple(column.key for column in USER_ROW_COLUMNS)
+
+    def __init__(
+        self,
+        id: Optional[int] = None,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+        role: Optional[UserRole] = None,
+        department: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        last_login: Optional[datetime] = None,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None
+    ):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.role = role
+        self.department = department
+        self.is_active = is_active
+        self.last_login = last_login
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_row(cls, row, columns: Sequence = USER_ROW_COLUMNS) -> "UserRow":
+        """
+        Build from a result row
+
+        Args:
+            row: Result row whose leading columns are `columns`
+            columns: What was selected (see user_row_columns)
+        """
+        if columns is USER_ROW_COLUMNS:
+            return cls(*row[:len(USER_ROW_COLUMNS)])
+        return cls(**{column.key: value for column, value in zip(columns, row)})
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserRow":
+        """Build from a User entity already loaded (e.g. just created or updated)"""
+        return cls(*(getattr(user, name) for name in cls.__slots__))
+
+    def to_dict(self, fields: Optional[Sequence[str]] = None) -> dict:
+        """
+        Users API representation (list pages, detail, create/update results)
+
+        Args:
+            fields: Only these USER_FIELDS names (default: all)
+
+        Returns:
+            dict: Formatted user data
+        """
+        if fields is not None:
+            return {name: _API_VALUES[name](self) for name in fields}
+        return {
+            "id": self.id,
+            "name": self.name,
+            "email": self.email,
+            "role": ROLE_NAMES[self.role],
+            "department": self.department or "N/A",
+            "status": "Active" if self.is_active else "Inactive",
+            "lastLogin": format_last_login(self.last_login),
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    def to_record(self, fields: Optional[Sequence[str]] = None) -> Tuple:
+        """Export representation: a tuple in `fields` (default EXPORT_COLUMNS) order"""
+        if fields is not None:
+            return tuple(_EXPORT_VALUES[name](self) for name in fields)
+        return (
+            self.id,
+            self.name,
+            self.email,
+            ROLE_NAMES[self.role],
+            self.department,
+            "Active" if self.is_active else "Inactive",
+            self.last_login.isoformat() if self.last_login else None,
+            self.created_at.isoformat() if self.created_at else None,
+            self.updated_at.isoformat() if self.updated_at else None,
+        )
+
+    def __repr__(self) -> str:
+        return f"<UserRow(id={self.id}, email={self.email}, role={self.role})>"
@@ -0,0 +1,112 @@
+# app/services/user_search.py
+import logging
+from typing import Optional
+
+from sqlalchemy import column, func, inspect, literal, or_, table, text
+from sqlalchemy.engine import Engine
+
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Trigram indexes cannot serve shorter terms; those fall back to ILIKE
+MIN_TRIGRAM_LENGTH = 3
+
+# FTS5 shadow table (external content: stores only the index, not the text)
+users_fts = table("users_fts", column("rowid"), column("rank"))
+
+# Active backend: "pg_trgm", "fts5" or None (plain ILIKE scan)
+_backend: Optional[str] = None
+
+
+def configure_user_search(engine: Engine) -> Optional[str]:
+    """
+    Detect which search index is installed and use it for list queries
+    
+    The index itself is created by migration m0003_user_search.
+
+    Args:
+        engine: Sync engine for the application database
+
+    Returns:
+        str: Active backend name, or None if searches fall back to ILIKE
+    """
+    global _backend
+    _backend = None
+    try:
+        with engine.connect() as conn:
+            if conn.dialect.name == "postgresql":
+                installed = conn.scalar(text(
+                    "SELECT count(*) FROM pg_indexes "
+                    "WHERE tablename = 'users' AND indexname IN ('ix_users_name_trgm', 'ix_users_email_trgm')"
+                ))
+                if installed == 2:
+                    _backend = "pg_trgm"
+            elif conn.dialect.name == "sqlite" and inspect(conn).has_table("users_fts"):
+                _backend = "fts5"
+    except Exception as e:
+        logger.warning(f"User search index unavailable, using ILIKE: {e}")
+    return _backend
+
+
+def search_backend() -> Optional[str]:
+    """Name of the active search backend (None for plain ILIKE)"""
+    return _backend
+
+
+# ========================================
+# QUERY HELPERS
+# ========================================
+
+def _fts5_phrase(term: str) -> str:
+    """Quote a term as one FTS5 phrase so user input is never parsed as query syntax"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def apply_user_search(query, term: str):
+    """
+    Restrict a users query (Select or ORM Query) to rows matching term
+
+    Matches are case-insensitive substrings of name or email, the same
+    semantics as the original ILIKE filter.
+
+    Args:
+        query: Statement selecting from users
+        term: Search term
+
+    Returns:
+        The filtered statement
+    """
+    if _backend == "fts5" and len(term) >= MIN_TRIGRAM_LENGTH:
+        return query.join(users_fts, users_fts.c.rowid == User.id).where(
+            text("users_fts MATCH :user_search").bindparams(user_search=_fts5_phrase(term))
+        )
+
+    # pg_trgm GIN indexes serve ILIKE directly
+    pattern = f"%{term}%"
+    return query.where(or_(User.name.ilike(pattern), User.email.ilike(pattern)))
+
+
+def search_rank(term: str):
+    """
+    Relevance ordering for a query filtered with apply_user_search
+
+    Args:
+        term: Search term
+
+    Returns:
+        ORDER BY element (best match first), or None when the active
+        backend cannot rank this term
+    """
+    if len(term) < MIN_TRIGRAM_LENGTH:
+        return None
+    if _backend == "fts5":
+        # bm25: lower is better
+        return users_fts.c.rank.asc()
+    if _backend == "pg_trgm":
+        needle = literal(term)
+        return func.greatest(
+            func.word_similarity(needle, User.name),
+            func.word_similarity(needle, User.email)
+        ).desc()
+    return None
@@ -1,91 +1,163 @@
 # app/services/user_service.py
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import DateTime, case, delete, func, literal, or_, select, text, tuple_, update
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.sql import Select
+from datetime import date, datetime
+from typing import List, Optional, Sequence, Tuple
 
 from app.models.user import User, UserRole
-from app.schemas.user import UserCreate, UserUpdate, UserManagementResponse
-from app.utils.security import hash_password
+from app.models.user_stats import UserStat
+from app.schemas.user import UserBulkChanges, UserBulkSelection, UserCreate, UserUpdate, UserManagementResponse
+from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.response_cache import SWRCache
+from app.utils.security import hash_password, ahash_password
+from app.utils.user_events import notify_users_changed, on_user_logins, on_users_changed
+from app.services.user_read_model import UserRow, user_row_columns
+from app.services.user_search import apply_user_search, search_rank
+from app.services.user_stats import (
+    Deltas, apply_user_stats_deltas, signup_month_expression, summarize_counters, user_deltas
+)
+from app.services.user_activity import (
+    ActivityDeltas, activity_timeseries_query, record_activity, summarize_activity, utc_today
+)
+
+# Map role strings from the API to UserRole enum
+ROLE_MAPPING = {
+    "user": UserRole.USER,
+    "admin": UserRole.ADMIN,
+    "manager": UserRole.MANAGER,
+    "staff": UserRole.STAFF
+}
+
+# Newest first with id as the tie-break, so keyset pages never skip or repeat rows
+USER_LIST_ORDER = (User.created_at.desc(), User.id.desc())
+
+# Bind type for cursor timestamps. SQLite stores CURRENT_TIMESTAMP without
+# microseconds, so the bound value must use the same text format to compare equal.
+CURSOR_TIMESTAMP_TYPE = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(truncate_microseconds=True), "sqlite"
+)
+
+# Totals for recently used (search, role, status) combinations
+user_count_cache = TTLCache(
+    max_size=settings.USER_COUNT_CACHE_SIZE,
+    default_ttl=settings.USER_COUNT_CACHE_TTL_SECONDS
+)
+on_users_changed(user_count_cache.clear)
+
+# Built responses for hot list/stats GETs, keyed by route, query and role.
+# Cleared on every user write except logins: a login only moves one row's
+# lastLogin, and clearing on each one would empty the cache all day at busy
+# login times. So a listed lastLogin can lag by up to
+# RESPONSE_CACHE_TTL_SECONDS + RESPONSE_CACHE_STALE_SECONDS (35 s by default).
+users_response_cache = SWRCache(
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    stale_ttl=settings.RESPONSE_CACHE_STALE_SECONDS,
+    max_size=settings.RESPONSE_CACHE_SIZE
+)
+on_users_changed(users_response_cache.clear)
+
+# Activity time series count logins, so unlike the lists they are cleared on logins too
+activity_response_cache = SWRCache(
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    stale_ttl=settings.RESPONSE_CACHE_STALE_SECONDS,
+    max_size=settings.RESPONSE_CACHE_SIZE
+)
+on_users_changed(activity_response_cache.clear)
+on_user_logins(activity_response_cache.clear)
+
+
+def _count_cache_key(
+    search: Optional[str],
+    role: Optional[str],
+    status: Optional[str]
+) -> tuple:
+    """Normalize list filters so equivalent requests share a cached total"""
+    role = role.lower() if role and role.lower() != "all" else None
+    status = status.lower() if status and status.lower() != "all" else None
+    return (search.lower() if search else None, role, status)
 
 
 class UserService:
     """Service class for user management operations"""
     
+    # ========================================
+    # STATISTICS
+    # ========================================
+    
     @staticmethod
-    def get_user_stats(db: Session) -> dict:
+    def user_stats_query() -> Select:
         """
-        Get user statistics for dashboard
+        Build the single-scan statistics query
+        
+        One row per (role, department) with total, active and new-this-month
+        counts as conditional aggregates; summarize_user_stats folds the
+        groups into the dashboard totals and breakdowns.
         
         Returns:
-            dict: Statistics including total users, active users, etc.
+            Select: Grouped aggregate statement
         """
-        # Total users
-        total_users = db.query(User).count()
-        
-        # Active users
-        active_users = db.query(User).filter(User.is_active == True).count()
-        
-        # New users this month
-        first_day_of_month = datetime.now().replace(
+        first_day_of_month = datetime.utcnow().replace(
             day=1, hour=0, minute=0, second=0, microsecond=0
         )
-        new_users_this_month = db.query(User).filter(
-            User.created_at >= first_day_of_month
-        ).count()
-        
-        # Pending approvals (placeholder - implement your logic)
-        pending_approvals = 2
-        
-        return {
-            "totalUsers": total_users,
-            "activeUsers": active_users,
-            "pendingApprovals": pending_approvals,
-            "newUsersThisMonth": new_users_this_month
-        }
+        return select(
+            User.role,
+            User.department,
+            func.count(User.id).label("total"),
+            func.sum(case((User.is_active == True, 1), else_=0)).label("active"),
+            func.sum(case((User.created_at >= first_day_of_month, 1), else_=0)).label("new_this_month")
+        ).group_by(User.role, User.department)
     
     @staticmethod
-    def get_all_users(
-        db: Session,
-        search: Optional[str] = None,
-        role: Optional[str] = None,
-        status: Optional[str] = None
-    ) -> List[User]:
+    def summarize_user_stats(rows) -> dict:
         """
-        Get all users with optional filters
+        Fold user_stats_query rows into the stats response
         
         Args:
-            db: Database session
-            search: Search term for name or email
-            role: Filter by role
-            status: Filter by status (active/inactive)
+            rows: Result rows of user_stats_query
             
         Returns:
-            List[User]: List of users matching the criteria
+            dict: Totals plus byRole and byDepartment user counts
         """
-        query = db.query(User)
+        total = active = new_this_month = 0
+        by_role = {role.value.lower(): 0 for role in UserRole}
+        by_department = {}
         
-        # Apply search filter
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                (User.name.ilike(search_pattern)) | 
-                (User.email.ilike(search_pattern))
-            )
+        for row in rows:
+            total += row.total
+            active += row.active or 0
+            new_this_month += row.new_this_month or 0
+            by_role[row.role.value.lower()] += row.total
+            by_department[row.department] = by_department.get(row.department, 0) + row.total
         
-        # Apply role filter
-        if role and role.lower() != "all":
-            query = query.filter(User.role == role.lower())
-        
-        # Apply status filter
-        if status and status.lower() != "all":
-            is_active = (status.lower() == "active")
-            query = query.filter(User.is_active == is_active)
+        return {
+            "totalUsers": total,
+            "activeUsers": active,
+            # Inactive accounts are waiting for an admin to activate them
+            "pendingApprovals": total - active,
+            "newUsersThisMonth": new_this_month,
+            "byRole": by_role,
+            "byDepartment": dict(sorted(by_department.items()))
+        }
+    
+    @staticmethod
+    def get_user_stats(db: Session) -> dict:
+        """
+        Get user statistics for dashboard
         
-        # Order by creation date (newest first)
-        users = query.order_by(User.created_at.desc()).all()
+        Read from the user_stats counters table; falls back to one aggregate
+        scan of users if the counters have not been populated.
         
-        return users
+        Returns:
+            dict: Statistics including total users, active users, etc.
+        """
+        stats = summarize_counters(db.scalars(select(UserStat)))
+        if stats is None:
+            stats = UserService.summarize_user_stats(db.execute(UserService.user_stats_query()))
+        return stats
     
     @staticmethod
     def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
@@ -113,7 +185,7 @@ class UserService:
         Returns:
             User or None
         """
-        return db.query(User).filter(User.email == email).first()
+        return db.query(User).filter(func.lower(User.email) == email.lower()).first()
     
     @staticmethod
     def create_user(db: Session, user_data: UserCreate) -> User:
@@ -210,7 +282,7 @@ class UserService:
             elif field == "email":
                 # Check if new email exists
                 existing = db.query(User).filter(
-                    User.email == value,
+                    func.lower(User.email) == value.lower(),
                     User.id != user_id
                 ).first()
                 if existing:
@@ -254,23 +326,584 @@ class UserService:
         
         return True
     
+    # ========================================
+    # ASYNC EQUIVALENTS (AsyncSession)
+    # ========================================
+    
     @staticmethod
-    def format_user_response(user: User) -> dict:
+    def filtered_users_query(
+        search: Optional[str] = None,
+        role: Optional[str] = None,
+        status: Optional[str] = None,
+        columns: Optional[Sequence] = None
+    ) -> Select:
         """
-        Format user object for API response
+        Build a select() of users with the list endpoint filters applied
         
         Args:
-            user: User object
+            search: Search term for name or email
+            role: Filter by role ("all" or None for no filter)
+            status: Filter by status (active/inactive)
+            columns: User columns to select instead of whole User entities
+                (e.g. USER_ROW_COLUMNS for read-only listings)
             
         Returns:
-            dict: Formatted user data
+            Select: Unordered, unpaginated statement
+            
+        Raises:
+            ValueError: If role is not a known role
         """
-        return {
-            "id": user.id,
-            "name": user.name,
-            "email": user.email,
-            "role": user.role.value,  # Convert enum to string
-            "department": user.department,
-            "status": "Active" if user.is_active else "Inactive",
-            "lastLogin": user.last_login.strftime("%Y-%m-%d %I:%M %p") if user.last_login else "Never"
-        }
\ No newline at end of file
+        query = select(*columns) if columns else select(User)
+        
+        if search:
+            query = apply_user_search(query, search)
+        
+        if role and role.lower() != "all":
+            if role.lower() not in ROLE_MAPPING:
+                raise ValueError(f"Invalid role: {role}")
+            query = query.where(User.role == ROLE_MAPPING[role.lower()])
+        
+        if status and status.lower() != "all":
+            query = query.where(User.is_active == (status.lower() == "active"))
+        
+        return query
+    
+    @staticmethod
+    def list_order(search: Optional[str] = None) -> tuple:
+        """
+        ORDER BY for page-mode lists: relevance first when searching
+        
+        Args:
+            search: Search term, if any
+            
+        Returns:
+            tuple: Order-by elements
+        """
+        rank = search_rank(search) if search else None
+        return USER_LIST_ORDER if rank is None else (rank, *USER_LIST_ORDER)
+    
+    @staticmethod
+    def orders_by_relevance(search: Optional[str] = None) -> bool:
+        """
+        Whether list_order(search) ranks rows by relevance
+        
+        A (created_at, id) keyset taken from such a page would skip or repeat
+        rows, so page mode hands out no nextCursor for it.
+        
+        Args:
+            search: Search term, if any
+            
+        Returns:
+            bool: True if the order is not plain newest first
+        """
+        return bool(search) and search_rank(search) is not None
+    
+    @staticmethod
+    async def aget_user_stats(db: AsyncSession) -> dict:
+        """
+        Get user statistics for dashboard
+        
+        Read from the user_stats counters table; falls back to one aggregate
+        scan of users if the counters have not been populated.
+        
+        Returns:
+            dict: Statistics including total users, active users, etc.
+        """
+        stats = summarize_counters(await db.scalars(select(UserStat)))
+        if stats is None:
+            result = await db.execute(UserService.user_stats_query())
+            stats = UserService.summarize_user_stats(result)
+        return stats
+    
+    @staticmethod
+    async def aget_activity_timeseries(
+        db: AsyncSession,
+        start: date,
+        end: date,
+        bucket: str = "day",
+        role: Optional[UserRole] = None,
+        department: Optional[str] = None
+    ) -> dict:
+        """
+        Get signups, logins and deactivations over time
+        
+        Served from the user_activity_daily rollup, so the cost depends on
+        the number of days in the range rather than the number of users.
+        
+        Args:
+            db: Async database session
+            start: First day (inclusive)
+            end: Last day (inclusive)
+            bucket: "day", "week" or "month"
+            role: Filter by role
+            department: Filter by department
+            
+        Returns:
+            dict: Series with one entry per bucket, plus totals
+        """
+        result = await db.execute(activity_timeseries_query(start, end, role, department))
+        return summarize_activity(result, start, end, bucket)
+    
+    @staticmethod
+    async def acount_users(
+        db: AsyncSession,
+        search: Optional[str] = None,
+        role: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> int:
+        """
+        Count users matching the list filters
+        
+        Returns:
+            int: Number of matching users
+        """
+        query = UserService.filtered_users_query(search, role, status)
+        return await db.scalar(select(func.count()).select_from(query.subquery()))
+    
+    @staticmethod
+    async def aget_users_page(
+        db: AsyncSession,
+        skip: int,
+        limit: int,
+        search: Optional[str] = None,
+        role: Optional[str] = None,
+        status: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[UserRow]:
+        """
+        Get one page of users, newest first (best matches first when searching)
+        
+        Args:
+            db: Async database session
+            skip: Rows to skip
+            limit: Page size
+            fields: Users API fields to load (default: all); id and
+                created_at are always loaded for the cursor
+            
+        Returns:
+            List[UserRow]: Users on the page
+        """
+        columns = user_row_columns(fields, extra=(User.created_at, User.id))
+        query = UserService.filtered_users_query(search, role, status, columns=columns)
+        result = await db.execute(
+            query.order_by(*UserService.list_order(search)).offset(skip).limit(limit)
+        )
+        return [UserRow.from_row(row, columns) for row in result]
+    
+    @staticmethod
+    async def aestimate_user_count(db: AsyncSession) -> Optional[int]:
+        """
+        Planner row estimate for the whole users table (PostgreSQL only)
+        
+        Returns:
+            int: Estimated row count, or None if unavailable (other
+            databases, or a table that has never been analyzed)
+        """
+        if db.bind.dialect.name != "postgresql":
+            return None
+        estimate = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'users'::regclass")
+        )
+        return estimate if estimate is not None and estimate >= 0 else None
+    
+    @staticmethod
+    async def alist_users_page(
+        db: AsyncSession,
+        skip: int,
+        limit: int,
+        search: Optional[str] = None,
+        role: Optional[str] = None,
+        status: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[UserRow], int, bool]:
+        """
+        Get one page of users together with the total matching the filters
+        
+        The total comes from user_count_cache when possible. Otherwise it is
+        computed by a COUNT(*) OVER () window in the page query itself, so the
+        filters are evaluated once per request instead of twice. For
+        unfiltered lists on PostgreSQL, USER_COUNT_ESTIMATE_MIN_ROWS enables
+        a planner estimate instead of an exact count on very large tables.
+        
+        Args:
+            db: Async database session
+            skip: Rows to skip
+            limit: Page size
+            search: Search term for name or email
+            role: Filter by role
+            status: Filter by status (active/inactive)
+            fields: Users API fields to load (default: all)
+            
+        Returns:
+            tuple: (users on the page, total, whether the total is an estimate)
+        """
+        key = _count_cache_key(search, role, status)
+        total = user_count_cache.get(key)
+        estimated = False
+        
+        if total is None and key == (None, None, None) and settings.USER_COUNT_ESTIMATE_MIN_ROWS is not None:
+            estimate = await UserService.aestimate_user_count(db)
+            if estimate is not None and estimate >= settings.USER_COUNT_ESTIMATE_MIN_ROWS:
+                total, estimated = estimate, True
+        
+        if total is not None:
+            users = await UserService.aget_users_page(db, skip, limit, search, role, status, fields)
+            return users, total, estimated
+        
+        columns = user_row_columns(fields, extra=(User.created_at, User.id))
+        query = UserService.filtered_users_query(search, role, status, columns=columns)
+        result = await db.execute(
+            query.add_columns(func.count().over().label("total"))
+            .order_by(*UserService.list_order(search)).offset(skip).limit(limit)
+        )
+        rows = result.all()
+        
+        if rows:
+            total = rows[0].total
+        else:
+            # Past the last row the window has nothing to report on
+            total = await UserService.acount_users(db, search, role, status) if skip else 0
+        
+        user_count_cache.set(key, total)
+        return [UserRow.from_row(row, columns) for row in rows], total, False
+    
+    @staticmethod
+    async def aget_users_after(
+        db: AsyncSession,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+        search: Optional[str] = None,
+        role: Optional[str] = None,
+        status: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[UserRow], bool]:
+        """
+        Get one keyset page of users, newest first
+        
+        Seeks past (created_at, id) instead of using OFFSET, so the cost is
+        the same for every page depth. Search results keep this order rather
+        than relevance, since a rank cannot be used as a stable cursor.
+        
+        Args:
+            db: Async database session
+            limit: Page size
+            after: (created_at, id) of the last row already returned, or None
+                for the first page
+            fields: Users API fields to load (default: all); id and
+                created_at are always loaded for the cursor
+            
+        Returns:
+            tuple: (users on the page, whether more rows follow)
+        """
+        columns = user_row_columns(fields, extra=(User.created_at, User.id))
+        query = UserService.filtered_users_query(search, role, status, columns=columns)
+        
+        if after is not None:
+            created_at, user_id = after
+            query = query.where(
+                tuple_(User.created_at, User.id)
+                < tuple_(literal(created_at, CURSOR_TIMESTAMP_TYPE), literal(user_id))
+            )
+        
+        # Fetch one extra row to learn whether there is a next page
+        result = await db.execute(query.order_by(*USER_LIST_ORDER).limit(limit + 1))
+        users = [UserRow.from_row(row, columns) for row in result]
+        return users[:limit], len(users) > limit
+    
+    @staticmethod
+    async def aget_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+        """
+        Get user by ID
+        
+        Returns:
+            User or None
+        """
+        return await db.get(User, user_id)
+    
+    @staticmethod
+    async def aget_user_row(
+        db: AsyncSession,
+        user_id: int,
+        fields: Optional[Sequence[str]] = None
+    ) -> Optional[UserRow]:
+        """
+        Get a user by ID for display, without loading the User entity
+        
+        Args:
+            db: Async database session
+            user_id: User ID
+            fields: Users API fields to load (default: all)
+            
+        Returns:
+            UserRow or None
+        """
+        columns = user_row_columns(fields)
+        result = await db.execute(select(*columns).where(User.id == user_id))
+        row = result.first()
+        return UserRow.from_row(row, columns) if row else None
+    
+    @staticmethod
+    async def aget_user_by_email(
+        db: AsyncSession,
+        email: str,
+        exclude_id: Optional[int] = None
+    ) -> Optional[User]:
+        """
+        Get user by email
+        
+        Args:
+            db: Async database session
+            email: User email
+            exclude_id: Ignore this user ID (for uniqueness checks on update)
+            
+        Returns:
+            User or None
+        """
+        # Emails are unique case-insensitively (ix_users_email_lower)
+        query = select(User).where(func.lower(User.email) == email.lower())
+        if exclude_id is not None:
+            query = query.where(User.id != exclude_id)
+        return await db.scalar(query.limit(1))
+    
+    @staticmethod
+    async def acreate_user(db: AsyncSession, user_data: UserCreate) -> User:
+        """
+        Create a new user
+        
+        Raises:
+            ValueError: If email already exists
+        """
+        if await UserService.aget_user_by_email(db, user_data.email):
+            raise ValueError("Email already registered")
+        
+        new_user = User(
+            name=user_data.name,
+            email=user_data.email,
+            hashed_password=await ahash_password(user_data.password),
+            role=ROLE_MAPPING.get(user_data.role.lower(), UserRole.USER),
+            department=user_data.department,
+            is_active=(user_data.status.lower() == "active")
+        )
+        
+        db.add(new_user)
+        await db.commit()
+        await db.refresh(new_user)
+        
+        return new_user
+    
+    @staticmethod
+    async def adelete_user(db: AsyncSession, user_id: int, current_user_id: int) -> bool:
+        """
+        Delete a user
+        
+        Returns:
+            bool: True if deleted, False otherwise
+            
+        Raises:
+            ValueError: If trying to delete self
+        """
+        if user_id == current_user_id:
+            raise ValueError("You cannot delete your own account")
+        
+        user = await UserService.aget_user_by_id(db, user_id)
+        if not user:
+            return False
+        
+        await db.delete(user)
+        await db.commit()
+        
+        return True
+    
+    # ========================================
+    # BULK OPERATIONS
+    # ========================================
+    
+    @staticmethod
+    def bulk_selection_criteria(selection: UserBulkSelection, exclude_id: Optional[int] = None) -> list:
+        """
+        WHERE clauses for the users a bulk operation targets
+        
+        Args:
+            selection: Explicit ids and/or role, department and status filters
+            exclude_id: User never touched (the caller, for deletes)
+            
+        Returns:
+            list: Clauses to AND together
+            
+        Raises:
+            ValueError: If the selection is empty (would match every user)
+        """
+        if selection.is_empty():
+            raise ValueError("Specify ids or at least one filter")
+        
+        criteria = []
+        if selection.ids:
+            criteria.append(User.id.in_(selection.ids))
+        if selection.role is not None:
+            criteria.append(User.role == ROLE_MAPPING[selection.role])
+        if selection.department is not None:
+            criteria.append(User.department == selection.department)
+        if selection.status is not None:
+            criteria.append(User.is_active == (selection.status == "active"))
+        if exclude_id is not None:
+            criteria.append(User.id != exclude_id)
+        return criteria
+    
+    @staticmethod
+    def locked_groups_query(dialect: str, criteria: list) -> Select:
+        """
+        Lock the targeted rows and count them per counter bucket
+        
+        One row per (role, department, is_active, signup_month), so counter
+        deltas for any number of users come from a handful of rows.
+        
+        The lock sits in the inner query on purpose: PostgreSQL rejects FOR
+        UPDATE on a query with GROUP BY or aggregates, but allows it in a
+        sub-select in FROM, where it locks every row the subquery returns.
+        Those are exactly the rows the UPDATE/DELETE then changes, so their
+        counts cannot move before commit. SQLite has no FOR UPDATE (the
+        clause is omitted) and serializes writers anyway.
+        
+        Args:
+            dialect: Database dialect name
+            criteria: WHERE clauses from bulk_selection_criteria
+            
+        Returns:
+            Select: Rows of (role, department, is_active, signup_month, n)
+        """
+        targets = (
+            select(User.role, User.department, User.is_active, User.created_at)
+            .where(*criteria)
+            .with_for_update()
+            .subquery()
+        )
+        month = signup_month_expression(dialect, targets.c.created_at).label("signup_month")
+        return (
+            select(targets.c.role, targets.c.department, targets.c.is_active, month, func.count().label("n"))
+            .group_by(targets.c.role, targets.c.department, targets.c.is_active, month)
+        )
+    
+    @staticmethod
+    async def _locked_groups(db: AsyncSession, criteria: list) -> list:
+        """Run locked_groups_query in the caller's transaction"""
+        conn = await db.connection()
+        result = await db.execute(UserService.locked_groups_query(conn.dialect.name, criteria))
+        return list(result)
+    
+    @staticmethod
+    async def abulk_update_users(
+        db: AsyncSession,
+        selection: UserBulkSelection,
+        changes: UserBulkChanges
+    ) -> dict:
+        """
+        Set role, department and/or status on many users in one UPDATE
+        
+        Role/status changes bump token_version like single updates do.
+        Counters and the activity rollup are adjusted in the same
+        transaction.
+        
+        Args:
+            db: Async database session
+            selection: Users to update
+            changes: Values to set
+            
+        Returns:
+            dict: matched (rows selected), updated (rows changed) and the
+            changed rows as (id, token_version) tuples
+            
+        Raises:
+            ValueError: If the selection or the changes are empty
+        """
+        values = {}
+        if changes.role is not None:
+            values["role"] = ROLE_MAPPING[changes.role]
+        if changes.department is not None:
+            values["department"] = changes.department
+        if changes.status is not None:
+            values["is_active"] = changes.status == "active"
+        if not values:
+            raise ValueError("No changes specified")
+        
+        criteria = UserService.bulk_selection_criteria(selection)
+        # Only rows that actually change are written and counted
+        differs = or_(*(getattr(User, name) != value for name, value in values.items()))
+        
+        groups = await UserService._locked_groups(db, criteria)
+        stats, activity = Deltas(), ActivityDeltas()
+        today = utc_today()
+        matched = 0
+        for group in groups:
+            matched += group.n
+            old = {"role": group.role, "department": group.department, "is_active": group.is_active}
+            new = {**old, **values}
+            if new == old:
+                continue
+            for key, change in user_deltas(old["role"], old["department"], old["is_active"], group.signup_month, sign=-1).items():
+                stats[key] += change * group.n
+            for key, change in user_deltas(new["role"], new["department"], new["is_active"], group.signup_month).items():
+                stats[key] += change * group.n
+            if old["is_active"] and not new["is_active"]:
+                activity[(today, new["role"].value, new["department"], "deactivations")] += group.n
+        
+        statement = update(User).where(*criteria, differs).values(**values, updated_at=func.now())
+        if "role" in values or "is_active" in values:
+            # Role/status changes cut off tokens carrying the old claims
+            statement = statement.values(token_version=User.token_version + 1)
+        result = await db.execute(
+            statement.returning(User.id, User.token_version),
+            execution_options={"synchronize_session": False}
+        )
+        changed = [tuple(row) for row in result]
+        
+        conn = await db.connection()
+        await conn.run_sync(apply_user_stats_deltas, stats)
+        await conn.run_sync(record_activity, activity)
+        await db.commit()
+        notify_users_changed()
+        
+        return {"matched": matched, "updated": len(changed), "changed": changed}
+    
+    @staticmethod
+    async def abulk_delete_users(
+        db: AsyncSession,
+        selection: UserBulkSelection,
+        current_user_id: int
+    ) -> List[int]:
+        """
+        Delete many users in one DELETE
+        
+        Args:
+            db: Async database session
+            selection: Users to delete
+            current_user_id: The caller, never deleted
+            
+        Returns:
+            List[int]: IDs of the deleted users
+            
+        Raises:
+            ValueError: If the selection is empty or names the caller
+        """
+        if selection.ids and current_user_id in selection.ids:
+            raise ValueError("You cannot delete your own account")
+        
+        # Filters may match the caller; they are skipped rather than deleted
+        criteria = UserService.bulk_selection_criteria(selection, exclude_id=current_user_id)
+        
+        stats = Deltas()
+        for group in await UserService._locked_groups(db, criteria):
+            for key, change in user_deltas(group.role, group.department, group.is_active, group.signup_month, sign=-1).items():
+                stats[key] += change * group.n
+        
+        result = await db.execute(
+            delete(User).where(*criteria).returning(User.id),
+            execution_options={"synchronize_session": False}
+        )
+        deleted = list(result.scalars())
+        
+        conn = await db.connection()
+        await conn.run_sync(apply_user_stats_deltas, stats)
+        await db.commit()
+        notify_users_changed()
+        
+        return deleted
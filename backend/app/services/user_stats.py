@@ -0,0 +1,253 @@
+# app/services/user_stats.py
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import event, func, inspect, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.models.user import User, UserRole
+from app.models.user_stats import UserStat
+
+logger = logging.getLogger(__name__)
+
+user_stats_table = UserStat.__table__
+
+# (dimension, key) -> change in count
+Deltas = Counter
+
+
+def month_key(value: Optional[datetime] = None) -> str:
+    """
+    Signup month bucket ("YYYY-MM"); defaults to the current month in UTC
+
+    UTC like the stored created_at (server now()) and utc_today() in
+    user_activity, so incremental deltas and rebuild_user_stats agree on the
+    month near a boundary. Aware values (timestamptz read back on
+    PostgreSQL) are converted to UTC first.
+    """
+    if value is None:
+        value = datetime.utcnow()
+    elif value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m")
+
+
+def user_deltas(
+    role: UserRole,
+    department: str,
+    is_active: bool,
+    signup_month: str,
+    sign: int = 1
+) -> Deltas:
+    """
+    Counter changes for adding (sign=1) or removing (sign=-1) one user
+
+    Args:
+        role: User role
+        department: Department name
+        is_active: Whether the account is active
+        signup_month: month_key() of created_at
+        sign: 1 for insert, -1 for delete
+
+    Returns:
+        Deltas: Changes to apply with apply_user_stats_deltas
+    """
+    deltas = Deltas({
+        ("total", ""): sign,
+        ("role", role.value): sign,
+        ("department", department): sign,
+        ("signup_month", signup_month): sign,
+    })
+    if is_active:
+        deltas[("active", "")] += sign
+    return deltas
+
+
+def apply_user_stats_deltas(conn: Connection, deltas: Deltas) -> None:
+    """
+    Add deltas to the counters table inside the caller's transaction
+
+    Call this from Core statements (bulk UPDATE/DELETE, COPY) that bypass
+    the ORM; session flushes are handled automatically.
+
+    Args:
+        conn: Connection in the transaction that changed the users
+        deltas: (dimension, key) -> change
+    """
+    changes = [
+        {"dimension": dimension, "key": key, "count": change}
+        for (dimension, key), change in sorted(deltas.items())
+        if change
+    ]
+    if not changes:
+        return
+
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = (postgresql if dialect == "postgresql" else sqlite).insert(user_stats_table)
+        conn.execute(
+            insert.on_conflict_do_update(
+                index_elements=[user_stats_table.c.dimension, user_stats_table.c.key],
+                set_={"count": user_stats_table.c.count + insert.excluded.count}
+            ),
+            changes
+        )
+        return
+
+    for change in changes:
+        result = conn.execute(
+            update(user_stats_table)
+            .where(user_stats_table.c.dimension == change["dimension"], user_stats_table.c.key == change["key"])
+            .values(count=user_stats_table.c.count + change["count"])
+        )
+        if result.rowcount == 0:
+            conn.execute(user_stats_table.insert().values(**change))
+
+
+def _previous(state, name: str):
+    """Committed value of an attribute before this flush"""
+    history = state.attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(state.obj(), name)
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_user_stats(session: Session, flush_context) -> None:
+    """Apply counter changes for every User inserted, updated or deleted in this flush"""
+    deltas = Deltas()
+
+    for obj in session.new:
+        if isinstance(obj, User):
+            deltas.update(user_deltas(obj.role, obj.department, obj.is_active, month_key()))
+
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            deltas.update(user_deltas(
+                obj.role, obj.department, obj.is_active, month_key(obj.created_at), sign=-1
+            ))
+
+    for obj in session.dirty:
+        if not isinstance(obj, User):
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[name].history.has_changes() for name in ("role", "department", "is_active")):
+            continue
+        month = month_key(obj.created_at)
+        deltas.update(user_deltas(
+            _previous(state, "role"), _previous(state, "department"), _previous(state, "is_active"),
+            month, sign=-1
+        ))
+        deltas.update(user_deltas(obj.role, obj.department, obj.is_active, month))
+
+    if deltas:
+        apply_user_stats_deltas(session.connection(), deltas)
+
+
+# ========================================
+# READING AND RECONCILIATION
+# ========================================
+
+def summarize_counters(counters: Iterable[UserStat]) -> Optional[dict]:
+    """
+    Build the stats response from counter rows
+
+    Args:
+        counters: All rows of the user_stats table
+
+    Returns:
+        dict: Same shape as UserService.summarize_user_stats, or None if
+        the table has not been populated yet
+    """
+    values = {(c.dimension, c.key): c.count for c in counters}
+    if ("total", "") not in values:
+        return None
+
+    total = values[("total", "")]
+    active = values.get(("active", ""), 0)
+    return {
+        "totalUsers": total,
+        "activeUsers": active,
+        "pendingApprovals": total - active,
+        "newUsersThisMonth": values.get(("signup_month", month_key()), 0),
+        "byRole": {role.value.lower(): values.get(("role", role.value), 0) for role in UserRole},
+        "byDepartment": {
+            key: count for (dimension, key), count in sorted(values.items())
+            if dimension == "department" and count
+        }
+    }
+
+
+def signup_month_expression(dialect: str, created_at=User.created_at):
+    """SQL equivalent of month_key(created_at)"""
+    if dialect == "postgresql":
+        # to_char on a timestamptz uses the session TimeZone; bucket in UTC
+        return func.to_char(func.timezone("UTC", created_at), "YYYY-MM")
+    return func.strftime("%Y-%m", created_at)
+
+
+def rebuild_user_stats(conn: Connection) -> int:
+    """
+    Recompute every counter from the users table
+
+    Args:
+        conn: Connection inside a transaction
+
+    Returns:
+        int: Number of counters that had drifted
+    """
+    if conn.dialect.name == "postgresql":
+        # Hold off concurrent counter updates while the table is replaced
+        conn.execute(text("LOCK TABLE user_stats IN EXCLUSIVE MODE"))
+
+    month = signup_month_expression(conn.dialect.name).label("signup_month")
+    rows = conn.execute(
+        select(User.role, User.department, User.is_active, month, func.count(User.id).label("n"))
+        .group_by(User.role, User.department, User.is_active, month)
+    )
+
+    expected = Deltas({("total", ""): 0, ("active", ""): 0})
+    for row in rows:
+        for key, change in user_deltas(row.role, row.department, row.is_active, row.signup_month).items():
+            expected[key] += change * row.n
+
+    current = {
+        (row.dimension, row.key): row.count
+        for row in conn.execute(select(user_stats_table))
+    }
+    drift = {
+        key: expected.get(key, 0) - current.get(key, 0)
+        for key in expected.keys() | current.keys()
+    }
+    drifted = sum(1 for change in drift.values() if change)
+    if drifted:
+        apply_user_stats_deltas(conn, Deltas(drift))
+    
+    # A "total" row marks the table as populated, even with no users yet
+    for dimension in ("total", "active"):
+        if (dimension, "") not in current and not drift[(dimension, "")]:
+            conn.execute(user_stats_table.insert().values(dimension=dimension, key="", count=0))
+    return drifted
+
+
+def reconcile_user_stats(engine: Engine) -> int:
+    """
+    Periodic job: correct counter drift in its own transaction
+
+    Args:
+        engine: Sync engine
+
+    Returns:
+        int: Number of counters corrected
+    """
+    with engine.begin() as conn:
+        drifted = rebuild_user_stats(conn)
+    if drifted:
+        logger.warning(f"⚠️ Corrected {drifted} drifted user stats counter(s)")
+    return drifted
@@ -3,11 +3,16 @@ from app.utils.security import (
     hash_password,
     get_password_hash,
     verify_password,
+    password_needs_rehash,
+    ahash_password,
+    averify_password,
     create_access_token,
-    decode_access_token
+    decode_access_token,
+    decode_access_token_cached
 )
 from app.utils.dependencies import (
     get_current_user,
+    get_current_principal,
     require_admin
 )
 
@@ -15,8 +20,13 @@ __all__ = [
     'hash_password',
     'get_password_hash',
     'verify_password',
+    'password_needs_rehash',
+    'ahash_password',
+    'averify_password',
     'create_access_token',
     'decode_access_token',
+    'decode_access_token_cached',
     'get_current_user',
+    'get_current_principal',
     'require_admin'
 ]
\ No newline at end of file
@@ -1,52 +1,51 @@
 # app/utils/dependencies.py
+import logging
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from jose import JWTError
 
 from app.database import get_db
-from app.models.user import User
-from app.utils.security import decode_access_token
+from app.config import settings
+from app.models.user import User, UserRole
+from app.utils.principal import (
+    Principal,
+    principal_cache,
+    note_token_version,
+    is_token_version_current
+)
+from app.utils.security import decode_access_token_cached
+from app.utils.tracing import span
+
+logger = logging.getLogger(__name__)
 
 # Security scheme
 security = HTTPBearer()
 
-print("🔍 dependencies.py loaded - HTTPBearer security scheme initialized")
 
-
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+def _decode_credentials(credentials: HTTPAuthorizationCredentials) -> tuple:
     """
-    Get current authenticated user from JWT token
+    Decode the bearer token and return the user id it was issued for
     
     Args:
         credentials: HTTP Bearer token credentials
-        db: Database session
         
     Returns:
-        User: Current authenticated user
+        tuple: (user ID from the token's sub claim, token payload)
         
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If token is invalid
     """
-    print(f"\n👤 get_current_user called")
-    print(f"   Credentials: {credentials}")
-    print(f"   Credentials type: {type(credentials)}")
-    
     # Extract token
     token = credentials.credentials
-    print(f"   Extracted token: {token[:50]}...")
     
     try:
         # Decode token
-        token_data = decode_access_token(token)
-        print(f"   Token data result: {token_data}")
+        token_data = decode_access_token_cached(token)
         
         # Check if token data is valid
         if token_data is None or token_data.get('sub') is None:
-            print(f"   ❌ Invalid token data: {token_data}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
@@ -55,68 +54,238 @@ def get_current_user(
         
         # Get user ID from token (sub is the user_id as string)
         user_id = int(token_data.get('sub'))
-        print(f"   User ID from token: {user_id}")
         
     except JWTError as e:
-        print(f"   ❌ JWT Error: {e}")
+        logger.debug("Rejected bearer token: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except ValueError as e:
-        print(f"   ❌ Value Error: {e}")
+    except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token format",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    return user_id, token_data
+
+
+def _reject_stale_token(user_id: int, token_data: dict, current_version: int = 0) -> None:
+    """
+    Reject tokens whose version claim predates a role/status change
+    
+    Args:
+        user_id: User ID from the token
+        token_data: Decoded token payload
+        current_version: Token version known from the database or cache
+        
+    Raises:
+        HTTPException: If the token has been revoked
+    """
+    token_version = token_data.get("ver")
+    if token_version is None:
+        return
+    if token_version < current_version or not is_token_version_current(user_id, token_version):
+        logger.debug("Token version %s revoked for user ID=%s", token_version, user_id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """
+    Get a read-only snapshot of the authenticated user
+    
+    Served from the in-process principal cache, so a typical request makes
+    no database round trip. Use get_current_user when the handler needs
+    the full User row.
+    
+    Args:
+        credentials: HTTP Bearer token credentials
+        db: Database session (only used on a cache miss)
+        
+    Returns:
+        Principal: Current authenticated user snapshot
+        
+    Raises:
+        HTTPException: If token is invalid, user not found or inactive
+    """
+    user_id, token_data = _decode_credentials(credentials)
+    
+    with span("auth.user_lookup") as s:
+        principal = principal_cache.get(user_id)
+        s.set("cache_hit", principal is not None)
+        if principal is None:
+            row = db.query(
+                User.id, User.email, User.role, User.is_active, User.token_version
+            ).filter(User.id == user_id).first()
+            
+            if row is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            
+            principal = Principal(
+                id=row.id,
+                email=row.email,
+                role=row.role,
+                is_active=row.is_active,
+                token_version=row.token_version
+            )
+            principal_cache.set(user_id, principal)
+            note_token_version(user_id, principal.token_version)
+    
+    _reject_stale_token(user_id, token_data, principal.token_version)
+    
+    # Check if user is active
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account is inactive"
+        )
+    
+    return principal
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Get current authenticated user from JWT token
+    
+    Args:
+        credentials: HTTP Bearer token credentials
+        db: Database session
+        
+    Returns:
+        User: Current authenticated user
+        
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    user_id, token_data = _decode_credentials(credentials)
+    
     # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    with span("auth.user_lookup", cache_hit=False):
+        user = db.query(User).filter(User.id == user_id).first()
     
     if user is None:
-        print(f"   ❌ User not found in database: ID={user_id}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Refresh the principal snapshot while we have the row
+    principal_cache.set(
+        user.id,
+        Principal(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            is_active=user.is_active,
+            token_version=user.token_version
+        )
+    )
+    note_token_version(user.id, user.token_version)
+    _reject_stale_token(user.id, token_data, user.token_version)
+    
     # Check if user is active
     if not user.is_active:
-        print(f"   ❌ User account is inactive: {user.email}")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Account is inactive"
         )
     
-    print(f"   ✅ User authenticated: {user.email} (ID: {user.id}, Role: {user.role.value})")
-    
     return user
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
+def get_claims_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
     """
-    Require admin role
+    Get the authenticated principal from signed token claims
+    
+    When TOKEN_ROLE_CLAIMS is enabled and the token carries role, active
+    and version claims, read-only endpoints can authorize from the token
+    alone. Otherwise this falls back to get_current_principal.
     
     Args:
-        current_user: Current authenticated user
+        credentials: HTTP Bearer token credentials
+        db: Database session (only used on fallback)
         
     Returns:
-        User: Current user if admin
+        Principal: Current authenticated user snapshot
         
     Raises:
-        HTTPException: If user is not admin
+        HTTPException: If token is invalid, revoked or the user is inactive
     """
-    from app.models.user import UserRole
+    if not settings.TOKEN_ROLE_CLAIMS:
+        return get_current_principal(credentials, db)
+    
+    user_id, token_data = _decode_credentials(credentials)
     
-    if current_user.role != UserRole.ADMIN:
-        print(f"   ❌ Admin access denied for user: {current_user.email} (Role: {current_user.role.value})")
+    if not {"role", "active", "ver"} <= token_data.keys():
+        return get_current_principal(credentials, db)
+    
+    # A cached snapshot may know about a newer version than the token
+    cached = principal_cache.get(user_id)
+    _reject_stale_token(user_id, token_data, cached.token_version if cached else 0)
+    
+    try:
+        role = UserRole(token_data["role"])
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token format",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    if not token_data["active"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
+            detail="Account is inactive"
         )
     
-    print(f"   ✅ Admin access granted: {current_user.email}")
+    return Principal(
+        id=user_id,
+        email=token_data.get("email", ""),
+        role=role,
+        is_active=True,
+        token_version=token_data["ver"]
+    )
+
+
+def require_admin(current_user: Principal = Depends(get_current_principal)) -> Principal:
+    """
+    Require admin role
+    
+    Args:
+        current_user: Current authenticated principal
+        
+    Returns:
+        Principal: Current principal if admin
+        
+    Raises:
+        HTTPException: If user is not admin
+    """
+    with span("auth.role_check", required="admin"):
+        if current_user.role != UserRole.ADMIN:
+            logger.debug("Admin access denied for user ID=%s", current_user.id)
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin access required"
+            )
+    
     return current_user
\ No newline at end of file
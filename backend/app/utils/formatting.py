@@ -0,0 +1,62 @@
+# app/utils/formatting.py
+import re
+from datetime import datetime
+from typing import Optional
+
+from app.models.user import UserRole
+
+# API spelling of each role ("admin"), computed once instead of per row
+ROLE_NAMES = {role: role.value.lower() for role in UserRole}
+
+
+def format_last_login(value: Optional[datetime]) -> str:
+    """
+    Format a timestamp as "YYYY-MM-DD HH:MM AM", or "Never" for None
+    
+    Same output as strftime("%Y-%m-%d %I:%M %p") in the C locale, without
+    strftime's per-call format parsing (it runs for every row of a page).
+    
+    Args:
+        value: Timestamp or None
+        
+    Returns:
+        str: Formatted timestamp
+    """
+    if value is None:
+        return "Never"
+    hour = value.hour
+    return (
+        f"{value.year:04d}-{value.month:02d}-{value.day:02d} "
+        f"{hour % 12 or 12:02d}:{value.minute:02d} {'AM' if hour < 12 else 'PM'}"
+    )
+
+
+# Leading characters that make Excel/LibreOffice evaluate a cell as a formula.
+# "-" is handled separately: a lone "-" or a hyphen-led name is ordinary text.
+FORMULA_PREFIXES = ("=", "+", "@", "\t", "\r")
+
+# After a leading "-", what turns the cell into a number or an expression
+# ("-1", "-.5", "-(A1)", "--1", "-1+cmd|' /C calc'!A0")
+_MINUS_FORMULA = re.compile(r"-[\d.(=+\-@]|-.*[|!]")
+
+
+def spreadsheet_safe(value):
+    """
+    Neutralize a CSV cell a spreadsheet would run as a formula
+    
+    User-supplied text (e.g. a self-registered name of "=HYPERLINK(...)")
+    is prefixed with ' so it is shown as text; other values pass through.
+    Only for formats a spreadsheet parses (CSV): XLSX inline strings are
+    never evaluated, so there the prefix would just corrupt the value.
+    
+    Args:
+        value: Cell value
+        
+    Returns:
+        The value, prefixed with ' if it would be evaluated
+    """
+    if isinstance(value, str) and (
+        value.startswith(FORMULA_PREFIXES) or _MINUS_FORMULA.match(value)
+    ):
+        return "'" + value
+    return value
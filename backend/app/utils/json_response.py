@@ -0,0 +1,105 @@
+# app/utils/json_response.py
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from app.config import settings
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the standard library encoder
+    orjson = None
+
+
+def _orjson_default(value: Any) -> Any:
+    """Types orjson does not encode natively (datetime, enum, UUID and dataclasses it does)"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_default(value: Any) -> Any:
+    """Same conversions for the standard library encoder"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    return _orjson_default(value)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as compact UTF-8 JSON
+    
+    Datetimes are ISO 8601 and enums their values, as jsonable_encoder
+    produces, so switching encoders does not change response bodies.
+    
+    Args:
+        content: Dicts, lists, primitives, datetimes, enums, Pydantic models
+        
+    Returns:
+        bytes: JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_json_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (or compact json when it is not installed)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any) -> Any:
+    """
+    Send an already-built payload straight to the fast encoder
+    
+    FastAPI runs jsonable_encoder over every dict a handler returns before
+    rendering it, which costs more than the encoding itself for large
+    pages. Returning a response object skips that pass. With
+    FAST_JSON_RESPONSES off the payload is returned unchanged.
+    
+    Args:
+        content: Response payload of plain JSON-compatible values
+        
+    Returns:
+        FastJSONResponse, or content as-is
+    """
+    if settings.FAST_JSON_RESPONSES:
+        return FastJSONResponse(content)
+    return content
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    """
+    Send a validated model as JSON without validating it a second time
+    
+    A handler returning a model makes FastAPI dump it, validate the dump
+    against response_model and serialize it again. Returning a Response
+    skips that; response_model still documents the route. The body is the
+    same bytes FastAPI would have produced.
+    
+    Args:
+        model: Already-validated response model
+        status_code: HTTP status code (the route decorator's is not applied)
+        
+    Returns:
+        Response: application/json response
+    """
+    return Response(model.model_dump_json(), status_code=status_code, media_type="application/json")
@@ -0,0 +1,156 @@
+# app/utils/password_pool.py
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class PasswordHashPool:
+    """
+    Bounded worker pool for Argon2 hashing and verification
+
+    Argon2 calls are CPU and memory heavy, so running them on the event loop
+    stalls every other request on the worker. The pool runs them on a
+    dedicated executor and caps how many run at once so that
+    memory_cost x concurrency stays inside the configured memory budget.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        memory_budget_mb: int = 512,
+        memory_cost_kib: int = 65536,
+        executor: str = "thread"
+    ):
+        """
+        Args:
+            max_workers: Upper bound on worker threads/processes (defaults to CPU count)
+            memory_budget_mb: Memory the pool may use for concurrent hashes
+            memory_cost_kib: Argon2 memory cost of a single hash in KiB
+            executor: "thread" or "process"
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Invalid executor type: {executor}")
+
+        workers = max_workers or os.cpu_count() or 1
+        memory_cap = max(1, (memory_budget_mb * 1024) // max(memory_cost_kib, 1))
+
+        self.executor_type = executor
+        self.memory_cost_kib = memory_cost_kib
+        self.memory_budget_mb = memory_budget_mb
+        self.max_concurrency = max(1, min(workers, memory_cap))
+
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._queued = 0
+        self._running = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._max_queue_depth = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    def _get_executor(self) -> Executor:
+        """Create the executor on first use"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    if self.executor_type == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_concurrency)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_concurrency,
+                            thread_name_prefix="password-hash"
+                        )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Semaphores are bound to a loop, so recreate it if the loop changed"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a hashing function on the pool without blocking the event loop
+
+        Args:
+            fn: Module-level callable (must be picklable for the process executor)
+            *args: Positional arguments for fn
+
+        Returns:
+            Result of fn(*args)
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._get_semaphore()
+
+        enqueued_at = time.perf_counter()
+        self._submitted += 1
+        self._queued += 1
+        self._max_queue_depth = max(self._max_queue_depth, self._queued)
+
+        try:
+            await semaphore.acquire()
+        except BaseException:
+            self._queued -= 1
+            raise
+
+        started_at = time.perf_counter()
+        wait = started_at - enqueued_at
+        self._queued -= 1
+        self._running += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+
+        try:
+            result = await loop.run_in_executor(self._get_executor(), fn, *args)
+            self._completed += 1
+            return result
+        except BaseException:
+            self._failed += 1
+            raise
+        finally:
+            self._running -= 1
+            self._total_run += time.perf_counter() - started_at
+            semaphore.release()
+
+    def stats(self) -> dict:
+        """
+        Queue and throughput metrics for sizing the pool
+
+        Returns:
+            dict: Current queue depth, in-flight count and timing totals
+        """
+        finished = self._completed + self._failed
+        started = finished + self._running
+        return {
+            "executor": self.executor_type,
+            "maxConcurrency": self.max_concurrency,
+            "memoryCostKib": self.memory_cost_kib,
+            "memoryBudgetMb": self.memory_budget_mb,
+            "queueDepth": self._queued,
+            "maxQueueDepth": self._max_queue_depth,
+            "running": self._running,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "avgWaitMs": round(self._total_wait / started * 1000, 3) if started else 0.0,
+            "maxWaitMs": round(self._max_wait * 1000, 3),
+            "avgRunMs": round(self._total_run / finished * 1000, 3) if finished else 0.0
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the executor (it is recreated lazily if used again)"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
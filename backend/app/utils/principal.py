@@ -0,0 +1,95 @@
+# app/utils/principal.py
+from dataclasses import dataclass
+
+from app.config import settings
+from app.models.user import UserRole
+from app.utils.cache import TTLCache
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Read-only snapshot of the authenticated user used for authorization"""
+    id: int
+    email: str
+    role: UserRole
+    is_active: bool
+    token_version: int = 0
+
+
+# Principals keyed by user id; writes invalidate, the TTL is a safety net
+principal_cache = TTLCache(
+    max_size=settings.PRINCIPAL_CACHE_SIZE,
+    default_ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+# Lowest token version still accepted per user, as far as this process knows.
+# Other workers learn about bumps on their next database lookup, so a stale
+# claims token can live there until its exp at the latest.
+# Every token older than an entry expires within ACCESS_TOKEN_EXPIRE_MINUTES
+# of it being set, so after that the entry can no longer reject anything.
+_min_token_versions = TTLCache(
+    max_size=settings.TOKEN_VERSION_CACHE_SIZE,
+    default_ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+# Sentinel version for deleted users: no token is ever accepted again
+REVOKED_TOKEN_VERSION = 2 ** 62
+
+
+def invalidate_principal(user_id: int) -> None:
+    """
+    Drop a cached principal after the user row changed
+    
+    Args:
+        user_id: ID of the updated or deleted user
+    """
+    principal_cache.delete(user_id)
+
+
+def note_token_version(user_id: int, token_version: int) -> None:
+    """
+    Record the current token version seen in the database
+    
+    Args:
+        user_id: User ID
+        token_version: Current value of users.token_version
+    """
+    if token_version > (_min_token_versions.get(user_id) or 0):
+        _min_token_versions.set(user_id, token_version)
+
+
+def bump_token_version(user) -> None:
+    """
+    Increment a user's token version so tokens with older claims are rejected
+    
+    Must be called before the session is committed.
+    
+    Args:
+        user: User ORM instance whose role or status is changing
+    """
+    user.token_version = (user.token_version or 0) + 1
+    note_token_version(user.id, user.token_version)
+
+
+def revoke_tokens(user_id: int) -> None:
+    """
+    Reject every token issued for a deleted user
+    
+    Args:
+        user_id: ID of the deleted user
+    """
+    _min_token_versions.set(user_id, REVOKED_TOKEN_VERSION)
+
+
+def is_token_version_current(user_id: int, token_version: int) -> bool:
+    """
+    Check a token's version claim against the newest version known here
+    
+    Args:
+        user_id: User ID from the token
+        token_version: Version claim signed into the token
+        
+    Returns:
+        bool: False if the token was issued before a role/status change
+    """
+    return token_version >= (_min_token_versions.get(user_id) or 0)
@@ -0,0 +1,199 @@
+# app/utils/rate_limit.py
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Callable, Hashable
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+
+
+class TokenBucketLimiter:
+    """
+    In-memory token-bucket rate limiter with bounded key storage
+
+    Each key gets a bucket of `burst` tokens refilled at `rate_per_minute`.
+    Buckets idle for longer than idle_seconds are dropped (a fully refilled
+    bucket is equivalent to no bucket) and the least recently used keys are
+    evicted once max_keys is reached, so memory stays bounded under floods
+    of unique keys.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        burst: int,
+        max_keys: int = 100_000,
+        idle_seconds: float = 600.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            rate_per_minute: Sustained attempts allowed per key
+            burst: Attempts allowed back-to-back before throttling
+            max_keys: Maximum number of tracked keys
+            idle_seconds: Drop buckets not touched for this long
+            clock: Monotonic time source in seconds (tests pass a fake one)
+        """
+        self.clock = clock
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self.idle_seconds = idle_seconds
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop idle buckets from the least recently used end"""
+        while self._buckets:
+            _, last_seen = next(iter(self._buckets.values()))
+            if now - last_seen < self.idle_seconds and len(self._buckets) <= self.max_keys:
+                break
+            self._buckets.popitem(last=False)
+            self.evicted += 1
+
+    def acquire(self, key: Hashable) -> float:
+        """
+        Take one token for key
+
+        Args:
+            key: Bucket key (e.g. client IP or normalized email)
+
+        Returns:
+            float: 0 if allowed, otherwise seconds until a token is available
+        """
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(self.burst), now]
+                self._buckets[key] = bucket
+            else:
+                tokens, last_seen = bucket
+                bucket[0] = min(float(self.burst), tokens + (now - last_seen) * self.rate)
+                bucket[1] = now
+                self._buckets.move_to_end(key)
+            self._evict_idle(now)
+
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                self.allowed += 1
+                return 0.0
+
+            self.rejected += 1
+            return (1.0 - bucket[0]) / self.rate if self.rate > 0 else self.idle_seconds
+
+    def stats(self) -> dict:
+        """Allowed/rejected counters and tracked key count"""
+        return {
+            "trackedKeys": len(self._buckets),
+            "maxKeys": self.max_keys,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "evicted": self.evicted
+        }
+
+
+class ConcurrencyLimiter:
+    """
+    Fail-fast cap on concurrent operations
+
+    Unlike a semaphore, callers over the limit are rejected immediately
+    instead of queueing, so a flood cannot build an unbounded backlog.
+    """
+
+    def __init__(self, max_concurrent: int):
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self, retry_after: int = 1):
+        """
+        Hold one slot for the duration of the block
+
+        Raises:
+            HTTPException: 503 with Retry-After if all slots are taken
+        """
+        if self.in_flight >= self.max_concurrent:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry",
+                headers={"Retry-After": str(retry_after)}
+            )
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        """Current and peak in-flight counts"""
+        return {
+            "maxConcurrent": self.max_concurrent,
+            "inFlight": self.in_flight,
+            "maxInFlight": self.max_in_flight,
+            "rejected": self.rejected
+        }
+
+
+# ========================================
+# LOGIN ADMISSION CONTROL
+# ========================================
+
+login_ip_limiter = TokenBucketLimiter(
+    rate_per_minute=settings.LOGIN_IP_RATE_PER_MINUTE,
+    burst=settings.LOGIN_IP_BURST,
+    max_keys=settings.LOGIN_LIMITER_MAX_KEYS,
+    idle_seconds=settings.LOGIN_LIMITER_IDLE_SECONDS
+)
+
+login_email_limiter = TokenBucketLimiter(
+    rate_per_minute=settings.LOGIN_EMAIL_RATE_PER_MINUTE,
+    burst=settings.LOGIN_EMAIL_BURST,
+    max_keys=settings.LOGIN_LIMITER_MAX_KEYS,
+    idle_seconds=settings.LOGIN_LIMITER_IDLE_SECONDS
+)
+
+login_verifications = ConcurrencyLimiter(settings.LOGIN_MAX_CONCURRENT_VERIFICATIONS)
+
+
+def check_login_rate(client_ip: str, email: str) -> None:
+    """
+    Reject a login attempt before any password hashing happens
+
+    Args:
+        client_ip: Remote address of the client
+        email: Email from the login request
+
+    Raises:
+        HTTPException: 429 with Retry-After if either bucket is empty
+    """
+    retry_after = login_ip_limiter.acquire(client_ip)
+    if not retry_after:
+        retry_after = login_email_limiter.acquire(email.strip().lower())
+
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+
+def login_throttle_stats() -> dict:
+    """Limiter counters for the metrics endpoint"""
+    return {
+        "ip": login_ip_limiter.stats(),
+        "email": login_email_limiter.stats(),
+        "verifications": login_verifications.stats()
+    }
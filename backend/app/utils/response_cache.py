@@ -0,0 +1,181 @@
+# app/utils/response_cache.py
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Set
+
+
+class _Entry:
+    __slots__ = ("value", "created", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, now: float, ttl: float, stale_ttl: float):
+        self.value = value
+        self.created = now
+        self.fresh_until = now + ttl
+        self.stale_until = now + ttl + stale_ttl
+
+
+class SWRCache:
+    """
+    In-process stale-while-revalidate cache for async response builders
+
+    - Fresh entries are served directly.
+    - Stale entries (past ttl but within stale_ttl) are served immediately
+      while one background task recomputes them.
+    - Concurrent misses for the same key share one computation
+      (single-flight) instead of each running the queries.
+
+    Loaders must not depend on request-scoped resources (such as the
+    request's DB session), because background refreshes outlive the request.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float,
+        max_size: int = 512,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            ttl: Seconds an entry is served as fresh
+            stale_ttl: Further seconds it may be served while refreshing
+            max_size: Maximum number of entries (least recently used evicted)
+            clock: Monotonic time source in seconds (tests pass a fake one)
+        """
+        self.clock = clock
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._refreshing: Set[Hashable] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        # Bumped by clear() so computations started before a write are not stored
+        self._generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.errors = 0
+        self.invalidations = 0
+        self.total_staleness = 0.0
+        self.max_staleness = 0.0
+
+    def _store(self, key: Hashable, value: Any, generation: int) -> None:
+        if generation != self._generation:
+            return
+        entries = self._entries
+        entries[key] = _Entry(value, self.clock(), self.ttl, self.stale_ttl)
+        entries.move_to_end(key)
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+
+    async def _compute(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Run loader once for key; concurrent callers await the same future"""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            value = await loader()
+        except BaseException as e:
+            self.errors += 1
+            future.set_exception(e)
+            # Mark retrieved so an error nobody else awaited is not logged
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self._store(key, value, generation)
+        future.set_result(value)
+        return value
+
+    async def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            self.refreshes += 1
+            await self._compute(key, loader)
+        except Exception:
+            # Keep serving the stale entry; the next request retries
+            pass
+        finally:
+            self._refreshing.discard(key)
+
+    async def get_or_compute(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get the cached value for key, computing it with loader if needed
+
+        Args:
+            key: Cache key (route, normalized query, role, ...)
+            loader: Coroutine function building the value
+
+        Returns:
+            The cached or freshly computed value
+
+        Raises:
+            Whatever loader raises on a miss (errors are not cached)
+        """
+        if self.ttl <= 0:
+            return await loader()
+
+        entries = self._entries
+        entry = entries.get(key)
+        if entry is not None:
+            now = self.clock()
+            if now < entry.fresh_until:
+                self.hits += 1
+                entries.move_to_end(key)
+                return entry.value
+            if now < entry.stale_until:
+                self.stale_hits += 1
+                staleness = now - entry.fresh_until
+                self.total_staleness += staleness
+                self.max_staleness = max(self.max_staleness, staleness)
+                if key not in self._refreshing and key not in self._inflight:
+                    self._refreshing.add(key)
+                    task = asyncio.create_task(self._refresh(key, loader))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                return entry.value
+            entries.pop(key, None)
+
+        if key not in self._inflight:
+            self.misses += 1
+        return await self._compute(key, loader)
+
+    def clear(self) -> None:
+        """
+        Drop every entry and discard results of computations in flight
+
+        Safe to call from worker threads (e.g. sync session flush hooks):
+        the entry map is swapped rather than mutated.
+        """
+        self._generation += 1
+        self._entries = OrderedDict()
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        """Hit/stale/coalesced counters and staleness of served entries"""
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        served = self.hits + self.stale_hits + self.coalesced
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "ttlSeconds": self.ttl,
+            "staleSeconds": self.stale_ttl,
+            "hits": self.hits,
+            "staleHits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "invalidations": self.invalidations,
+            "hitRate": round(served / lookups, 4) if lookups else 0.0,
+            "avgStalenessMs": round(self.total_staleness / self.stale_hits * 1000, 3) if self.stale_hits else 0.0,
+            "maxStalenessMs": round(self.max_staleness * 1000, 3)
+        }
@@ -3,9 +3,16 @@ from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt
 from typing import Optional
+import hashlib
 import os
+import time
 from dotenv import load_dotenv
 
+from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.password_pool import PasswordHashPool
+from app.utils.tracing import span
+
 # Load environment variables
 load_dotenv()
 
@@ -18,10 +25,35 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-print(f"🔍 security.py loaded - SECRET_KEY: {SECRET_KEY[:15]}... (length: {len(SECRET_KEY)})")
+# Verified token payloads keyed by token digest
+token_cache = TTLCache(
+    max_size=settings.TOKEN_CACHE_SIZE,
+    default_ttl=settings.TOKEN_CACHE_TTL_SECONDS
+)
+_token_decode_seconds = 0.0
+
+# Argon2 cost parameters from settings; library defaults where unset
+ARGON2_SETTINGS = {
+    f"argon2__{name}": value
+    for name, value in (
+        ("time_cost", settings.ARGON2_TIME_COST),
+        ("memory_cost", settings.ARGON2_MEMORY_COST),
+        ("parallelism", settings.ARGON2_PARALLELISM),
+    )
+    if value is not None
+}
 
 # Password hashing context using Argon2
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# bcrypt is kept so legacy hashes still verify and get flagged by needs_update
+pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto", **ARGON2_SETTINGS)
+
+# Worker pool that keeps Argon2 off the event loop
+password_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    memory_budget_mb=settings.PASSWORD_HASH_MEMORY_BUDGET_MB,
+    memory_cost_kib=pwd_context.handler("argon2").memory_cost,
+    executor=settings.PASSWORD_HASH_EXECUTOR
+)
 
 
 # ========================================
@@ -68,23 +100,77 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check if a hash uses a deprecated scheme or outdated Argon2 parameters
+    
+    Args:
+        hashed_password: Hashed password from database
+        
+    Returns:
+        True if the hash should be replaced after a successful verify
+    """
+    return pwd_context.needs_update(hashed_password)
+
+
+async def ahash_password(password: str) -> str:
+    """
+    Hash a password on the password worker pool
+    
+    Args:
+        password: Plain text password
+        
+    Returns:
+        Hashed password string
+    """
+    return await password_pool.run(hash_password, password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against a hash on the password worker pool
+    
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Hashed password from database
+        
+    Returns:
+        True if password matches, False otherwise
+    """
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
 # ========================================
 # JWT TOKEN FUNCTIONS
 # ========================================
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+def create_access_token(
+    data: dict,
+    expires_delta: Optional[timedelta] = None,
+    user=None
+) -> str:
     """
     Create a JWT access token
     
     Args:
         data: Dictionary containing token payload (usually user_id and email)
         expires_delta: Optional custom expiration time
+        user: User the token is issued for; when TOKEN_ROLE_CLAIMS is enabled
+            its role, active flag and token version are signed into the token
         
     Returns:
         Encoded JWT token string
     """
     to_encode = data.copy()
     
+    # Role claims let read-only endpoints authorize without a database lookup
+    if user is not None and settings.TOKEN_ROLE_CLAIMS:
+        to_encode.update({
+            "role": user.role.value,
+            "active": user.is_active,
+            "ver": user.token_version
+        })
+    
     # Set expiration time
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -94,16 +180,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     # Add expiration to token payload
     to_encode.update({"exp": expire})
     
-    print(f"\n🔑 Creating token for user_id={data.get('sub')}, email={data.get('email')}")
-    print(f"   Using SECRET_KEY: {SECRET_KEY[:15]}...")
-    print(f"   Token payload: {to_encode}")
-    
     # Encode token
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    
-    print(f"   ✅ Token created: {encoded_jwt[:50]}...")
-    
-    return encoded_jwt
+    with span("auth.encode_token"):
+        return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
 def decode_access_token(token: str) -> dict:
@@ -119,17 +198,57 @@ def decode_access_token(token: str) -> dict:
     Raises:
         JWTError: If token is invalid or expired
     """
-    print(f"\n🔓 Decoding token: {token[:50]}...")
-    print(f"   Using SECRET_KEY: {SECRET_KEY[:15]}...")
-    
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        print(f"   ✅ Token decoded successfully!")
-        print(f"   Payload: {payload}")
-        return payload
-    except jwt.ExpiredSignatureError:
-        print(f"   ❌ Token expired")
-        raise
-    except jwt.JWTError as e:
-        print(f"   ❌ Token decode error: {e}")
-        raise
\ No newline at end of file
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+def decode_access_token_cached(token: str) -> dict:
+    """
+    Decode a JWT access token, reusing the payload of a recently verified token
+    
+    Entries are keyed by a SHA-256 digest of the token and expire no later
+    than the token's own exp claim. The returned payload must not be mutated.
+    
+    Args:
+        token: JWT token string
+        
+    Returns:
+        Decoded token payload dictionary
+        
+    Raises:
+        JWTError: If token is invalid or expired
+    """
+    global _token_decode_seconds
+    
+    with span("auth.decode_token") as s:
+        key = hashlib.sha256(token.encode()).digest()
+        payload = token_cache.get(key)
+        s.set("cache_hit", payload is not None)
+        if payload is not None:
+            return payload
+        
+        started = time.perf_counter()
+        payload = decode_access_token(token)
+        _token_decode_seconds += time.perf_counter() - started
+    
+    exp = payload.get("exp")
+    if exp is not None:
+        # Convert the wall-clock exp claim into a monotonic deadline
+        token_cache.set(key, payload, expires_at=time.monotonic() + (float(exp) - time.time()))
+    else:
+        token_cache.set(key, payload)
+    
+    return payload
+
+
+def token_cache_stats() -> dict:
+    """
+    Token cache counters plus the decode time the hits saved
+    
+    Returns:
+        dict: Cache stats with average decode cost and estimated savings
+    """
+    stats = token_cache.stats()
+    avg_decode = _token_decode_seconds / stats["misses"] if stats["misses"] else 0.0
+    stats["avgDecodeMs"] = round(avg_decode * 1000, 3)
+    stats["estimatedSavedMs"] = round(avg_decode * stats["hits"] * 1000, 3)
+    return stats
@@ -0,0 +1,165 @@
+# app/utils/tracing.py
+import hmac
+import random
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, List, Optional
+
+from app.config import settings
+from app.middleware.access_log import log_access
+
+
+class Span:
+    """A named, timed section of a traced request"""
+
+    __slots__ = ("trace", "name", "attributes", "start", "duration_ms")
+
+    def __init__(self, trace: "Trace", name: str, attributes: dict):
+        self.trace = trace
+        self.name = name
+        self.attributes = attributes
+        self.start = 0.0
+        self.duration_ms = 0.0
+
+    def set(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span"""
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration_ms = (time.perf_counter() - self.start) * 1000
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self.trace.spans.append(self)
+
+
+class _NoopSpan:
+    """Shared span returned when tracing is off; every method does nothing"""
+
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """Spans recorded for one request"""
+
+    __slots__ = ("trace_id", "started", "spans")
+
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.started = time.perf_counter()
+        self.spans: List[Span] = []
+
+    def to_dict(self) -> dict:
+        """Spans as offsets (ms since request start) with durations"""
+        return {
+            "trace_id": self.trace_id,
+            "spans": [
+                {
+                    "name": s.name,
+                    "start_ms": round((s.start - self.started) * 1000, 3),
+                    "duration_ms": round(s.duration_ms, 3),
+                    **({"attributes": s.attributes} if s.attributes else {})
+                }
+                for s in sorted(self.spans, key=lambda s: s.start)
+            ]
+        }
+
+    def server_timing(self) -> str:
+        """Server-Timing header value for browser dev tools"""
+        return ", ".join(f"{s.name};dur={s.duration_ms:.2f}" for s in self.spans)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+def span(name: str, **attributes: Any):
+    """
+    Time a block of code when the current request is traced
+
+    Usage:
+        with span("auth.decode_token") as s:
+            ...
+            s.set("cache_hit", True)
+
+    Costs one context variable lookup when tracing is off.
+
+    Args:
+        name: Span name
+        **attributes: Initial span attributes
+
+    Returns:
+        Span context manager (a shared no-op one when tracing is off)
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return NOOP_SPAN
+    return Span(trace, name, attributes)
+
+
+def is_tracing() -> bool:
+    """True if the current request is being traced"""
+    return _current_trace.get() is not None
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware that enables span recording for selected requests
+
+    A request is traced if it sends the TRACE_HEADER header (off by
+    default) with a truthy value, or with TRACE_HEADER_SECRET when one is
+    set, or is picked by TRACE_SAMPLE_RATE. Traced requests get a
+    Server-Timing response header and one JSON line on the access log.
+    """
+
+    def __init__(self, app, sample_rate: Optional[float] = None):
+        self.app = app
+        self.sample_rate = settings.TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.header = settings.TRACE_HEADER.lower().encode("latin-1") if settings.TRACE_HEADER else None
+        self.secret = settings.TRACE_HEADER_SECRET.encode("latin-1") if settings.TRACE_HEADER_SECRET else None
+
+    def _should_trace(self, scope) -> bool:
+        if self.header is not None:
+            for key, value in scope["headers"]:
+                if key == self.header:
+                    if self.secret is not None:
+                        return hmac.compare_digest(value, self.secret)
+                    return value.lower() in (b"1", b"true", b"yes")
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_trace(scope):
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace()
+        token = _current_trace.set(trace)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and trace.spans:
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", trace.server_timing().encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            with Span(trace, "request", {"method": scope["method"], "path": scope["path"]}):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            log_access(trace.to_dict(), logger="app.trace")
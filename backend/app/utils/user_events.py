@@ -0,0 +1,118 @@
+# app/utils/user_events.py
+from typing import Callable, List
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+
+# Callbacks run after any change to the users table
+_listeners: List[Callable[[], None]] = []
+
+# Callbacks run after a commit whose only user change was last_login
+_login_listeners: List[Callable[[], None]] = []
+
+# Written on every login; no list or stats output is invalidated by it alone
+_LOGIN_ATTRIBUTES = frozenset({"last_login"})
+
+
+def on_users_changed(callback: Callable[[], None]) -> Callable[[], None]:
+    """
+    Register a callback to run whenever users are inserted, updated or deleted
+
+    Usable as a decorator. Callbacks must be cheap and must not raise.
+
+    Args:
+        callback: Function taking no arguments (e.g. a cache clear)
+
+    Returns:
+        The callback, unchanged
+    """
+    _listeners.append(callback)
+    return callback
+
+
+def notify_users_changed() -> None:
+    """
+    Run the registered callbacks
+
+    ORM commits that changed users trigger this automatically; call it
+    directly after committing Core statements (bulk UPDATE/DELETE, COPY)
+    that bypass the session.
+    """
+    for callback in _listeners:
+        callback()
+
+
+def on_user_logins(callback: Callable[[], None]) -> Callable[[], None]:
+    """
+    Register a callback to run when logins are recorded (last_login writes)
+
+    Logins do not trigger on_users_changed callbacks, so caches of output
+    that counts logins (e.g. the activity time series) register here too.
+
+    Args:
+        callback: Function taking no arguments
+
+    Returns:
+        The callback, unchanged
+    """
+    _login_listeners.append(callback)
+    return callback
+
+
+def notify_user_logins() -> None:
+    """Run the registered login callbacks"""
+    for callback in _login_listeners:
+        callback()
+
+
+def _user_changes(session: Session) -> str:
+    """
+    Classify the User writes in the pending flush
+
+    Returns:
+        str: "changed" for inserts, deletes or edits, "login" if the only
+        change is last_login, "" if no User row is written
+    """
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, User):
+            return "changed"
+    kind = ""
+    for obj in session.dirty:
+        if not isinstance(obj, User):
+            continue
+        changed = {attr.key for attr in inspect(obj).attrs if attr.history.has_changes()}
+        if changed - _LOGIN_ATTRIBUTES:
+            return "changed"
+        if changed:
+            kind = "login"
+    return kind
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context) -> None:
+    """Remember that this transaction changed users or recorded logins"""
+    if session.info.get("users_changed"):
+        return
+    kind = _user_changes(session)
+    if kind == "changed":
+        session.info["users_changed"] = True
+    elif kind == "login":
+        session.info["users_logged_in"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    """Notify once the change is visible to other sessions"""
+    logged_in = session.info.pop("users_logged_in", False)
+    if session.info.pop("users_changed", False):
+        notify_users_changed()
+    elif logged_in:
+        notify_user_logins()
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop("users_changed", None)
+    session.info.pop("users_logged_in", None)
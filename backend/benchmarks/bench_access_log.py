@@ -0,0 +1,109 @@
+# benchmarks/bench_access_log.py
+"""
+Measure per-request access logging overhead
+Usage: python -m benchmarks.bench_access_log [--requests 20000]
+
+Drives AccessLogMiddleware with a no-op ASGI app and compares it with no
+middleware and with the old print-based logger (about 15 sys.stdout.write
+calls plus flushes per request). Output goes to /dev/null so only the cost
+paid on the request path is measured.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from app.middleware.access_log import AccessLogMiddleware, start_access_log, stop_access_log  # noqa: E402
+
+SCOPE = {
+    "type": "http",
+    "method": "GET",
+    "path": "/api/users/",
+    "query_string": b"page=1&limit=10",
+    "headers": [(b"authorization", b"Bearer eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.payload.signature")],
+    "client": ("127.0.0.1", 50000),
+}
+
+
+async def noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+def print_logger(sink):
+    """The old log_all_requests middleware, writing to sink instead of stdout"""
+    async def app(scope, receive, send):
+        start_time = time.time()
+        sink.write(f"\n{'='*80}\n")
+        sink.write("📨 INCOMING REQUEST\n")
+        sink.write(f"{'='*80}\n")
+        sink.write(f"🔹 Method: {scope['method']}\n")
+        sink.write(f"🔹 URL: http://localhost{scope['path']}?{scope['query_string'].decode()}\n")
+        sink.write(f"🔹 Path: {scope['path']}\n")
+        sink.write(f"🔹 Query: {scope['query_string'].decode()}\n")
+        auth_header = dict(scope["headers"]).get(b"authorization", b"None").decode()
+        sink.write(f"🔹 Auth: {auth_header[:50]}...\n")
+        sink.write(f"{'='*80}\n")
+        sink.flush()
+        await noop_app(scope, receive, send)
+        duration = time.time() - start_time
+        sink.write(f"\n{'='*80}\n")
+        sink.write("📤 RESPONSE\n")
+        sink.write(f"{'='*80}\n")
+        sink.write("🔹 Status: 200\n")
+        sink.write(f"🔹 Duration: {duration:.3f}s\n")
+        sink.write(f"{'='*80}\n\n")
+        sink.flush()
+    return app
+
+
+async def measure(app, requests: int) -> float:
+    """Average microseconds per request"""
+    for _ in range(1000):
+        await app(SCOPE, receive, send)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(SCOPE, receive, send)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    sink = open(os.devnull, "w")
+    start_access_log(stream=sink)
+
+    baseline = await measure(noop_app, requests)
+    results = [
+        ("no logging", baseline),
+        ("print logger (old)", await measure(print_logger(sink), requests)),
+        ("access log, 100%", await measure(AccessLogMiddleware(noop_app, sample_rate=1.0, slow_ms=1e9), requests)),
+        ("access log, 10%", await measure(AccessLogMiddleware(noop_app, sample_rate=0.1, slow_ms=1e9), requests)),
+    ]
+
+    stop_access_log()
+    sink.close()
+
+    print(f"\n{requests} requests through a no-op ASGI app")
+    print(f"{'Mode':<22} {'us/request':>12} {'overhead':>12}")
+    print("-" * 48)
+    for name, micros in results:
+        print(f"{name:<22} {micros:>12.2f} {micros - baseline:>10.2f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Access log overhead benchmark")
+    parser.add_argument("--requests", type=int, default=20000)
+    asyncio.run(main(parser.parse_args().requests))
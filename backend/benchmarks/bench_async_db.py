@@ -0,0 +1,128 @@
+# benchmarks/bench_async_db.py
+"""
+Compare sync Session vs AsyncSession throughput under concurrent load
+Usage: python -m benchmarks.bench_async_db [--users 5000] [--concurrency 50] [--requests 2000]
+
+Runs the users-list page query from many concurrent coroutines, once with a
+blocking Session called from async code (what the routes used to do) and once
+with AsyncSession. Also samples event-loop lag, which is what other requests
+on the same worker feel while the queries run.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+parser = argparse.ArgumentParser(description="Sync vs async database benchmark")
+parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+parser.add_argument("--users", type=int, default=5000, help="Rows to seed")
+parser.add_argument("--concurrency", type=int, default=50, help="Concurrent coroutines")
+parser.add_argument("--requests", type=int, default=2000, help="Total queries per mode")
+args = parser.parse_args()
+
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+os.environ["DEBUG"] = "false"
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.database import Base, SessionLocal, AsyncSessionLocal, engine, async_engine  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.services.user_service import UserService  # noqa: E402
+
+
+def seed(count: int) -> None:
+    """Create the schema and insert `count` users if the table is empty"""
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        if db.query(User).count():
+            return
+        db.execute(insert(User), [
+            {
+                "name": f"User {i}",
+                "email": f"user{i}@example.com",
+                "hashed_password": "x",
+                "role": UserRole.USER,
+                "department": "Operations",
+                "is_active": i % 5 != 0
+            }
+            for i in range(count)
+        ])
+        db.commit()
+
+
+async def probe_loop_lag(samples: list, stop: asyncio.Event, interval: float = 0.005) -> None:
+    """Record how late the event loop wakes a sleeping coroutine"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def sync_query() -> None:
+    with SessionLocal() as db:
+        total = db.query(User).filter(User.is_active == True).count()
+        db.query(User).filter(User.is_active == True).order_by(User.created_at.desc()).offset(0).limit(10).all()
+        assert total >= 0
+
+
+async def async_query() -> None:
+    async with AsyncSessionLocal() as db:
+        await UserService.acount_users(db, status="active")
+        await UserService.aget_users_page(db, 0, 10, status="active")
+
+
+async def run(mode: str, query) -> dict:
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(args.requests):
+        queue.put_nowait(None)
+
+    async def worker():
+        while not queue.empty():
+            queue.get_nowait()
+            await query()
+
+    lag: list = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop_lag(lag, stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe
+    lag.sort()
+    return {
+        "mode": mode,
+        "throughput": args.requests / elapsed,
+        "lag_p50": statistics.median(lag) if lag else 0.0,
+        "lag_p99": lag[int(len(lag) * 0.99) - 1] if lag else 0.0,
+        "lag_max": lag[-1] if lag else 0.0,
+    }
+
+
+async def main() -> None:
+    seed(args.users)
+    results = [
+        await run("sync Session", sync_query),
+        await run("AsyncSession", async_query),
+    ]
+    await async_engine.dispose()
+
+    print(f"\n{args.requests} list queries, {args.concurrency} concurrent, {args.users} users")
+    print(f"{'Mode':<14} {'req/s':>10} {'loop lag p50':>14} {'p99':>10} {'max':>10}")
+    print("-" * 62)
+    for r in results:
+        print(f"{r['mode']:<14} {r['throughput']:>10.1f} {r['lag_p50']:>12.2f}ms "
+              f"{r['lag_p99']:>8.2f}ms {r['lag_max']:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+# benchmarks/bench_json.py
+"""
+Measure response serialization: default JSON path vs the fast path
+Usage: python -m benchmarks.bench_json [--page-size 100] [--export-rows 100000] [--repeat 200]
+
+- Users page: format every row and render the list response, as the old
+  handler did (strftime per row, jsonable_encoder, JSONResponse) and as it
+  does with FAST_JSON_RESPONSES (precomputed role names, hand-rolled
+  timestamp formatting, FastJSONResponse without jsonable_encoder).
+- Export: encode NDJSON export records with json.dumps vs app.utils.json_response.dumps.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+parser = argparse.ArgumentParser(description="JSON serialization benchmark")
+parser.add_argument("--page-size", type=int, default=100, help="Users per list page")
+parser.add_argument("--export-rows", type=int, default=100000, help="Rows in the export run")
+parser.add_argument("--repeat", type=int, default=200, help="Timed page renders")
+args = parser.parse_args()
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.models.user import User, UserRole  # noqa: E402
+from app.services.user_export import EXPORT_COLUMNS  # noqa: E402
+from app.services.user_read_model import UserRow  # noqa: E402
+from app.utils import json_response  # noqa: E402
+
+ROLES = list(UserRole)
+NOW = datetime(2026, 10, 17, 9, 30)
+
+
+def make_users(count: int) -> list:
+    """Transient User rows with every column populated"""
+    return [
+        User(
+            id=i,
+            name=f"User Number {i}",
+            email=f"user.{i}@example.com",
+            role=ROLES[i % len(ROLES)],
+            department="Operations",
+            is_active=i % 5 != 0,
+            last_login=NOW - timedelta(minutes=i * 37) if i % 3 else None,
+            created_at=NOW - timedelta(days=i),
+            updated_at=NOW - timedelta(hours=i)
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def old_format_user_response(user: User) -> dict:
+    """The list formatter before this change"""
+    return {
+        "id": user.id,
+        "name": user.name,
+        "email": user.email,
+        "role": user.role.value.lower(),
+        "department": user.department or "N/A",
+        "status": "Active" if user.is_active else "Inactive",
+        "lastLogin": user.last_login.strftime("%Y-%m-%d %I:%M %p") if user.last_login else "Never",
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+        "updated_at": user.updated_at.isoformat() if user.updated_at else None
+    }
+
+
+def page(users: list, formatter) -> dict:
+    return {
+        "users": [formatter(u) for u in users],
+        "total": 5000, "page": 1, "limit": len(users), "totalPages": 50,
+        "totalIsEstimate": False, "hasMore": True, "nextCursor": "eyJ0IjogIjIwMjYtMTAtMTcifQ"
+    }
+
+
+def default_path(users: list) -> bytes:
+    """Handler returns a dict; FastAPI encodes it, JSONResponse renders it"""
+    return JSONResponse(jsonable_encoder(page(users, old_format_user_response))).body
+
+
+def fast_path(rows: list) -> bytes:
+    """Handler returns FastJSONResponse directly"""
+    return json_response.FastJSONResponse(page(rows, UserRow.to_dict)).body
+
+
+def time_page(render, users: list) -> list:
+    for _ in range(20):
+        render(users)
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        render(users)
+        timings.append((time.perf_counter() - started) * 1e6)
+    return timings
+
+
+def time_export(encode, records: list) -> float:
+    started = time.perf_counter()
+    for start in range(0, len(records), 1000):
+        encode(records[start:start + 1000])
+    return time.perf_counter() - started
+
+
+def old_ndjson(batch: list) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, record)), ensure_ascii=False) + "\n" for record in batch
+    ).encode()
+
+
+def fast_ndjson(batch: list) -> bytes:
+    return b"".join(json_response.dumps(dict(zip(EXPORT_COLUMNS, record))) + b"\n" for record in batch)
+
+
+if __name__ == "__main__":
+    encoder = "orjson" if json_response.orjson is not None else "json (orjson not installed)"
+
+    print("\n" + "="*70)
+    print("                    JSON SERIALIZATION BENCHMARK")
+    print("="*70)
+    print(f"⚙️  Fast encoder: {encoder}\n")
+
+    users = make_users(args.page_size)
+    rows = [UserRow.from_user(u) for u in users]
+    assert json.loads(default_path(users)) == json.loads(fast_path(rows)), "Response bodies differ"
+
+    before = statistics.median(time_page(default_path, users))
+    after = statistics.median(time_page(fast_path, rows))
+    print(f"📄 {args.page_size}-row users page (median of {args.repeat})")
+    print(f"   default   {before:9.1f} µs")
+    print(f"   fast      {after:9.1f} µs   ({before / after:.1f}x)\n")
+
+    records = [UserRow.from_user(u).to_record() for u in make_users(args.export_rows)]
+    before = time_export(old_ndjson, records)
+    after = time_export(fast_ndjson, records)
+    print(f"📤 {args.export_rows:,}-row NDJSON export encoding")
+    print(f"   json      {before:9.2f} s   ({args.export_rows / before:,.0f} rows/s)")
+    print(f"   fast      {after:9.2f} s   ({args.export_rows / after:,.0f} rows/s, {before / after:.1f}x)")
+    print("="*70 + "\n")
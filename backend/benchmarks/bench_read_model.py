@@ -0,0 +1,142 @@
+# benchmarks/bench_read_model.py
+"""
+Compare loading users as User entities vs the column-projected UserRow
+Usage: python -m benchmarks.bench_read_model [--users 20000] [--repeat 5]
+
+Loads every seeded user and formats it for the users API, once as full User
+entities (what the list endpoints used to do: every column including
+hashed_password, identity map, attribute instrumentation) and once as
+UserRow from a select() of USER_ROW_COLUMNS, plus a sparse UserRow load of
+--fields as requested with ?fields=. Reports time per row, the peak traced
+memory while the rows are held and the JSON size per formatted row.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+parser = argparse.ArgumentParser(description="User read model benchmark")
+parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+parser.add_argument("--users", type=int, default=20000, help="Rows to seed and load")
+parser.add_argument("--repeat", type=int, default=5, help="Timed loads per mode")
+parser.add_argument("--fields", default="id,name,email,role", help="Field set for the sparse run")
+args = parser.parse_args()
+
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+os.environ["DEBUG"] = "false"
+
+from datetime import datetime, timedelta  # noqa: E402
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.services.user_read_model import (  # noqa: E402
+    USER_ROW_COLUMNS, UserRow, parse_user_fields, user_row_columns
+)
+
+ROLES = list(UserRole)
+NOW = datetime(2026, 10, 17, 9, 30)
+# Realistic Argon2 hash length; the entity path has to fetch it for every row
+HASH = "$argon2id$v=19$m=65536,t=3,p=4$" + "x" * 22 + "$" + "y" * 43
+
+
+def seed(count: int) -> None:
+    """Create the schema and insert `count` users if the table is empty"""
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        if db.query(User).count():
+            return
+        db.execute(insert(User), [
+            {
+                "name": f"User Number {i}",
+                "email": f"user.{i}@example.com",
+                "hashed_password": HASH,
+                "role": ROLES[i % len(ROLES)],
+                "department": "Operations",
+                "is_active": i % 5 != 0,
+                "last_login": NOW - timedelta(minutes=i * 37) if i % 3 else None,
+                "created_at": NOW - timedelta(minutes=i),
+                "updated_at": NOW - timedelta(minutes=i)
+            }
+            for i in range(count)
+        ])
+        db.commit()
+
+
+def load_entities(db) -> list:
+    return list(db.scalars(select(User).order_by(User.id)))
+
+
+def load_rows(db) -> list:
+    return [UserRow(*row) for row in db.execute(select(*USER_ROW_COLUMNS).order_by(User.id))]
+
+
+SPARSE_FIELDS = parse_user_fields(args.fields)
+SPARSE_COLUMNS = user_row_columns(SPARSE_FIELDS)
+
+
+def load_sparse_rows(db) -> list:
+    return [
+        UserRow.from_row(row, SPARSE_COLUMNS)
+        for row in db.execute(select(*SPARSE_COLUMNS).order_by(User.id))
+    ]
+
+
+def measure(load, fields=None) -> tuple:
+    """(median seconds to load and format, peak traced bytes while held, JSON bytes)"""
+    timings = []
+    for _ in range(args.repeat):
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            users = load(db)
+            # to_dict only reads attributes, so it formats entities the same way
+            formatted = [UserRow.to_dict(u, fields) for u in users]
+            timings.append(time.perf_counter() - started)
+    size = len(json.dumps(formatted))
+
+    with SessionLocal() as db:
+        tracemalloc.start()
+        users = load(db)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del users
+    return statistics.median(timings), peak, size
+
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("                    USER READ MODEL BENCHMARK")
+    print("="*70)
+    print(f"🗄️  Database: {engine.url.render_as_string(hide_password=True)}")
+    seed(args.users)
+
+    with SessionLocal() as db:
+        entities = [UserRow.to_dict(u) for u in load_entities(db)]
+        rows = [u.to_dict() for u in load_rows(db)]
+    assert entities == rows, "Formatted users differ"
+
+    results = {
+        "User entities": measure(load_entities),
+        "UserRow": measure(load_rows),
+        f"UserRow ?fields={','.join(SPARSE_FIELDS)}": measure(load_sparse_rows, SPARSE_FIELDS),
+    }
+    (base_time, base_peak, _), (new_time, new_peak, _), _ = results.values()
+
+    print(f"👥 Load and format {args.users:,} users (median of {args.repeat})\n")
+    for label, (seconds, peak, size) in results.items():
+        print(f"   {label}")
+        print(
+            f"      {seconds * 1e6 / args.users:6.2f} µs/row   {peak / args.users:5.0f} B/row peak   "
+            f"{size / args.users:4.0f} B/row JSON"
+        )
+    print(f"\n   ⚡ UserRow: {base_time / new_time:.1f}x faster, {base_peak / new_peak:.1f}x less memory")
+    print("="*70 + "\n")
@@ -0,0 +1,126 @@
+# benchmarks/bench_response_models.py
+"""
+Measure building and serializing the login and /me responses
+Usage: python -m benchmarks.bench_response_models [--repeat 20000]
+
+Old path: UserResponse built field by field, nested into LoginResponse,
+then FastAPI's serialize_response (dump, validate against response_model,
+serialize) and JSONResponse. New path: model_construct from the row and
+for the envelope, then model_dump_json, as the auth routes now do. No
+database or hashing.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+parser = argparse.ArgumentParser(description="Response model benchmark")
+parser.add_argument("--repeat", type=int, default=20000, help="Timed responses per path")
+args = parser.parse_args()
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from app.models.user import User, UserRole  # noqa: E402
+from app.schemas.token import LoginResponse, Token  # noqa: E402
+from app.schemas.user import UserResponse, build_user_response  # noqa: E402
+from app.utils.json_response import model_response  # noqa: E402
+
+USER = User(
+    id=42,
+    name="Rajnish Kumar",
+    email="rajnish@example.com",
+    role=UserRole.MANAGER,
+    is_active=True,
+    last_login=datetime(2026, 10, 17, 9, 30, 12, 123456),
+    created_at=datetime(2025, 1, 5, 12, 0),
+    updated_at=datetime(2026, 10, 1, 8, 15)
+)
+TOKEN = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9." + "x" * 180
+
+LOGIN_FIELD = create_model_field(name="Response_login", type_=LoginResponse, mode="serialization")
+ME_FIELD = create_model_field(name="Response_me", type_=UserResponse, mode="serialization")
+
+
+def old_user_response(user: User) -> UserResponse:
+    return UserResponse(
+        id=user.id,
+        name=user.name,
+        email=user.email,
+        role=user.role.value,
+        is_active=user.is_active,
+        created_at=user.created_at,
+        updated_at=user.updated_at,
+        last_login=user.last_login
+    )
+
+
+async def old_login() -> bytes:
+    content = LoginResponse(
+        success=True,
+        message="Login successful",
+        data=old_user_response(USER),
+        token=Token(access_token=TOKEN, token_type="bearer")
+    )
+    return JSONResponse(await serialize_response(field=LOGIN_FIELD, response_content=content)).body
+
+
+async def new_login() -> bytes:
+    return model_response(
+        LoginResponse.model_construct(
+            success=True,
+            message="Login successful",
+            data=build_user_response(USER),
+            token=Token.model_construct(access_token=TOKEN, token_type="bearer")
+        )
+    ).body
+
+
+async def old_me() -> bytes:
+    return JSONResponse(await serialize_response(field=ME_FIELD, response_content=old_user_response(USER))).body
+
+
+async def new_me() -> bytes:
+    return model_response(build_user_response(USER)).body
+
+
+async def measure(build) -> float:
+    """Median microseconds per response over batches of 100"""
+    for _ in range(500):
+        await build()
+    batches = []
+    for _ in range(args.repeat // 100):
+        started = time.perf_counter()
+        for _ in range(100):
+            await build()
+        batches.append((time.perf_counter() - started) * 1e4)
+    return statistics.median(batches)
+
+
+async def main() -> None:
+    print("\n" + "="*70)
+    print("                    RESPONSE MODEL BENCHMARK")
+    print("="*70)
+
+    for label, old, new in (("POST /api/auth/login", old_login, new_login), ("GET /api/auth/me", old_me, new_me)):
+        assert json.loads(await old()) == json.loads(await new()), f"{label}: bodies differ"
+        before, after = await measure(old), await measure(new)
+        print(f"🔐 {label}")
+        print(f"   field-by-field + response_model   {before:7.2f} µs")
+        print(f"   model_construct + model_response  {after:7.2f} µs   ({before / after:.1f}x)\n")
+
+    print("="*70 + "\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+# benchmarks/bench_user_search.py
+"""
+Compare users-list search latency: ILIKE scan vs the indexed search backend
+Usage: python -m benchmarks.bench_user_search [--sizes 100000,1000000,10000000] [--queries 20]
+
+Seeds the users table up to each size in turn (SQLite FTS5 trigram table or
+PostgreSQL pg_trgm indexes, depending on --database-url) and times the list
+endpoint's search query - first page plus window count - with the index
+disabled and enabled.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+parser = argparse.ArgumentParser(description="User search benchmark")
+parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+parser.add_argument("--sizes", default="100000,1000000,10000000", help="Comma-separated table sizes")
+parser.add_argument("--queries", type=int, default=20, help="Search terms timed per size and mode")
+parser.add_argument("--batch", type=int, default=50000, help="Rows per insert batch while seeding")
+args = parser.parse_args()
+
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+os.environ["DEBUG"] = "false"
+
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from app.database import engine  # noqa: E402
+from app.migrations import migrate  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.services import user_search  # noqa: E402
+from app.services.user_service import UserService  # noqa: E402
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+               "Ram", "Sita", "Hari", "Gita", "Bikash", "Sunita", "Prakash", "Anita"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Shrestha", "Sharma", "Thapa",
+              "Gurung", "Adhikari", "Karki", "Tamang", "Rai", "Maharjan", "Bhandari"]
+
+
+def seed_to(size: int) -> None:
+    """Insert users until the table holds `size` rows"""
+    with engine.begin() as conn:
+        start = conn.scalar(select(func.count(User.id)))
+    rng = random.Random(start)
+    for offset in range(start, size, args.batch):
+        rows = []
+        for i in range(offset, min(offset + args.batch, size)):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            rows.append({
+                "name": f"{first} {last}",
+                "email": f"{first}.{last}.{i}@example.com".lower(),
+                "hashed_password": "x",
+                "role": UserRole.USER,
+                "department": "Operations",
+                "is_active": i % 5 != 0
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(User), rows)
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.exec_driver_sql("ANALYZE users")
+
+
+def time_search(terms: list, backend) -> list:
+    """Milliseconds per page-plus-total search query"""
+    user_search._backend = backend
+    timings = []
+    with engine.connect() as conn:
+        for term in terms:
+            query = UserService.filtered_users_query(search=term)
+            statement = (
+                query.add_columns(func.count().over())
+                .order_by(*UserService.list_order(term))
+                .limit(10)
+            )
+            started = time.perf_counter()
+            conn.execute(statement).all()
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(label: str, timings: list) -> None:
+    timings = sorted(timings)
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print(f"   {label:<8} median {statistics.median(timings):9.2f} ms   p95 {p95:9.2f} ms")
+
+
+if __name__ == "__main__":
+    migrate(engine)
+    backend = user_search.configure_user_search(engine)
+    if backend is None:
+        sys.exit("No search index available on this database")
+
+    rng = random.Random(42)
+    terms = [
+        rng.choice([rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)])[:rng.randint(3, 6)].lower()
+        for _ in range(args.queries)
+    ] + [f"{rng.randint(0, 99999)}@" for _ in range(args.queries // 2)]
+
+    print("\n" + "="*70)
+    print("                    USER SEARCH BENCHMARK")
+    print("="*70)
+    print(f"🗄️  Database: {engine.url.render_as_string(hide_password=True)}")
+    print(f"🔍 Index backend: {backend}\n")
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        started = time.perf_counter()
+        seed_to(size)
+        print(f"📊 {size:,} users (seeded in {time.perf_counter() - started:.1f} s)")
+        report("ILIKE", time_search(terms, None))
+        report(backend, time_search(terms, backend))
+
+    print("="*70 + "\n")
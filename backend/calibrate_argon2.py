@@ -0,0 +1,93 @@
+# calibrate_argon2.py
+"""
+Benchmark Argon2 on this host and pick cost parameters for a target verify latency
+Usage: python calibrate_argon2.py [--target-ms 250] [--max-memory-mib 64] [--parallelism 4]
+
+Copy the printed values into .env. Existing hashes are upgraded transparently
+the next time each user logs in (see PASSWORD_REHASH_ON_LOGIN).
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from passlib.hash import argon2
+
+# OWASP minimum for Argon2id: 19 MiB memory with 2 iterations
+MIN_MEMORY_KIB = 19 * 1024
+MAX_TIME_COST = 20
+SAMPLE_PASSWORD = "calibration-password-123"
+
+
+def measure_verify_ms(time_cost: int, memory_cost: int, parallelism: int, samples: int) -> float:
+    """Median verify latency in milliseconds for the given parameters"""
+    handler = argon2.using(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    hashed = handler.hash(SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.verify(SAMPLE_PASSWORD, hashed)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, max_memory_kib: int, parallelism: int, samples: int) -> dict:
+    """
+    Find the strongest parameters whose verify latency stays under target_ms
+
+    Memory is tried from max_memory_kib downwards (halving each step) and,
+    for each memory size, the time cost is raised until the target is hit.
+    """
+    memory_cost = max_memory_kib
+    while True:
+        best = None
+        for time_cost in range(1, MAX_TIME_COST + 1):
+            latency = measure_verify_ms(time_cost, memory_cost, parallelism, samples)
+            print(f"   m={memory_cost // 1024:>4} MiB  t={time_cost:<2} p={parallelism}  ->  {latency:8.1f} ms")
+            if latency > target_ms:
+                break
+            best = {
+                "time_cost": time_cost,
+                "memory_cost": memory_cost,
+                "parallelism": parallelism,
+                "latency_ms": latency
+            }
+
+        # Prefer at least two passes; shrink memory until we can afford them
+        if best and best["time_cost"] >= 2:
+            return best
+        if memory_cost // 2 < MIN_MEMORY_KIB:
+            return best or {
+                "time_cost": 2,
+                "memory_cost": MIN_MEMORY_KIB,
+                "parallelism": parallelism,
+                "latency_ms": measure_verify_ms(2, MIN_MEMORY_KIB, parallelism, samples)
+            }
+        memory_cost //= 2
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibrate Argon2 cost for this host")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target verify latency in ms")
+    parser.add_argument("--max-memory-mib", type=int, default=64, help="Upper bound on memory per hash in MiB")
+    parser.add_argument("--parallelism", type=int, default=min(os.cpu_count() or 1, 4), help="Argon2 lanes")
+    parser.add_argument("--samples", type=int, default=5, help="Verifications per measurement")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("                    ARGON2 CALIBRATION")
+    print("="*70)
+    print(f"🎯 Target verify latency: {args.target_ms:.0f} ms")
+    print(f"🧠 Max memory per hash: {args.max_memory_mib} MiB")
+    print(f"🧵 Parallelism: {args.parallelism}\n")
+
+    result = calibrate(args.target_ms, args.max_memory_mib * 1024, args.parallelism, args.samples)
+
+    print("\n" + "="*70)
+    print(f"✅ Selected: {result['latency_ms']:.1f} ms per verify")
+    print("   Add these to .env:\n")
+    print(f"ARGON2_TIME_COST={result['time_cost']}")
+    print(f"ARGON2_MEMORY_COST={result['memory_cost']}")
+    print(f"ARGON2_PARALLELISM={result['parallelism']}")
+    print("="*70 + "\n")
@@ -0,0 +1,86 @@
+# import_users.py
+"""
+Bulk import users from a CSV or NDJSON file
+Usage: python import_users.py FILE [--format csv|ndjson] [--batch-size N]
+
+Columns/keys match POST /api/users/: name, email, password and optionally
+role, department and status. Rows are validated, de-duplicated and hashed
+in batches across a process pool, then written with one batched INSERT
+(COPY on PostgreSQL) per batch. Invalid rows are reported, not fatal.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+
+from app.database import async_engine
+from app.services.user_import import create_import_job, import_hash_pool, run_import
+from app.utils.formatting import spreadsheet_safe
+
+ERROR_COLUMNS = ("line", "email", "error")
+
+
+async def main(args) -> int:
+    fmt = args.format or ("ndjson" if args.file.endswith((".ndjson", ".jsonl")) else "csv")
+    job = create_import_job(source=f"cli:{args.file}")
+
+    async def report_progress():
+        while True:
+            await asyncio.sleep(2)
+            print(f"⏳ {job.rows:,} rows read, {job.created:,} created, {job.failed:,} failed")
+
+    progress = asyncio.create_task(report_progress())
+    try:
+        with open(args.file, encoding="utf-8-sig", newline="") as lines:
+            await run_import(job, lines, fmt, args.batch_size)
+    finally:
+        progress.cancel()
+        import_hash_pool.shutdown()
+        await async_engine.dispose()
+
+    report = job.to_dict()
+    if job.status != "completed":
+        print(f"\n❌ Import failed: {job.message}")
+    else:
+        print(f"\n✅ Created {job.created:,} of {job.rows:,} users in {report['elapsedSeconds']} s"
+              f" ({report['rowsPerSecond']} rows/s)")
+
+    if job.errors:
+        print(f"\n⚠️  {job.failed:,} row(s) rejected:")
+        for error in job.errors[:args.show_errors]:
+            print(f"   line {error['line']}: {error['email'] or '-'} - {error['error']}")
+        if job.failed > args.show_errors:
+            print(f"   ... {job.failed - args.show_errors:,} more")
+    if args.errors_file:
+        with open(args.errors_file, "w", newline="") as out:
+            if args.errors_file.endswith(".csv"):
+                # Emails and messages echo the source file, so keep formulas inert
+                writer = csv.writer(out)
+                writer.writerow(ERROR_COLUMNS)
+                writer.writerows([spreadsheet_safe(error[c]) for c in ERROR_COLUMNS] for error in job.errors)
+            else:
+                for error in job.errors:
+                    out.write(json.dumps(error) + "\n")
+        print(f"\n📝 Error report written to {args.errors_file}")
+
+    print("="*70 + "\n")
+    return 0 if job.status == "completed" else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import users from CSV or NDJSON")
+    parser.add_argument("file", help="Path to the CSV (with header) or NDJSON file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None, help="Default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows per batch (default USER_IMPORT_BATCH_SIZE)")
+    parser.add_argument("--show-errors", type=int, default=20, help="Rejected rows to print")
+    parser.add_argument("--errors-file", default=None, help="Write the error report (CSV for a .csv name, else NDJSON)")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("                    BULK USER IMPORT")
+    print("="*70)
+    print(f"📄 File: {args.file}\n")
+
+    sys.exit(asyncio.run(main(args)))
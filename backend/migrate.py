@@ -0,0 +1,46 @@
+# migrate.py
+"""
+Apply database schema migrations
+Usage: python migrate.py [--status] [--to VERSION]
+
+Run once per deploy, before starting the API workers. Safe to run
+repeatedly: applied versions are recorded in the schema_version table and
+concurrent runs against PostgreSQL are serialized with an advisory lock.
+"""
+
+import argparse
+import sys
+
+from app.database import engine
+from app.migrations import load_migrations, migrate, pending_migrations
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply database schema migrations")
+    parser.add_argument("--status", action="store_true", help="List migrations and exit")
+    parser.add_argument("--to", type=int, default=None, help="Stop after this version")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("                    DATABASE MIGRATIONS")
+    print("="*70)
+    print(f"🗄️  Database: {engine.url.render_as_string(hide_password=True)}\n")
+
+    if args.status:
+        pending = {m.version for m in pending_migrations(engine)}
+        for migration in load_migrations():
+            state = "pending" if migration.version in pending else "applied"
+            print(f"   {migration.version:04d}  {state:<8} {migration.description}")
+        print("="*70 + "\n")
+        sys.exit(0)
+
+    applied = migrate(
+        engine,
+        target=args.to,
+        on_apply=lambda m: print(f"⏳ {m.version:04d} {m.description}...")
+    )
+
+    if applied:
+        print(f"\n✅ Applied {len(applied)} migration(s)")
+    else:
+        print("✅ Database is up to date")
+    print("="*70 + "\n")
@@ -0,0 +1,119 @@
+# tests/conftest.py
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Settings are read at import time, so point the app at a scratch database first
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["DEBUG"] = "false"
+# Cheapest Argon2 parameters; tests hash passwords but never time them
+os.environ.setdefault("ARGON2_TIME_COST", "1")
+os.environ.setdefault("ARGON2_MEMORY_COST", "1024")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Scratch database with every migration applied, as `python migrate.py` would"""
+    from app.database import engine
+    from app.migrations import migrate
+    from app.services.user_search import configure_user_search
+
+    migrate(engine)
+    configure_user_search(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Start every test with empty in-process caches
+
+    Tests empty the users table, and SQLite then hands out the same ids
+    again, so a principal cached by an earlier test could match a new user.
+    """
+    from app.services.user_service import (
+        activity_response_cache, user_count_cache, users_response_cache
+    )
+    from app.utils import principal
+    from app.utils.security import token_cache
+
+    for cache in (
+        principal.principal_cache, principal._min_token_versions, token_cache,
+        user_count_cache, users_response_cache, activity_response_cache
+    ):
+        cache.clear()
+
+
+@pytest.fixture
+def stats_drift(database):
+    """Number of user_stats counters that differ from a fresh rebuild (nothing is corrected)"""
+    from app.services.user_stats import rebuild_user_stats
+
+    def drift() -> int:
+        with database.connect() as conn:
+            transaction = conn.begin()
+            try:
+                return rebuild_user_stats(conn)
+            finally:
+                transaction.rollback()
+
+    return drift
+
+
+class FakeClock:
+    """Monotonic clock the test advances by hand"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """FakeClock to inject where code takes a clock= argument"""
+    return FakeClock()
+
+
+@pytest.fixture
+def run_async():
+    """Run a coroutine on a fresh event loop, releasing async pool connections afterwards"""
+    from app.database import async_engine
+
+    def run(coro):
+        async def main():
+            try:
+                return await coro
+            finally:
+                await async_engine.dispose()
+        return asyncio.run(main())
+
+    return run
+
+
+@pytest.fixture
+def api(run_async):
+    """Call the application in-process: api("GET", "/api/users/", token=...) -> httpx.Response"""
+    import httpx
+
+    from app.main import app
+
+    def call(method: str, path: str, token: str = None, **kwargs) -> httpx.Response:
+        async def request():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                headers = {"Authorization": f"Bearer {token}"} if token else {}
+                return await client.request(method, path, headers=headers, **kwargs)
+        return run_async(request())
+
+    return call
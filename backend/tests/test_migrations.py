@@ -0,0 +1,104 @@
+# tests/test_migrations.py
+from datetime import datetime
+
+import pytest
+from sqlalchemy import (
+    Boolean, Column, DateTime, MetaData, String, Table, create_engine, func, insert, select, text
+)
+from sqlalchemy.exc import IntegrityError
+
+from app.migrations import load_migrations, migrate, pending_migrations
+from app.services.user_stats import rebuild_user_stats
+
+USERS = [
+    ("Ann", "ann@example.com", "ADMIN", "IT", True, datetime(2026, 1, 31, 23, 30), datetime(2026, 2, 1, 8, 0)),
+    ("Bob", "bob@example.com", "USER", "Sales", False, datetime(2026, 2, 1, 0, 30), None),
+    ("Cy", "cy@example.com", "USER", "Sales", True, datetime(2026, 2, 14, 12, 0), datetime(2026, 2, 14, 13, 0)),
+    ("Di", "di@example.com", "MANAGER", "IT", True, datetime(2026, 3, 2, 9, 0), datetime(2026, 3, 2, 10, 0)),
+]
+
+# Columns as of m0001 that these tests write
+users = Table(
+    "users",
+    MetaData(),
+    Column("name", String(100)),
+    Column("email", String(255)),
+    Column("hashed_password", String(255)),
+    Column("role", String(20)),
+    Column("department", String(100)),
+    Column("is_active", Boolean),
+    Column("last_login", DateTime(timezone=True)),
+    Column("created_at", DateTime(timezone=True)),
+)
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    """Fresh database migrated up to m0003, holding users from before the counters existed"""
+    engine = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    migrate(engine, target=3)
+    with engine.begin() as conn:
+        conn.execute(insert(users), [
+            {
+                "name": name,
+                "email": email,
+                "hashed_password": "x",
+                "role": role,
+                "department": department,
+                "is_active": active,
+                "created_at": created_at,
+                "last_login": last_login,
+            }
+            for name, email, role, department, active, created_at, last_login in USERS
+        ])
+    yield engine
+    engine.dispose()
+
+
+def test_fresh_database_applies_every_migration(legacy_engine):
+    migrate(legacy_engine)
+
+    assert pending_migrations(legacy_engine) == []
+    assert len(load_migrations()) >= 6
+
+
+def test_stats_backfill_matches_rebuild(legacy_engine):
+    migrate(legacy_engine)
+
+    with legacy_engine.begin() as conn:
+        counters = dict(conn.execute(text("SELECT dimension || ':' || key, count FROM user_stats")).all())
+        assert rebuild_user_stats(conn) == 0
+
+    assert counters["total:"] == 4
+    assert counters["active:"] == 3
+    assert counters["role:USER"] == 2
+    assert counters["department:IT"] == 2
+    assert counters["signup_month:2026-01"] == 1
+    assert counters["signup_month:2026-02"] == 2
+
+
+def test_activity_backfill_counts_signups_and_logins(legacy_engine):
+    migrate(legacy_engine)
+
+    with legacy_engine.connect() as conn:
+        signups, logins, deactivations = conn.execute(text(
+            "SELECT sum(signups), sum(logins), sum(deactivations) FROM user_activity_daily"
+        )).one()
+        feb_first = conn.scalar(text(
+            "SELECT sum(logins) FROM user_activity_daily WHERE day = '2026-02-01'"
+        ))
+
+    assert (signups, logins, deactivations) == (4, 3, 0)
+    assert feb_first == 1
+
+
+def test_email_index_becomes_unique(legacy_engine):
+    migrate(legacy_engine)
+
+    with legacy_engine.begin() as conn:
+        with pytest.raises(IntegrityError):
+            conn.execute(insert(users).values(
+                name="Ann Again", email="ANN@example.com", hashed_password="x", role="USER",
+                department="IT", is_active=True
+            ))
+        assert conn.scalar(select(func.count()).select_from(users)) == len(USERS)
@@ -0,0 +1,97 @@
+# tests/test_rate_limit.py
+import pytest
+from fastapi import HTTPException
+
+from app.utils import rate_limit
+from app.utils.rate_limit import ConcurrencyLimiter, TokenBucketLimiter, check_login_rate
+
+
+def test_burst_then_retry_after_until_next_token(clock):
+    limiter = TokenBucketLimiter(rate_per_minute=6, burst=3, clock=clock)
+
+    assert [limiter.acquire("ip") for _ in range(3)] == [0.0, 0.0, 0.0]
+    # 6/minute refills one token every 10 s
+    assert limiter.acquire("ip") == pytest.approx(10.0)
+
+    clock.advance(4)
+    assert limiter.acquire("ip") == pytest.approx(6.0)
+    assert limiter.stats()["allowed"] == 3
+    assert limiter.stats()["rejected"] == 2
+
+
+def test_refill_is_gradual_and_capped_at_burst(clock):
+    limiter = TokenBucketLimiter(rate_per_minute=6, burst=2, clock=clock)
+    limiter.acquire("ip")
+    limiter.acquire("ip")
+
+    clock.advance(10)
+    assert limiter.acquire("ip") == 0.0
+    assert limiter.acquire("ip") > 0
+
+    # A long pause refills to burst, never beyond it
+    clock.advance(3600)
+    assert [limiter.acquire("ip") for _ in range(2)] == [0.0, 0.0]
+    assert limiter.acquire("ip") > 0
+
+
+def test_keys_are_isolated(clock):
+    limiter = TokenBucketLimiter(rate_per_minute=1, burst=1, clock=clock)
+
+    assert limiter.acquire("a@example.com") == 0.0
+    assert limiter.acquire("a@example.com") > 0
+    assert limiter.acquire("b@example.com") == 0.0
+
+
+def test_idle_and_excess_keys_are_evicted(clock):
+    limiter = TokenBucketLimiter(rate_per_minute=1, burst=1, max_keys=2, idle_seconds=60, clock=clock)
+    for key in ("a", "b", "c"):
+        limiter.acquire(key)
+
+    # "a" was least recently used
+    assert limiter.stats()["trackedKeys"] == 2
+    assert limiter.acquire("a") == 0.0
+
+    clock.advance(61)
+    limiter.acquire("d")
+    assert limiter.stats()["trackedKeys"] == 1
+
+
+def test_check_login_rate_sets_retry_after(clock, monkeypatch):
+    monkeypatch.setattr(rate_limit, "login_ip_limiter", TokenBucketLimiter(60, 100, clock=clock))
+    monkeypatch.setattr(rate_limit, "login_email_limiter", TokenBucketLimiter(2, 1, clock=clock))
+
+    check_login_rate("10.0.0.1", "User@Example.com")
+    with pytest.raises(HTTPException) as rejected:
+        # Same account, different spelling and address
+        check_login_rate("10.0.0.2", " user@example.com ")
+
+    assert rejected.value.status_code == 429
+    assert rejected.value.headers["Retry-After"] == "30"
+
+    clock.advance(29.5)
+    with pytest.raises(HTTPException) as rejected:
+        check_login_rate("10.0.0.2", "user@example.com")
+    # Rounded up so a client waiting that long is never rejected again
+    assert rejected.value.headers["Retry-After"] == "1"
+
+    clock.advance(0.5)
+    check_login_rate("10.0.0.2", "user@example.com")
+
+
+def test_concurrency_limiter_fails_fast(run_async):
+    limiter = ConcurrencyLimiter(max_concurrent=1)
+
+    async def overlap():
+        async with limiter.slot():
+            with pytest.raises(HTTPException) as busy:
+                async with limiter.slot(retry_after=2):
+                    pass
+        async with limiter.slot():
+            pass
+        return busy.value
+
+    busy = run_async(overlap())
+
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == "2"
+    assert limiter.stats() == {"maxConcurrent": 1, "inFlight": 0, "maxInFlight": 1, "rejected": 1}
@@ -0,0 +1,138 @@
+# tests/test_response_cache.py
+import asyncio
+
+import pytest
+
+from app.utils.response_cache import SWRCache
+
+
+class Loader:
+    """Counts calls and blocks each one until released"""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.fail = False
+
+    async def __call__(self):
+        self.calls += 1
+        call = self.calls
+        await self.release.wait()
+        if self.fail:
+            raise RuntimeError("loader failed")
+        return f"value {call}"
+
+
+async def _settle():
+    """Let background refresh tasks run to completion"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_misses_share_one_computation(clock):
+    cache = SWRCache(ttl=5, stale_ttl=30, clock=clock)
+
+    async def scenario():
+        loader = Loader()
+        waiters = [asyncio.create_task(cache.get_or_compute("key", loader)) for _ in range(10)]
+        await _settle()
+        loader.release.set()
+        return loader.calls, await asyncio.gather(*waiters)
+
+    calls, values = asyncio.run(scenario())
+
+    assert calls == 1
+    assert values == ["value 1"] * 10
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["coalesced"] == 9
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(clock):
+    cache = SWRCache(ttl=5, stale_ttl=30, clock=clock)
+
+    async def scenario():
+        loader = Loader()
+        loader.release.set()
+        assert await cache.get_or_compute("key", loader) == "value 1"
+
+        clock.advance(6)
+        loader.release.clear()
+        served = [await cache.get_or_compute("key", loader) for _ in range(5)]
+        await _settle()
+        calls_while_refreshing = loader.calls
+
+        loader.release.set()
+        await _settle()
+        return served, calls_while_refreshing, await cache.get_or_compute("key", loader)
+
+    served, calls_while_refreshing, refreshed = asyncio.run(scenario())
+
+    assert served == ["value 1"] * 5
+    assert calls_while_refreshing == 2
+    assert refreshed == "value 2"
+    assert cache.stats()["staleHits"] == 5
+    assert cache.stats()["refreshes"] == 1
+
+
+def test_failed_refresh_keeps_serving_stale_entry(clock):
+    cache = SWRCache(ttl=5, stale_ttl=30, clock=clock)
+
+    async def scenario():
+        loader = Loader()
+        loader.release.set()
+        await cache.get_or_compute("key", loader)
+
+        clock.advance(6)
+        loader.fail = True
+        first = await cache.get_or_compute("key", loader)
+        await _settle()
+        # The next request retries the refresh
+        loader.fail = False
+        second = await cache.get_or_compute("key", loader)
+        await _settle()
+        return first, second, await cache.get_or_compute("key", loader)
+
+    assert asyncio.run(scenario()) == ("value 1", "value 1", "value 3")
+    assert cache.stats()["errors"] == 1
+
+
+def test_expired_entry_is_recomputed_before_returning(clock):
+    cache = SWRCache(ttl=5, stale_ttl=30, clock=clock)
+
+    async def scenario():
+        loader = Loader()
+        loader.release.set()
+        await cache.get_or_compute("key", loader)
+        clock.advance(36)
+        return await cache.get_or_compute("key", loader)
+
+    assert asyncio.run(scenario()) == "value 2"
+    assert cache.stats()["misses"] == 2
+
+
+def test_clear_discards_a_computation_already_in_flight(clock):
+    cache = SWRCache(ttl=5, stale_ttl=30, clock=clock)
+
+    async def scenario():
+        loader = Loader()
+        waiter = asyncio.create_task(cache.get_or_compute("key", loader))
+        await _settle()
+        # A write lands while the old data is being loaded
+        cache.clear()
+        loader.release.set()
+        before_write = await waiter
+        return before_write, await cache.get_or_compute("key", loader)
+
+    assert asyncio.run(scenario()) == ("value 1", "value 2")
+
+
+@pytest.mark.parametrize("ttl", [0, -1])
+def test_disabled_cache_always_calls_loader(clock, ttl):
+    cache = SWRCache(ttl=ttl, stale_ttl=30, clock=clock)
+
+    async def scenario():
+        loader = Loader()
+        loader.release.set()
+        return [await cache.get_or_compute("key", loader) for _ in range(2)]
+
+    assert asyncio.run(scenario()) == ["value 1", "value 2"]
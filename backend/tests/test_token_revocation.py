@@ -0,0 +1,112 @@
+# tests/test_token_revocation.py
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models.user import User, UserRole
+from app.utils.principal import principal_cache
+from app.utils.security import create_access_token
+
+STATS = "/api/users/stats"
+
+
+@pytest.fixture(params=[False, True], ids=["database", "claims"])
+def claims_mode(request, monkeypatch):
+    """Run each test with TOKEN_ROLE_CLAIMS off (principal lookup) and on (signed claims)"""
+    monkeypatch.setattr(settings, "TOKEN_ROLE_CLAIMS", request.param)
+    return request.param
+
+
+@pytest.fixture
+def users(claims_mode):
+    with engine.begin() as conn:
+        conn.execute(delete(User))
+        conn.execute(insert(User), [
+            {
+                "name": name, "email": f"{name.lower()}@example.com", "hashed_password": "x",
+                "role": role, "department": "Ops", "is_active": True
+            }
+            for name, role in (("Admin", UserRole.ADMIN), ("Mona", UserRole.MANAGER))
+        ])
+    with SessionLocal() as db:
+        return {user.name: user.id for user in db.scalars(select(User))}
+
+
+def _token(user_id: int) -> str:
+    """Token as login issues it now: the current row's claims when TOKEN_ROLE_CLAIMS is on"""
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        return create_access_token(data={"sub": str(user.id), "email": user.email}, user=user)
+
+
+def _update(api, users, **changes):
+    response = api("PUT", f"/api/users/{users['Mona']}", token=_token(users["Admin"]), json=changes)
+    assert response.status_code == 200
+
+
+def _stale_status(claims_mode: bool) -> int:
+    """
+    What a token from before a role/status change gets: claims tokens are
+    revoked outright, database mode re-reads the user and applies the change
+    """
+    return 401 if claims_mode else 403
+
+
+def test_role_change_revokes_earlier_tokens(api, users, claims_mode):
+    before = _token(users["Mona"])
+    assert api("GET", STATS, token=before).status_code == 200
+
+    _update(api, users, role="staff")
+
+    assert api("GET", STATS, token=before).status_code == _stale_status(claims_mode)
+    # Authenticated with the new role, which may not read stats
+    assert api("GET", STATS, token=_token(users["Mona"])).status_code == 403
+
+    _update(api, users, role="manager")
+
+    assert api("GET", STATS, token=_token(users["Mona"])).status_code == 200
+
+
+def test_deactivation_revokes_earlier_tokens(api, users, claims_mode):
+    before = _token(users["Mona"])
+
+    _update(api, users, status="inactive")
+
+    assert api("GET", STATS, token=before).status_code == _stale_status(claims_mode)
+    while_inactive = _token(users["Mona"])
+    assert api("GET", STATS, token=while_inactive).status_code == 403
+
+    _update(api, users, status="active")
+
+    # A claims token saying "inactive" must not outlive the reactivation either
+    assert api("GET", STATS, token=while_inactive).status_code == (401 if claims_mode else 200)
+    assert api("GET", STATS, token=_token(users["Mona"])).status_code == 200
+
+
+def test_unrelated_update_keeps_tokens_valid(api, users):
+    before = _token(users["Mona"])
+
+    _update(api, users, name="Mona Lisa", department="Sales")
+
+    assert api("GET", STATS, token=before).status_code == 200
+
+
+def test_deleted_user_tokens_are_rejected(api, users):
+    before = _token(users["Mona"])
+
+    response = api("DELETE", f"/api/users/{users['Mona']}", token=_token(users["Admin"]))
+    assert response.status_code == 200
+
+    assert api("GET", STATS, token=before).status_code == 401
+
+
+def test_claims_revocation_outlives_principal_cache(api, users, claims_mode):
+    if not claims_mode:
+        pytest.skip("database mode re-reads the user on a cache miss")
+    before = _token(users["Mona"])
+
+    _update(api, users, role="staff")
+    principal_cache.clear()
+
+    assert api("GET", STATS, token=before).status_code == 401
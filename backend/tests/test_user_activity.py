@@ -0,0 +1,58 @@
+# tests/test_user_activity.py
+from datetime import date
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app.database import SessionLocal
+from app.models.user import User, UserRole
+from app.services.user_activity import MAX_BUCKETS, bucket_count
+from app.utils.security import create_access_token
+
+
+@pytest.fixture(scope="module")
+def manager_token():
+    with SessionLocal() as db:
+        db.execute(delete(User).where(User.email == "manager@example.com"))
+        db.execute(insert(User).values(
+            name="Manager", email="manager@example.com", hashed_password="x",
+            role=UserRole.MANAGER, department="Ops", is_active=True
+        ))
+        db.commit()
+        manager_id = db.scalar(select(User.id).where(User.email == "manager@example.com"))
+    return create_access_token(data={"sub": str(manager_id), "email": "manager@example.com"})
+
+
+def test_bucket_count():
+    assert bucket_count(date(2026, 1, 1), date(2026, 12, 31)) == 365
+    # Mon 5 Jan .. Sun 18 Jan 2026 plus a partial week either side
+    assert bucket_count(date(2026, 1, 1), date(2026, 1, 19), "week") == 4
+    assert bucket_count(date(2025, 11, 30), date(2026, 2, 1), "month") == 4
+
+
+@pytest.mark.parametrize("bucket, start, end", [
+    ("day", "2025-01-01", "2025-12-31"),
+    ("week", "2021-01-04", "2025-12-28"),
+    ("month", "2016-01-01", "2025-12-31"),
+])
+def test_timeseries_accepts_ranges_up_to_the_cap(api, manager_token, bucket, start, end):
+    response = api("GET", "/api/users/stats/timeseries", token=manager_token, params={
+        "start": start, "end": end, "bucket": bucket
+    })
+
+    assert response.status_code == 200
+    assert len(response.json()["series"]) <= MAX_BUCKETS[bucket]
+
+
+@pytest.mark.parametrize("bucket, start", [
+    ("day", "0001-01-01"),
+    ("week", "2020-01-01"),
+    ("month", "2015-01-01"),
+])
+def test_timeseries_rejects_ranges_over_the_cap(api, manager_token, bucket, start):
+    response = api("GET", "/api/users/stats/timeseries", token=manager_token, params={
+        "start": start, "end": "2025-12-31", "bucket": bucket
+    })
+
+    assert response.status_code == 400
+    assert "Range too long" in response.json()["detail"]
@@ -0,0 +1,135 @@
+# tests/test_user_bulk.py
+import pytest
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql
+
+from app.database import SessionLocal, engine
+from app.models.user import User, UserRole
+from app.models.user_stats import UserActivityDaily
+from app.services.user_activity import utc_today
+from app.services.user_service import UserService
+from app.services.user_stats import rebuild_user_stats
+from app.utils.security import create_access_token
+
+BULK = "/api/users/bulk"
+
+
+@pytest.fixture
+def users():
+    rows = [
+        ("Admin", UserRole.ADMIN, "Sales", True),
+        ("Sam", UserRole.USER, "Sales", True),
+        ("Sue", UserRole.MANAGER, "Sales", True),
+        # Already what the bulk patch sets
+        ("Sid", UserRole.STAFF, "Sales", False),
+        ("Ola", UserRole.USER, "Ops", True),
+        ("Oto", UserRole.STAFF, "Ops", False),
+    ]
+    with engine.begin() as conn:
+        conn.execute(delete(User))
+        conn.execute(insert(User), [
+            {
+                "name": name, "email": f"{name.lower()}@example.com", "hashed_password": "x",
+                "role": role, "department": department, "is_active": active
+            }
+            for name, role, department, active in rows
+        ])
+        rebuild_user_stats(conn)
+    with SessionLocal() as db:
+        return {user.name: user for user in db.scalars(select(User))}
+
+
+@pytest.fixture
+def admin_token(users):
+    admin = users["Admin"]
+    return create_access_token(data={"sub": str(admin.id), "email": admin.email})
+
+
+def _deactivations_today() -> int:
+    with SessionLocal() as db:
+        return db.scalar(
+            select(func.coalesce(func.sum(UserActivityDaily.deactivations), 0))
+            .where(UserActivityDaily.day == utc_today())
+        )
+
+
+def _remaining() -> dict:
+    with SessionLocal() as db:
+        return {user.name: user for user in db.scalars(select(User))}
+
+
+def test_bulk_patch_keeps_counters_and_activity_in_step(api, users, admin_token, stats_drift):
+    deactivations = _deactivations_today()
+
+    response = api("PATCH", BULK, token=admin_token, json={
+        "where": {"department": "Sales", "role": "user"},
+        "changes": {"status": "inactive", "role": "staff", "department": "Ops"}
+    })
+
+    assert response.status_code == 200
+    assert response.json()["data"] == {"matched": 1, "updated": 1}
+    assert stats_drift() == 0
+    assert _deactivations_today() == deactivations + 1
+
+    after = _remaining()
+    assert (after["Sam"].role, after["Sam"].department, after["Sam"].is_active) == (UserRole.STAFF, "Ops", False)
+    assert after["Sam"].token_version == users["Sam"].token_version + 1
+
+
+def test_bulk_patch_skips_rows_that_already_match(api, users, admin_token, stats_drift):
+    deactivations = _deactivations_today()
+
+    response = api("PATCH", BULK, token=admin_token, json={
+        "where": {"ids": [users[name].id for name in ("Sue", "Sid", "Oto")]},
+        "changes": {"status": "inactive", "role": "staff"}
+    })
+
+    assert response.json()["data"] == {"matched": 3, "updated": 1}
+    assert stats_drift() == 0
+    # Only Sue was active
+    assert _deactivations_today() == deactivations + 1
+
+    after = _remaining()
+    assert after["Sid"].token_version == users["Sid"].token_version
+    assert after["Oto"].token_version == users["Oto"].token_version
+    assert after["Sue"].token_version == users["Sue"].token_version + 1
+
+
+def test_bulk_reactivation_records_no_deactivations(api, users, admin_token, stats_drift):
+    deactivations = _deactivations_today()
+
+    response = api("PATCH", BULK, token=admin_token, json={
+        "where": {"status": "inactive"}, "changes": {"status": "active"}
+    })
+
+    assert response.json()["data"] == {"matched": 2, "updated": 2}
+    assert stats_drift() == 0
+    assert _deactivations_today() == deactivations
+
+
+def test_bulk_delete_by_filter_skips_the_caller(api, users, admin_token, stats_drift):
+    response = api("DELETE", BULK, token=admin_token, json={"department": "Sales"})
+
+    assert response.status_code == 200
+    assert response.json()["data"] == {"deleted": 3}
+    assert sorted(_remaining()) == ["Admin", "Ola", "Oto"]
+    assert stats_drift() == 0
+
+
+def test_bulk_delete_naming_the_caller_is_rejected(api, users, admin_token, stats_drift):
+    response = api("DELETE", BULK, token=admin_token, json={
+        "ids": [users["Admin"].id, users["Ola"].id]
+    })
+
+    assert response.status_code == 400
+    assert len(_remaining()) == len(users)
+    assert stats_drift() == 0
+
+
+def test_row_lock_sits_below_the_group_by_on_postgresql():
+    query = UserService.locked_groups_query("postgresql", [User.department == "Sales"])
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    # PostgreSQL rejects FOR UPDATE next to GROUP BY, but not in a sub-select
+    assert sql.count("FOR UPDATE") == 1
+    assert sql.index("FROM (") < sql.index("FOR UPDATE") < sql.index(") AS anon_1") < sql.index("GROUP BY")
@@ -0,0 +1,69 @@
+# tests/test_user_export.py
+import asyncio
+import csv
+import io
+import zipfile
+
+from sqlalchemy import delete, insert
+
+from app.database import Base, SessionLocal, async_engine, engine
+from app.models.user import User, UserRole
+from app.services.user_export import export_users
+
+FORMULA_NAME = '=HYPERLINK("http://evil.example","Click")'
+
+
+def _export(fmt: str) -> bytes:
+    async def collect():
+        try:
+            return b"".join([chunk async for chunk in export_users(fmt)])
+        finally:
+            await async_engine.dispose()
+    return asyncio.run(collect())
+
+
+def setup_module(module):
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.execute(delete(User))
+        db.execute(insert(User), [{
+            "name": FORMULA_NAME,
+            "email": "formula@example.com",
+            "hashed_password": "x",
+            "role": UserRole.USER,
+            "department": "+Finance",
+            "is_active": True
+        }, {
+            "name": "-Jean",
+            "email": "hyphen@example.com",
+            "hashed_password": "x",
+            "role": UserRole.USER,
+            "department": "-",
+            "is_active": True
+        }])
+        db.commit()
+
+
+def test_csv_export_neutralizes_formulas():
+    rows = list(csv.DictReader(io.StringIO(_export("csv").decode())))
+
+    assert rows[0]["name"] == "'" + FORMULA_NAME
+    assert rows[0]["department"] == "'+Finance"
+    assert rows[0]["email"] == "formula@example.com"
+
+
+def test_csv_export_keeps_plain_hyphen_values():
+    rows = list(csv.DictReader(io.StringIO(_export("csv").decode())))
+
+    assert rows[1]["name"] == "-Jean"
+    assert rows[1]["department"] == "-"
+
+
+def test_xlsx_export_keeps_text_unchanged():
+    # Inline strings are never evaluated, so there is nothing to neutralize
+    with zipfile.ZipFile(io.BytesIO(_export("xlsx"))) as archive:
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+
+    assert "<t>=HYPERLINK(" in sheet
+    assert "<t>+Finance</t>" in sheet
+    assert "<t>'" not in sheet
@@ -0,0 +1,96 @@
+# tests/test_user_import.py
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app.config import settings
+from app.database import SessionLocal, async_engine, engine
+from app.models.user import User, UserRole
+from app.services.user_import import (
+    _insert_rows, create_import_job, import_hash_pool, run_import
+)
+from app.services.user_stats import rebuild_user_stats
+from app.utils.security import create_access_token
+
+CSV = """name,email,password,role
+Fresh One,fresh.one@example.com,secret1,user
+Taken Again,TAKEN@Example.com,secret1,staff
+Fresh Two,fresh.two@example.com,secret1,manager
+Fresh Again,FRESH.ONE@example.com,secret1,user
+X,bad@example.com,secret1,user
+"""
+
+
+@pytest.fixture(autouse=True)
+def taken_user():
+    with engine.begin() as conn:
+        conn.execute(delete(User))
+        conn.execute(insert(User).values(
+            name="Taken", email="taken@example.com", hashed_password="x",
+            role=UserRole.ADMIN, department="Ops", is_active=True
+        ))
+        rebuild_user_stats(conn)
+    with SessionLocal() as db:
+        yield db.scalar(select(User).where(User.email == "taken@example.com"))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def hash_pool():
+    yield import_hash_pool
+    import_hash_pool.shutdown()
+
+
+def _emails() -> list:
+    with SessionLocal() as db:
+        return sorted(db.scalars(select(User.email)))
+
+
+def test_import_rejects_case_variants_of_registered_and_imported_emails(run_async, stats_drift):
+    job = run_async(run_import(create_import_job(), CSV.splitlines(keepends=True), "csv", batch_size=2))
+
+    assert job.status == "completed"
+    assert (job.rows, job.created, job.failed) == (5, 2, 3)
+    assert {(e["line"], e["error"].split(":")[0]) for e in job.errors} == {
+        (3, "Email already registered"),
+        (5, "Duplicate email in import"),
+        (6, "name"),
+    }
+    assert _emails() == ["fresh.one@example.com", "fresh.two@example.com", "taken@example.com"]
+    assert stats_drift() == 0
+
+
+def test_insert_rows_skips_case_variant_that_passed_the_precheck(run_async, stats_drift):
+    # As if the existing user signed up between _existing_emails and the insert
+    rows = [
+        {
+            "name": name, "email": email, "hashed_password": "x", "role": UserRole.USER,
+            "department": "Ops", "is_active": True
+        }
+        for name, email in (("Racer", "Taken@EXAMPLE.com"), ("Winner", "winner@example.com"))
+    ]
+
+    async def insert_batch():
+        async with async_engine.begin() as conn:
+            return await _insert_rows(conn, rows)
+
+    inserted = run_async(insert_batch())
+
+    assert [row["email"] for row in inserted] == ["winner@example.com"]
+    assert _emails() == ["taken@example.com", "winner@example.com"]
+
+
+def test_upload_over_the_limit_is_rejected(api, taken_user, monkeypatch):
+    monkeypatch.setattr(settings, "USER_IMPORT_MAX_BYTES", 64)
+    token = create_access_token(data={"sub": str(taken_user.id), "email": taken_user.email})
+
+    declared = api("POST", "/api/users/import", token=token, content=CSV.encode())
+
+    async def chunks():
+        # No Content-Length: the limit is enforced while spooling
+        for line in CSV.splitlines(keepends=True):
+            yield line.encode()
+
+    streamed = api("POST", "/api/users/import", token=token, content=chunks())
+
+    assert declared.status_code == 413
+    assert streamed.status_code == 413
+    assert _emails() == ["taken@example.com"]
@@ -0,0 +1,88 @@
+# tests/test_user_pagination.py
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app.database import SessionLocal
+from app.models.user import User, UserRole
+from app.utils.security import create_access_token
+
+START = datetime(2026, 1, 1, 9, 0)
+MATCHES = 12
+
+
+@pytest.fixture(scope="module")
+def admin_token():
+    with SessionLocal() as db:
+        db.execute(delete(User))
+        db.execute(insert(User), [
+            {
+                "name": "Admin",
+                "email": "admin@example.com",
+                "hashed_password": "x",
+                "role": UserRole.ADMIN,
+                "is_active": True,
+                "created_at": START - timedelta(days=1)
+            },
+            *(
+                {
+                    # Varying repetition gives the rows different relevance
+                    "name": f"Pager {'pager ' * (i % 3)}Person {i}",
+                    "email": f"person.{i}@example.com",
+                    "hashed_password": "x",
+                    "role": UserRole.USER,
+                    "is_active": True,
+                    "created_at": START + timedelta(hours=i)
+                }
+                for i in range(MATCHES)
+            ),
+            *(
+                {
+                    "name": f"Other {i}",
+                    "email": f"other.{i}@example.com",
+                    "hashed_password": "x",
+                    "role": UserRole.USER,
+                    "is_active": True,
+                    "created_at": START + timedelta(hours=i, minutes=30)
+                }
+                for i in range(5)
+            ),
+        ])
+        db.commit()
+        admin_id = db.scalar(select(User.id).where(User.email == "admin@example.com"))
+    return create_access_token(data={"sub": str(admin_id), "email": "admin@example.com"})
+
+
+def _follow_cursor(api, token, params, cursor=""):
+    """Every user reached by following nextCursor from cursor"""
+    seen = []
+    while cursor is not None:
+        body = api("GET", "/api/users/", token=token, params={**params, "cursor": cursor}).json()
+        seen.extend(user["email"] for user in body["users"])
+        cursor = body["nextCursor"]
+    return seen
+
+
+def test_cursor_pages_through_search_results_once_each(api, admin_token):
+    seen = _follow_cursor(api, admin_token, {"search": "pager", "limit": 5})
+
+    assert seen == [f"person.{i}@example.com" for i in reversed(range(MATCHES))]
+
+
+def test_ranked_search_page_has_no_next_cursor(api, admin_token):
+    body = api("GET", "/api/users/", token=admin_token, params={"search": "pager", "limit": 5}).json()
+
+    assert len(body["users"]) == 5
+    assert body["hasMore"] is True
+    assert body["nextCursor"] is None
+
+
+def test_page_cursor_continues_unranked_list(api, admin_token):
+    params = {"limit": 5}
+    first = api("GET", "/api/users/", token=admin_token, params=params).json()
+
+    rest = _follow_cursor(api, admin_token, params, first["nextCursor"])
+    emails = [user["email"] for user in first["users"]] + rest
+
+    assert len(emails) == len(set(emails)) == MATCHES + 5 + 1
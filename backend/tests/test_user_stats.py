@@ -0,0 +1,127 @@
+# tests/test_user_stats.py
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.database import AsyncSessionLocal, SessionLocal, engine
+from app.models.user import User, UserRole
+from app.models.user_stats import UserStat
+from app.services.user_stats import (
+    Deltas, apply_user_stats_deltas, month_key, rebuild_user_stats, summarize_counters, user_deltas
+)
+
+
+def _stats() -> dict:
+    with SessionLocal() as db:
+        return summarize_counters(db.scalars(select(UserStat)))
+
+
+def _user(email: str, **values) -> User:
+    return User(**{
+        "name": email.split("@")[0],
+        "email": email,
+        "hashed_password": "x",
+        "role": UserRole.USER,
+        "department": "Sales",
+        "is_active": True,
+        **values
+    })
+
+
+@pytest.fixture(autouse=True)
+def empty_users():
+    with engine.begin() as conn:
+        conn.execute(delete(User))
+        rebuild_user_stats(conn)
+
+
+def test_orm_inserts_and_transitions_keep_counters_exact(stats_drift):
+    with SessionLocal() as db:
+        db.add_all([
+            _user("a@example.com"),
+            _user("b@example.com", role=UserRole.MANAGER, department="IT"),
+            _user("c@example.com", is_active=False),
+        ])
+        db.commit()
+        a, b, c = db.scalars(select(User).order_by(User.email)).all()
+
+        a.role = UserRole.ADMIN
+        b.department = "Sales"
+        c.is_active = True
+        db.commit()
+
+        a.is_active = False
+        a.department = "IT"
+        db.delete(b)
+        db.commit()
+
+    assert stats_drift() == 0
+    stats = _stats()
+    assert stats["totalUsers"] == 2
+    assert stats["activeUsers"] == 1
+    assert stats["byRole"]["admin"] == 1
+    assert stats["byRole"]["manager"] == 0
+    assert stats["byDepartment"] == {"IT": 1, "Sales": 1}
+    assert stats["newUsersThisMonth"] == 2
+
+
+def test_rollback_discards_counter_changes(stats_drift):
+    with SessionLocal() as db:
+        db.add(_user("kept@example.com"))
+        db.commit()
+
+        user = db.scalars(select(User)).one()
+        user.role = UserRole.STAFF
+        db.add(_user("discarded@example.com"))
+        db.flush()
+        db.rollback()
+
+    assert stats_drift() == 0
+    assert _stats()["byRole"]["staff"] == 0
+    assert _stats()["totalUsers"] == 1
+
+
+def test_async_session_writes_keep_counters_exact(run_async, stats_drift):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            db.add_all([_user("x@example.com"), _user("y@example.com", department="IT")])
+            await db.commit()
+            x, y = (await db.scalars(select(User).order_by(User.email))).all()
+            x.is_active = False
+            await db.delete(y)
+            await db.commit()
+
+    run_async(scenario())
+
+    assert stats_drift() == 0
+    assert _stats()["activeUsers"] == 0
+
+
+def test_core_statements_with_explicit_deltas_keep_counters_exact(stats_drift):
+    with SessionLocal() as db:
+        db.add_all([_user("p@example.com"), _user("q@example.com")])
+        db.commit()
+
+    # A Core bulk delete bypasses the flush hook, so it applies its own deltas
+    with engine.begin() as conn:
+        rows = conn.execute(
+            delete(User).where(User.email == "p@example.com")
+            .returning(User.role, User.department, User.is_active, User.created_at)
+        ).all()
+        deltas = Deltas()
+        for row in rows:
+            deltas.update(user_deltas(
+                row.role, row.department, row.is_active, month_key(row.created_at), sign=-1
+            ))
+        apply_user_stats_deltas(conn, deltas)
+
+    assert stats_drift() == 0
+    assert _stats()["totalUsers"] == 1
+
+
+def test_month_key_buckets_aware_timestamps_in_utc():
+    local_midnight = datetime(2026, 3, 1, 0, 30, tzinfo=timezone(timedelta(hours=2)))
+
+    assert month_key(local_midnight) == "2026-02"
+    assert month_key(datetime(2026, 3, 1, 0, 30)) == "2026-03"
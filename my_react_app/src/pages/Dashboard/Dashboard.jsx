@@ -114,7 +114,9 @@ export default function Dashboard() {
 
       const params = new URLSearchParams({
         page: page.toString(),
-        limit: itemsPerPage.toString()
+        limit: itemsPerPage.toString(),
+        // Only the columns the table and edit form use
+        fields: 'id,name,email,role,department,status,lastLogin'
       });
 
       if (searchTerm && searchTerm.trim()) {
@@ -34,8 +34,43 @@ export default function Reports() {
     }).format(amount);
   };
 
-  const handleExport = (format) => {
-    alert(`Exporting report as ${format.toUpperCase()}...\nThis is a demo. In production, this would download the file.`);
+  // Server-side exports; PDF is not available yet
+  const EXPORT_FORMATS = { excel: 'xlsx', csv: 'csv' };
+
+  const handleExport = async (format) => {
+    const exportFormat = EXPORT_FORMATS[format];
+    if (!exportFormat) {
+      alert(`${format.toUpperCase()} export is not available yet.`);
+      return;
+    }
+
+    try {
+      console.log(`📤 Exporting users as ${exportFormat}...`);
+      const response = await fetch(`http://localhost:8000/api/users/export?format=${exportFormat}`, {
+        headers: {
+          'Authorization': `Bearer ${localStorage.getItem('token')}`
+        }
+      });
+
+      if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.detail || 'Export failed');
+      }
+
+      // Save the streamed file under the name the server chose
+      const disposition = response.headers.get('Content-Disposition') || '';
+      const filename = disposition.match(/filename="(.+)"/)?.[1] || `users.${exportFormat}`;
+      const url = URL.createObjectURL(await response.blob());
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = filename;
+      link.click();
+      URL.revokeObjectURL(url);
+      console.log('✅ Export downloaded:', filename);
+    } catch (error) {
+      console.error('❌ Export failed:', error);
+      alert(`Export failed: ${error.message}`);
+    }
   };
 
   const getMaxValue = (data, key) => {